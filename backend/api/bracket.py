@@ -0,0 +1,122 @@
+"""
+The BIG Playoff bracket, precomputed.
+
+rebuild_bracket() lays a season's UltimatePlayoffEntry rows out week by week
+and stores the result in PlayoffBracket, so /api/playoff-bracket/ is a single
+read. Weeks run_playoff_elimination has finished keep the ranks it wrote. The
+week still being played has none yet, so it is projected from the live
+WeeklyScore rows sync_sleeper writes, with the same ordering and cut line as
+the elimination itself; a week nobody has scored in yet is 'upcoming'.
+"""
+
+from decimal import Decimal
+from itertools import groupby
+
+from django.utils import timezone
+
+from .models import PlayoffBracket, UltimatePlayoffEntry, WeeklyScore
+
+
+def advancing_count(total):
+    """How many of `total` contenders survive a week: the top half, rounded up."""
+    return (total + 1) // 2
+
+
+def entry_payload(entry, rank, score, is_eliminated):
+    team = entry.team
+    if team.owner:
+        owner_name = team.owner.full_name or team.owner.user.username
+    else:
+        owner_name = "Unclaimed Team"
+    roster_id = team.sleeper_roster_id
+    return {
+        'id':            entry.id,
+        'team':          f"{team.team_name} ({owner_name})",
+        'teamName':      team.team_name,
+        'ownerName':     owner_name,
+        'leagueId':      team.league.sleeper_league_id,
+        'rosterId':      int(roster_id) if roster_id.isdigit() else roster_id,
+        'season':        entry.season,
+        'playoff_week':  entry.playoff_week,
+        'week_score':    f"{score:.2f}",
+        'final_rank':    rank,
+        'is_eliminated': is_eliminated,
+    }
+
+
+def build_bracket(season):
+    """The bracket payload for `season`, or None if the BIG Playoff hasn't started."""
+    entries = list(
+        UltimatePlayoffEntry.objects.filter(season=season)
+        .select_related('team__owner__user', 'team__league')
+        .order_by('playoff_week', 'id')
+    )
+    if not entries:
+        return None
+
+    live_scores = {
+        (team_id, week): points
+        for team_id, week, points in WeeklyScore.objects.filter(
+            season=season, week__in={entry.playoff_week for entry in entries},
+        ).values_list('team_id', 'week', 'points_scored')
+    }
+
+    weeks = []
+    for week, group in groupby(entries, key=lambda entry: entry.playoff_week):
+        group = list(group)
+        if all(entry.final_rank is not None for entry in group):
+            status = 'final'
+            ranked = sorted(group, key=lambda entry: entry.final_rank)
+            scores = {entry.id: entry.week_score for entry in group}
+            eliminated = {entry.id: entry.is_eliminated for entry in group}
+        elif not any((entry.team_id, week) in live_scores for entry in group):
+            # Nobody has played yet, so there is nothing to project
+            status = 'upcoming'
+            ranked = group
+            scores = {entry.id: Decimal('0.00') for entry in group}
+            eliminated = {entry.id: False for entry in group}
+        else:
+            status = 'projected'
+            # Same order as run_playoff_elimination: score, then entry order
+            scores = {entry.id: live_scores.get((entry.team_id, week), Decimal('0.00')) for entry in group}
+            ranked = sorted(group, key=lambda entry: (-scores[entry.id], entry.id))
+            cut = advancing_count(len(ranked))
+            eliminated = {entry.id: rank > cut for rank, entry in enumerate(ranked, 1)}
+
+        advancing = sum(not eliminated[entry.id] for entry in group)
+        weeks.append({
+            'week':      week,
+            'status':    status,
+            'teams':     len(group),
+            'advancing': advancing,
+            # Lowest score still making it through
+            'cutLine':   f"{scores[ranked[advancing - 1].id]:.2f}" if status != 'upcoming' and advancing else None,
+            'entries':   [
+                entry_payload(entry, rank, scores[entry.id], eliminated[entry.id])
+                for rank, entry in enumerate(ranked, 1)
+            ],
+        })
+
+    last = weeks[-1]
+    champion = None
+    if last['teams'] == 1 or (last['status'] == 'final' and last['advancing'] == 1):
+        champion = last['entries'][0]
+    return {
+        'season':      season,
+        'currentWeek': last['week'],
+        'isComplete':  champion is not None,
+        'champion':    champion,
+        'weeks':       weeks,
+    }
+
+
+def rebuild_bracket(season):
+    """Recomputes and stores `season`'s bracket (dropping it if there are no entries). Returns the payload."""
+    payload = build_bracket(season)
+    if payload is None:
+        PlayoffBracket.objects.filter(season=season).delete()
+    else:
+        PlayoffBracket.objects.update_or_create(
+            season=season, defaults={'payload': payload, 'built_at': timezone.now()},
+        )
+    return payload
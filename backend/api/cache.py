@@ -0,0 +1,132 @@
+"""
+Response cache for the public read-only endpoints.
+
+Every cached key embeds a shared "public data version". Anything that
+changes what those endpoints return (sync_sleeper, playoff commands, admin
+toggles) calls invalidate_public_cache(), which bumps the version so every
+old entry is skipped at once. The cache backend is file-based by default,
+so a management command run from cron invalidates the web workers too.
+
+SharedValue covers data that comes from upstream (Sleeper) rather than the
+database: one refresh per TTL across every worker, stale on failure.
+"""
+
+import threading
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+VERSION_KEY = 'public-data-version'
+
+
+def public_cache_version():
+    return cache.get_or_set(VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_public_cache():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Key was evicted or never set — any new value orphans the old entries
+        cache.set(VERSION_KEY, public_cache_version() + 1, timeout=None)
+
+
+def cache_key(request, vary=''):
+    params = urlencode(sorted(request.query_params.items()))
+    key = f"public:{public_cache_version()}:{request.path}?{params}"
+    return f"{key}#{vary}" if vary else key
+
+
+def cache_public_response(get=None, *, vary=None):
+    """
+    Decorator for APIView.get — serves a cached copy of successful responses.
+    `vary(request)` adds whatever else the response depends on besides the
+    database and the query string (e.g. Sleeper's current week) to the key.
+    """
+    if get is None:
+        return lambda get: cache_public_response(get, vary=vary)
+
+    @wraps(get)
+    def wrapper(self, request, *args, **kwargs):
+        key = cache_key(request, vary(request) if vary else '')
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = get(self, request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.PUBLIC_CACHE_TIMEOUT)
+        return response
+    return wrapper
+
+
+class SharedValue:
+    """
+    A value loaded from upstream and shared by every worker through the cache.
+
+    get() serves the in-process copy, then the shared copy, while either is
+    younger than `max_age`. Only one caller refreshes at a time, both within a
+    worker (a lock) and across workers (a cache.add() lock key); the others
+    keep getting the last known value. If the refresh fails, that value is
+    served however old it is, and the error is only raised when there is none.
+    """
+
+    # Long enough for one slow upstream call; the lock expires on its own if a worker dies
+    LOCK_TIMEOUT = 30
+
+    def __init__(self, key):
+        self.key = f'shared:{key}'
+        self.lock_key = f'shared:{key}:refresh'
+        self._lock = threading.Lock()
+        self._entry = None
+
+    @staticmethod
+    def _is_fresh(entry, max_age):
+        return entry is not None and time.time() - entry['fetched_at'] < max_age
+
+    def get(self, load, max_age):
+        """Returns {'value', 'fetched_at'}; calls load() when the value is older than max_age."""
+        entry = self._entry
+        if self._is_fresh(entry, max_age):
+            return entry
+
+        with self._lock:
+            entry = self._entry
+            if self._is_fresh(entry, max_age):
+                return entry
+
+            shared = cache.get(self.key)
+            if shared and (entry is None or shared['fetched_at'] > entry['fetched_at']):
+                self._entry = entry = shared
+            if self._is_fresh(entry, max_age):
+                return entry
+
+            locked = cache.add(self.lock_key, 1, self.LOCK_TIMEOUT)
+            # Another worker is already refreshing; its result lands in the shared cache
+            if not locked and entry is not None:
+                return entry
+
+            try:
+                value = load()
+            except Exception:
+                if entry is None:
+                    raise
+                return entry
+            finally:
+                if locked:
+                    cache.delete(self.lock_key)
+
+            return self._store(value)
+
+    def _store(self, value):
+        self._entry = entry = {'value': value, 'fetched_at': time.time()}
+        cache.set(self.key, entry, timeout=None)
+        return entry
+
+    def set(self, value):
+        """Shares a value the caller fetched itself, as if get() had just loaded it."""
+        with self._lock:
+            return self._store(value)
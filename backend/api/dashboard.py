@@ -0,0 +1,107 @@
+"""
+Server-side version of the frontend's fetchAllLeagueData().
+
+The homepage used to have every browser call Sleeper for the NFL state plus
+league, users, rosters and several matchup weeks per league, and poll that
+every 60s during games. get_dashboard() serves the same payload from shared
+copies instead: the NFL state (see nfl_state.py) and one SharedValue per
+league, each refreshed at most once per DASHBOARD_TTL for all visitors. A
+request for any set of leagues, in any order, is assembled from those, so it
+can never cost more upstream calls than the leagues themselves. The payload
+is tagged with an ETag, so a browser polling an unchanged payload gets a 304.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+
+from .cache import SharedValue
+from .nfl_state import get_nfl_state, nfl_week
+from .sleeper import build_session, fetch_leagues
+
+BIG_PLAYOFF_START_WEEK = 15
+# Last regular-season week the homepage shows matchups for
+LAST_DATA_WEEK = 17
+# Most leagues one ?league_ids= request may ask for
+MAX_LEAGUES = 24
+# Leagues loaded at once, and Sleeper calls at once within each: together one session's pool
+LEAGUE_WORKERS = 4
+CALLS_PER_LEAGUE = 2
+
+_session = None
+
+
+def dashboard_weeks(state, playoff_start=BIG_PLAYOFF_START_WEEK):
+    """(current_week, is_offseason, recent_week, playoff_weeks), exactly as the frontend derived them."""
+    current_week = nfl_week(state)
+    is_offseason = state.get('season_type') == 'off'
+    recent_week = min(current_week, LAST_DATA_WEEK) if current_week > 0 else LAST_DATA_WEEK
+    last_data_week = LAST_DATA_WEEK if is_offseason else min(current_week, LAST_DATA_WEEK)
+    playoff_weeks = list(range(playoff_start, last_data_week + 1))
+    return current_week, is_offseason, recent_week, playoff_weeks
+
+
+def build_league(league_id, recent_week, playoff_weeks, session=None):
+    """One league's part of the payload, fetched from Sleeper. Raises the upstream error."""
+    global _session
+    if session is None:
+        _session = _session or build_session(LEAGUE_WORKERS * CALLS_PER_LEAGUE)
+        session = _session
+
+    weeks = sorted({recent_week, *playoff_weeks})
+    league_raw, error = fetch_leagues(
+        [league_id], session=session, concurrency=CALLS_PER_LEAGUE, weeks_by_league={league_id: weeks},
+    )[league_id]
+    if error is not None:
+        raise error
+    info = league_raw['league'] or {}
+    matchups = league_raw['matchups']
+    return {
+        'sleeperId':         league_id,
+        'name':              info.get('name'),
+        'season':            int(info['season']) if info.get('season') else None,
+        'rosterPositions':   info.get('roster_positions') or [],
+        'users':             league_raw['users'] or [],
+        'rosters':           league_raw['rosters'] or [],
+        'recentMatchups':    matchups.get(str(recent_week)) or [],
+        'recentMatchupWeek': recent_week,
+        'matchups':          {str(week): matchups.get(str(week)) or [] for week in playoff_weeks},
+    }
+
+
+@lru_cache(maxsize=256)
+def _league(league_id, recent_week, playoff_weeks):
+    # The weeks are part of the key: a new NFL week asks Sleeper for different matchups
+    return SharedValue(f"dashboard:{league_id}:{recent_week}:{','.join(map(str, playoff_weeks))}")
+
+
+def get_dashboard(league_ids):
+    """
+    {'payload', 'etag'} for `league_ids`, each league at most DASHBOARD_TTL
+    seconds old. Raises the first league's error if any league can't be
+    loaded and has no earlier copy, since the frontend treats a partial
+    payload as a failure too.
+    """
+    league_ids = list(dict.fromkeys(league_ids))
+    state = get_nfl_state()
+    current_week, is_offseason, recent_week, playoff_weeks = dashboard_weeks(state)
+
+    def load(league_id):
+        shared = _league(league_id, recent_week, tuple(playoff_weeks))
+        return shared.get(lambda: build_league(league_id, recent_week, playoff_weeks), settings.DASHBOARD_TTL)['value']
+
+    with ThreadPoolExecutor(max_workers=max(1, min(len(league_ids), LEAGUE_WORKERS))) as pool:
+        leagues = list(pool.map(load, league_ids))
+
+    payload = {
+        'nflState':    state,
+        'currentWeek': current_week,
+        'isOffseason': is_offseason,
+        'recentWeek':  recent_week,
+        'leagues':     [{**league, 'index': index} for index, league in enumerate(leagues)],
+    }
+    body = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()
+    return {'payload': payload, 'etag': f'"{hashlib.sha1(body).hexdigest()}"'}
@@ -0,0 +1,126 @@
+import time
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+# Schema before and after the lookup indexes
+BEFORE_MIGRATION = '0019_history_filter_indexes'
+AFTER_MIGRATION = '0021_lookup_indexes'
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a throwaway test database with several seasons of data and prints '
+        'the query plan and timing of the hot lookups before and after the '
+        'composite indexes. Never touches the real database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seasons', type=int, default=5, help='Seasons to seed (default: 5)')
+        parser.add_argument('--leagues', type=int, default=20, help='Leagues per season (default: 20)')
+        parser.add_argument('--teams', type=int, default=12, help='Teams per league (default: 12)')
+        parser.add_argument('--runs', type=int, default=200, help='Timed runs per query (default: 200)')
+
+    def handle(self, *args, **options):
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            call_command('migrate', 'api', BEFORE_MIGRATION, verbosity=0)
+            # The models as of BEFORE_MIGRATION: the current ones have columns added later
+            apps = MigrationExecutor(connection).loader.project_state(('api', BEFORE_MIGRATION)).apps
+            sample = self.seed(apps, options['seasons'], options['leagues'], options['teams'])
+            before = self.measure(apps, sample, options['runs'])
+            call_command('migrate', 'api', AFTER_MIGRATION, verbosity=0)
+            after = self.measure(apps, sample, options['runs'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        for label in before:
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{label}'))
+            for name, (plan, ms) in (('before', before[label]), ('after', after[label])):
+                self.stdout.write(f'  {name}: {ms:.3f} ms/query')
+                for line in plan.splitlines():
+                    self.stdout.write(f'      {line}')
+
+    def seed(self, apps, seasons, leagues_per_season, teams_per_league):
+        """Bulk-inserts members, leagues, teams, a full regular season of scores and playoff entries."""
+        User = apps.get_model('auth', 'User')
+        MemberProfile, League, Team, WeeklyScore, UltimatePlayoffEntry = (
+            apps.get_model('api', name)
+            for name in ('MemberProfile', 'League', 'Team', 'WeeklyScore', 'UltimatePlayoffEntry')
+        )
+        members_needed = seasons * leagues_per_season * teams_per_league
+        users = User.objects.bulk_create(User(username=f'bench{i}') for i in range(members_needed))
+        members = MemberProfile.objects.bulk_create(
+            (MemberProfile(user=user, sleeper_id=str(100000 + i)) for i, user in enumerate(users)),
+            batch_size=2000,
+        )
+
+        first_season = 2025 - seasons + 1
+        leagues = League.objects.bulk_create(
+            League(name=f'League {s}-{n}', sleeper_league_id=f'{s}{n:03d}', season=s)
+            for s in range(first_season, 2026)
+            for n in range(leagues_per_season)
+        )
+        teams = Team.objects.bulk_create(
+            Team(owner=members[(i * teams_per_league + r) % len(members)], league=league,
+                 sleeper_roster_id=str(r + 1), team_name=f'Team {league.pk}-{r}')
+            for i, league in enumerate(leagues)
+            for r in range(teams_per_league)
+        )
+        WeeklyScore.objects.bulk_create(
+            (
+                WeeklyScore(team=team, season=team.league.season, week=week,
+                            points_scored=Decimal((team.pk * 7 + week * 13) % 120 + 60))
+                for team in teams
+                for week in range(1, 19)
+            ),
+            batch_size=2000,
+        )
+        UltimatePlayoffEntry.objects.bulk_create(
+            UltimatePlayoffEntry(team=team, season=team.league.season, playoff_week=week,
+                                 is_eliminated=(team.pk + week) % 3 == 0)
+            for team in teams
+            for week in (15, 16, 17)
+        )
+        self.stdout.write(
+            f'Seeded {len(members)} members, {len(leagues)} leagues, {len(teams)} teams, '
+            f'{WeeklyScore.objects.count()} weekly scores.'
+        )
+        team = teams[len(teams) // 2]
+        return {'member': members[-1], 'team': team, 'season': team.league.season}
+
+    def measure(self, apps, sample, runs):
+        MemberProfile, Team, WeeklyScore, UltimatePlayoffEntry = (
+            apps.get_model('api', name)
+            for name in ('MemberProfile', 'Team', 'WeeklyScore', 'UltimatePlayoffEntry')
+        )
+        team, season = sample['team'], sample['season']
+        queries = {
+            'MemberProfile by sleeper_id':
+                MemberProfile.objects.filter(sleeper_id=sample['member'].sleeper_id),
+            'Team by (league, sleeper_roster_id)':
+                Team.objects.filter(league_id=team.league_id, sleeper_roster_id=team.sleeper_roster_id),
+            'WeeklyScore by (team, week, season)':
+                WeeklyScore.objects.filter(team=team, week=10, season=season),
+            'Top WeeklyScore for a week':
+                WeeklyScore.objects.filter(season=season, week=10).order_by('-points_scored')[:1],
+            'Active UltimatePlayoffEntry for a week':
+                UltimatePlayoffEntry.objects.filter(season=season, playoff_week=16, is_eliminated=False),
+        }
+        results = {}
+        for label, queryset in queries.items():
+            plan = queryset.explain()
+            # Time the SQL alone so model instantiation doesn't hide the index
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                started = time.perf_counter()
+                for _ in range(runs):
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                elapsed = time.perf_counter() - started
+            results[label] = (plan, elapsed * 1000 / runs)
+        return results
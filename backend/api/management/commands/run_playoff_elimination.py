@@ -1,4 +1,8 @@
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery
+from api.bracket import advancing_count, rebuild_bracket
+from api.cache import invalidate_public_cache
 from api.models import UltimatePlayoffEntry, WeeklyScore
 from decimal import Decimal
 
@@ -13,102 +17,103 @@ class Command(BaseCommand):
             required=True,
             help='The playoff week to run eliminations for (e..g, 15, 16).',
         )
+        parser.add_argument(
+            '--season',
+            type=int,
+            help='The season to run eliminations for (default: the latest season with playoff entries).',
+        )
 
     def handle(self, *args, **options):
         current_week = options['week']
         next_week = current_week + 1
-        
+
+        season = options.get('season')
+        if season is None:
+            season = UltimatePlayoffEntry.objects.aggregate(Max('season'))['season__max']
+            if season is None:
+                raise CommandError('No playoff entries exist yet. Did you run "start_big_playoff"?')
+
         self.stdout.write(self.style.SUCCESS(
-            f'--- Running BIG Playoff Elimination for Week {current_week}... ---'
+            f'--- Running BIG Playoff Elimination for {season} Week {current_week}... ---'
         ))
 
-        # 1. Get all *active* playoff entries for the specified week
-        active_entries = UltimatePlayoffEntry.objects.filter(
-            playoff_week=current_week,
-            is_eliminated=False
-        )
+        with transaction.atomic():
+            # 1. Get all *active* playoff entries for the week, each with the score
+            #    sync_sleeper already saved for it, in one joined query
+            score = WeeklyScore.objects.filter(
+                team=OuterRef('team'), week=current_week, season=season,
+            ).values('points_scored')[:1]
+            active_entries = list(
+                UltimatePlayoffEntry.objects.filter(
+                    season=season,
+                    playoff_week=current_week,
+                    is_eliminated=False,
+                )
+                .select_related('team')
+                .select_for_update(of=('self',))
+                .annotate(score=Subquery(score))
+            )
+
+            if not active_entries:
+                self.stdout.write(self.style.ERROR(f'No active playoff entries found for {season} Week {current_week}. Did you run "start_big_playoff"?'))
+                return
+
+            self.stdout.write(f'  Found {len(active_entries)} active contenders for Week {current_week}.')
 
-        if not active_entries.exists():
-            self.stdout.write(self.style.ERROR(f'No active playoff entries found for Week {current_week}. Did you run "start_big_playoff"?'))
-            return
-
-        self.stdout.write(f'  Found {active_entries.count()} active contenders for Week {current_week}.')
-
-        # 2. Get the scores for these teams
-        # We'll build a list of tuples: (entry, score)
-        scored_entries = []
-        for entry in active_entries:
-            try:
-                # Find the score that sync_sleeper already saved for us
-                weekly_score = WeeklyScore.objects.get(
-                    team=entry.team,
-                    week=current_week,
-                    season=entry.season
+            # 2. Record each entry's score
+            for entry in active_entries:
+                if entry.score is None:
+                    # This should not happen if sync_sleeper ran, but it's a good safety check
+                    self.stdout.write(self.style.WARNING(f'  No score found for {entry.team.team_name} for Week {current_week}. Using 0.00.'))
+                entry.week_score = entry.score if entry.score is not None else Decimal('0.00')
+
+            # 3. Sort by score (highest first); ties keep entry order
+            active_entries.sort(key=lambda entry: (-entry.week_score, entry.id))
+
+            # 4. Determine the "cut line" (the bottom half)
+            total_contenders = len(active_entries)
+            # This calculates how many teams get to ADVANCE: math.ceil(total / 2)
+            num_advancing = advancing_count(total_contenders)
+
+            self.stdout.write(f'  Total: {total_contenders} contenders. {num_advancing} will advance.')
+
+            # 5. Rank everyone and eliminate the bottom half in one write
+            for rank, entry in enumerate(active_entries, 1):
+                entry.final_rank = rank
+                entry.is_eliminated = rank > num_advancing
+            UltimatePlayoffEntry.objects.bulk_update(
+                active_entries, ['week_score', 'final_rank', 'is_eliminated']
+            )
+            winners = active_entries[:num_advancing]
+            losers = active_entries[num_advancing:]
+
+            # 6. Create next week's entries for the winners; existing ones are left alone
+            if next_week <= 18: # Or whatever your final week is
+                UltimatePlayoffEntry.objects.bulk_create(
+                    [
+                        UltimatePlayoffEntry(team=entry.team, season=season, playoff_week=next_week)
+                        for entry in winners
+                    ],
+                    ignore_conflicts=True,
                 )
-                score = weekly_score.points_scored
-            except WeeklyScore.DoesNotExist:
-                # This should not happen if sync_sleeper ran, but it's a good safety check
-                self.stdout.write(self.style.WARNING(f'  No score found for {entry.team.team_name} for Week {current_week}. Using 0.00.'))
-                score = Decimal('0.00')
-
-            # Update the entry's score in the database
-            entry.week_score = score
-            entry.save()
-            scored_entries.append((entry, score))
-
-        # 3. Sort the list by score (highest first)
-        scored_entries.sort(key=lambda x: x[1], reverse=True)
-
-        # 4. Determine the "cut line" (the bottom half)
-        # We use 'len(scored_entries) // 2' for integer division
-        total_contenders = len(scored_entries)
-        # This calculates how many teams get to ADVANCE
-        # math.ceil(total / 2) is the same as (total + 1) // 2
-        num_advancing = (total_contenders + 1) // 2
-        
-        self.stdout.write(f'  Total: {total_contenders} contenders. {num_advancing} will advance.')
-        
-        # 5. Run the eliminations
-        winners = []
-        losers = []
-
-        for index, (entry, score) in enumerate(scored_entries):
-            rank = index + 1
-            entry.final_rank = rank # Set their rank for this week
-            
-            if rank <= num_advancing:
-                # --- WINNER ---
-                winners.append(entry)
-                entry.save() # Save the rank
-            else:
-                # --- LOSER ---
-                losers.append(entry)
-                entry.is_eliminated = True # Mark as eliminated
-                entry.save() # Save the rank and eliminated status
-
-        # 6. Print results and create entries for next week
-        self.stdout.write(self.style.SUCCESS('\n--- Week {current_week} Results ---'))
+
+        # 7. Print results
+        self.stdout.write(self.style.SUCCESS(f'\n--- Week {current_week} Results ---'))
         self.stdout.write('ADVANCING:')
         for rank, entry in enumerate(winners, 1):
             self.stdout.write(f'  {rank}. {entry.team.team_name} ({entry.week_score} pts)')
-        
+
         self.stdout.write(self.style.ERROR('\nELIMINATED:'))
         for rank, entry in enumerate(losers, num_advancing + 1):
             self.stdout.write(f'  {rank}. {entry.team.team_name} ({entry.week_score} pts)')
 
-        # 7. Create next week's entries for the winners
-        if next_week <= 18: # Or whatever your final week is
-            self.stdout.write(f'\nCreating new entries for Week {next_week}...')
-            for winner_entry in winners:
-                UltimatePlayoffEntry.objects.get_or_create(
-                    team=winner_entry.team,
-                    season=winner_entry.season,
-                    playoff_week=next_week
-                )
-            self.stdout.write(self.style.SUCCESS(f'  {len(winners)} entries for Week {next_week} created.'))
+        if next_week <= 18:
+            self.stdout.write(self.style.SUCCESS(f'\n  {len(winners)} entries for Week {next_week} created.'))
         else:
             self.stdout.write(self.style.SUCCESS('\n--- FINAL WEEK COMPLETE ---'))
 
+        rebuild_bracket(season)
+        invalidate_public_cache()
         self.stdout.write(self.style.SUCCESS(
             f'--- BIG Playoff Elimination for Week {current_week} Complete! ---'
-        ))
\ No newline at end of file
+        ))
@@ -1,54 +1,74 @@
+from collections import defaultdict
+
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from api.bracket import rebuild_bracket
+from api.cache import invalidate_public_cache
 from api.models import League, Team, UltimatePlayoffEntry
 
 class Command(BaseCommand):
     help = 'Initializes the BIG Playoff. Finds all qualified teams and creates their first playoff entry.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season',
+            type=int,
+            help='The season to start the BIG Playoff for (default: the latest league season).',
+        )
+
     def handle(self, *args, **options):
-        
+
         # --- This is our league's "business rule" ---
         PLAYOFF_START_WEEK = 15
-        
+
+        season = options.get('season')
+        if season is None:
+            season = League.objects.aggregate(Max('season'))['season__max']
+            if season is None:
+                self.stdout.write(self.style.WARNING('No leagues found in database.'))
+                return
+
         self.stdout.write(self.style.SUCCESS(
-            f'--- Starting the BIG Playoff for Week {PLAYOFF_START_WEEK}... ---'
+            f'--- Starting the BIG Playoff for {season} Week {PLAYOFF_START_WEEK}... ---'
         ))
 
-        # Get all leagues from our database
-        all_leagues = League.objects.all()
-        
-        if not all_leagues:
-            self.stdout.write(self.style.WARNING('No leagues found in database.'))
+        leagues = list(League.objects.filter(season=season).order_by('id'))
+        if not leagues:
+            self.stdout.write(self.style.WARNING(f'No leagues found for season {season}.'))
             return
 
-        total_teams_added = 0
-        
-        # Go through each league one by one
-        for league in all_leagues:
-            # Find all teams in *this* league that are marked as playoff teams
-            playoff_teams = Team.objects.filter(
-                league=league,
-                made_league_playoffs=True
-            )
-
-            if not playoff_teams.exists():
-                self.stdout.write(self.style.WARNING(f'No playoff teams found for league: {league.name}'))
-                continue
-
-            self.stdout.write(f'  Found {playoff_teams.count()} playoff teams for {league.name}...')
-
-            # Now, create the entry for each team
-            for team in playoff_teams:
-                # Use get_or_create to prevent duplicates if you run this twice
-                entry, created = UltimatePlayoffEntry.objects.get_or_create(
-                    team=team,
-                    season=league.season,
-                    playoff_week=PLAYOFF_START_WEEK
-                )
-
-                if created:
-                    self.stdout.write(f'    + Added entry for: {team.team_name}')
-                    total_teams_added += 1
+        with transaction.atomic():
+            # Every playoff team across all of this season's leagues, in one query
+            teams_by_league = defaultdict(list)
+            for team in Team.objects.filter(league__season=season, made_league_playoffs=True).order_by('id'):
+                teams_by_league[team.league_id].append(team)
 
+            # Teams that already have their first entry (re-running is a no-op for them)
+            existing = set(UltimatePlayoffEntry.objects.filter(
+                season=season, playoff_week=PLAYOFF_START_WEEK,
+            ).values_list('team_id', flat=True))
+
+            new_entries = []
+            for league in leagues:
+                playoff_teams = teams_by_league.get(league.id, [])
+                if not playoff_teams:
+                    self.stdout.write(self.style.WARNING(f'No playoff teams found for league: {league.name}'))
+                    continue
+
+                self.stdout.write(f'  Found {len(playoff_teams)} playoff teams for {league.name}...')
+                for team in playoff_teams:
+                    if team.id not in existing:
+                        self.stdout.write(f'    + Added entry for: {team.team_name}')
+                        new_entries.append(UltimatePlayoffEntry(
+                            team=team, season=season, playoff_week=PLAYOFF_START_WEEK,
+                        ))
+
+            # The (team, season, playoff_week) constraint makes a concurrent run harmless too
+            UltimatePlayoffEntry.objects.bulk_create(new_entries, ignore_conflicts=True)
+
+        rebuild_bracket(season)
+        invalidate_public_cache()
         self.stdout.write(self.style.SUCCESS(
-            f'--- BIG Playoff Started! Added {total_teams_added} new entries. ---'
-        ))
\ No newline at end of file
+            f'--- BIG Playoff Started! Added {len(new_entries)} new entries. ---'
+        ))
@@ -1,43 +1,228 @@
+import hashlib
 import json
 import os
-import requests
 from collections import Counter, defaultdict
+from datetime import timedelta
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
 from django.contrib.auth.models import User
 from api.models import League, MemberProfile, Team, WeeklyScore, UltimatePlayoffEntry, CommonPlayer
-
-DEFAULT_SNAPSHOT_PATH = "sleeper_snapshot_2025.json"
+from api.sleeper import (
+    DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT,
+    build_session, fetch_leagues,
+)
+from api.bracket import rebuild_bracket
+from api.cache import invalidate_public_cache
+from api.nfl_state import nfl_week, refresh_nfl_state
+from api.players import (
+    DEFAULT_REFRESH_HOURS, DEFAULT_STATS_TTL_HOURS, refresh_players, store_players,
+    store_rostered_players, player_lookup as load_player_lookup, http_stats_source, season_averages,
+)
+from api.snapshot import open_snapshot
+from api.records import update_records
+from api.standings import rebuild_standings
+
+DEFAULT_SNAPSHOT_PATH = "sleeper_snapshot_2025"
+FINAL_WEEK = 18
+
+
+def league_week(league, current_week, current_nfl_season):
+    """The league's own "current week" — past seasons are treated as fully played."""
+    if current_nfl_season and str(league.season) != str(current_nfl_season):
+        return FINAL_WEEK + 1
+    return current_week
+
+
+def incremental_weeks(last_completed_week, current_week):
+    """
+    Weeks an --incremental run has to touch: anything after the league's
+    watermark, plus the previous week (stat corrections) and the current one.
+    """
+    if last_completed_week >= FINAL_WEEK:
+        return range(0)
+    first = max(1, min(last_completed_week + 1, current_week - 1))
+    return range(first, min(current_week, FINAL_WEEK) + 1)
+
+
+def advance_watermark(last_completed_week, last_written_week, current_week):
+    """
+    The league's new watermark: the last finished week, but no further than
+    the contiguous run of weeks this sync actually wrote, so a week that
+    failed to fetch is picked up again by the next --incremental run.
+    """
+    if last_written_week is None:
+        return last_completed_week
+    return max(last_completed_week, min(current_week - 1, last_written_week, FINAL_WEEK))
 
 
 class Command(BaseCommand):
-    help = "Syncs league data from Sleeper API (or from local JSON snapshot with --from-local)"
+    help = "Syncs league data from Sleeper API (or from a local snapshot with --from-local)"
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--from-local",
             action="store_true",
-            help="Read from local JSON snapshot instead of live Sleeper API",
+            help="Read from a local snapshot instead of live Sleeper API",
         )
         parser.add_argument(
             "--snapshot",
             default=DEFAULT_SNAPSHOT_PATH,
-            help=f"Path to snapshot file when using --from-local (default: {DEFAULT_SNAPSHOT_PATH})",
+            help=(
+                "Snapshot directory (or legacy single-file JSON) when using --from-local "
+                f"(default: {DEFAULT_SNAPSHOT_PATH}, else {DEFAULT_SNAPSHOT_PATH}.json)"
+            ),
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=f"Max simultaneous Sleeper requests in live mode (default: {DEFAULT_CONCURRENCY})",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=DEFAULT_TIMEOUT,
+            help=f"Per-request timeout in seconds for Sleeper calls (default: {DEFAULT_TIMEOUT})",
+        )
+        parser.add_argument(
+            "--player-refresh-hours",
+            type=float,
+            default=DEFAULT_REFRESH_HOURS,
+            help=(
+                "Re-download the Sleeper player database only if the cached copy is older "
+                f"than this many hours (default: {DEFAULT_REFRESH_HOURS})"
+            ),
+        )
+        parser.add_argument(
+            "--stats-ttl-hours",
+            type=float,
+            default=DEFAULT_STATS_TTL_HOURS,
+            help=(
+                "Reuse cached per-player season stats younger than this many hours "
+                f"(default: {DEFAULT_STATS_TTL_HOURS})"
+            ),
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help=(
+                "Only fetch and write the previous and current week (plus anything past the "
+                "league's last synced week). Users and teams are skipped when rosters are "
+                "unchanged; top-three players refresh on the next full sync."
+            ),
         )
 
     def load_snapshot(self, path):
-        """Load snapshot from JSON file."""
+        """Open a snapshot reader; league and stats records are read lazily as the sync needs them."""
         base = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
         full_path = os.path.join(base, path)
-        if not os.path.exists(full_path):
-            self.stdout.write(self.style.ERROR(f"Snapshot not found: {full_path}"))
+        snapshot = open_snapshot(full_path)
+        if snapshot is None and not full_path.endswith(".json"):
+            # Before snapshots were directories, download_sleeper wrote <name>.json
+            snapshot = open_snapshot(f"{full_path}.json")
+        if snapshot is None:
+            self.stdout.write(self.style.ERROR(f"Snapshot not found: {full_path} (or {full_path}.json)"))
             self.stdout.write("Run: python download_sleeper.py (while online) to create it.")
-            return None
-        with open(full_path, "r") as f:
-            return json.load(f)
+        return snapshot
+
+    def reconcile_users(self, sleeper_users):
+        """
+        Creates or refreshes a MemberProfile for every Sleeper user in one pass.
+
+        Existing profiles and every username a new member could collide with
+        are loaded up front, so the query count stays flat however many
+        members the league has. Returns {sleeper_id: MemberProfile}.
+        """
+        display_names = {}
+        for user_data in sleeper_users:
+            sleeper_id = user_data.get("user_id")
+            if sleeper_id:
+                display_names[sleeper_id] = user_data.get("display_name", "SleeperUser")
+        if not display_names:
+            return {}
+
+        profiles = {}
+        for profile in MemberProfile.objects.filter(
+            sleeper_id__in=display_names
+        ).select_related("user").order_by("id"):
+            profiles.setdefault(profile.sleeper_id, profile)
+
+        # Every taken username that equals a display name or one of its "_N" variants
+        candidates = Q()
+        for name in set(display_names.values()):
+            candidates |= Q(username=name) | Q(username__startswith=f"{name}_")
+        taken = set(User.objects.filter(candidates).values_list("username", flat=True))
+
+        profiles_to_update, users_to_update = [], []
+        new_members = []
+        for sleeper_id, display_name in display_names.items():
+            profile = profiles.get(sleeper_id)
+            if profile is None:
+                username, counter = display_name, 1
+                while username in taken:
+                    username = f"{display_name}_{counter}"
+                    counter += 1
+                taken.add(username)
+                user = User(username=username)
+                user.set_unusable_password()
+                new_members.append((sleeper_id, display_name, user))
+                continue
+
+            if profile.sleeper_display_name != display_name:
+                profile.sleeper_display_name = display_name
+                profiles_to_update.append(profile)
+            # Only rename accounts the sync created; members who registered keep their login
+            user = profile.user
+            if (
+                not user.has_usable_password()
+                and user.username != display_name
+                and display_name not in taken
+            ):
+                taken.discard(user.username)
+                taken.add(display_name)
+                user.username = display_name
+                users_to_update.append(user)
+
+        with transaction.atomic():
+            if users_to_update:
+                User.objects.bulk_update(users_to_update, ["username"])
+            if profiles_to_update:
+                MemberProfile.objects.bulk_update(profiles_to_update, ["sleeper_display_name"])
+            if new_members:
+                User.objects.bulk_create([user for _, _, user in new_members])
+                created = MemberProfile.objects.bulk_create([
+                    MemberProfile(
+                        user=user,
+                        sleeper_id=sleeper_id,
+                        first_name=display_name,
+                        sleeper_display_name=display_name,
+                    )
+                    for sleeper_id, display_name, user in new_members
+                ])
+                profiles.update((profile.sleeper_id, profile) for profile in created)
+
+        return profiles
+
+    def weeks_by_league(self, leagues, incremental, current_week, current_nfl_season):
+        """Matchup weeks to fetch and write for each league, keyed by Sleeper league ID."""
+        if not incremental:
+            return {league.sleeper_league_id: range(1, FINAL_WEEK + 1) for league in leagues}
+        return {
+            league.sleeper_league_id: incremental_weeks(
+                league.last_completed_week, league_week(league, current_week, current_nfl_season)
+            )
+            for league in leagues
+        }
 
     def handle(self, *args, **options):
         from_local = options.get("from_local", False)
         snapshot_path = options.get("snapshot", DEFAULT_SNAPSHOT_PATH)
+        concurrency = max(1, options.get("concurrency") or DEFAULT_CONCURRENCY)
+        timeout = options.get("timeout") or DEFAULT_TIMEOUT
+        incremental = options.get("incremental", False)
+        session = None if from_local else build_session(concurrency)
 
         if from_local:
             self.stdout.write(self.style.SUCCESS("Starting sync from local snapshot..."))
@@ -54,249 +239,251 @@ class Command(BaseCommand):
 
         # --- 1. GLOBAL STATE ---
         if from_local and snapshot:
-            state_data = snapshot.get("state") or {}
-            current_league_week = state_data.get("week", 0) or state_data.get("display_week", 0)
-            current_nfl_season = state_data.get("season", "2025")
+            state_data = snapshot.state
+            current_league_week = nfl_week(state_data)
+            current_nfl_season = state_data.get("season")
             self.stdout.write(f"Loaded state from snapshot. Week: {current_league_week}, Season: {current_nfl_season}")
         else:
             self.stdout.write("Fetching global NFL state from Sleeper...")
             try:
-                state_res = requests.get("https://api.sleeper.app/v1/state/nfl")
-                state_res.raise_for_status()
-                state_data = state_res.json()
-                current_league_week = state_data.get("week", 0) or state_data.get("display_week", 0)
+                # Never a cached copy: the week decides what gets written and latched
+                state_data = refresh_nfl_state(session=session, timeout=timeout)
+                current_league_week = nfl_week(state_data)
                 current_nfl_season = state_data.get("season")
                 self.stdout.write(f"Fetched state. Week: {current_league_week}, Season: {current_nfl_season}")
             except Exception as e:
                 self.stdout.write(self.style.ERROR(f"Fatal Error fetching state: {e}"))
                 return
+        if not current_nfl_season:
+            # Every row is written under a season; never guess one
+            self.stdout.write(self.style.ERROR("Fatal Error: the NFL state has no season."))
+            return
 
         # --- 2. PLAYER DB ---
-        player_lookup = {}
-        if from_local and snapshot and snapshot.get("players"):
-            p_data = snapshot["players"]
-            for pid, details in p_data.items():
-                player_lookup[str(pid)] = {
-                    "name": f"{details.get('first_name', '')} {details.get('last_name', '')}".strip(),
-                    "position": details.get("position", "N/A"),
-                    "team": details.get("team", "N/A"),
-                }
-            self.stdout.write(f"Loaded {len(player_lookup)} players from snapshot.")
-        elif not from_local:
-            self.stdout.write("Downloading Sleeper Player Database...")
+        # Cached in the Player table; STEP 3 and STEP 5 both read from this one lookup
+        if from_local and snapshot:
+            p_data = snapshot.players()
+            if p_data:
+                changed = store_players(p_data)
+                self.stdout.write(
+                    f"Loaded {len(p_data)} players from snapshot"
+                    f"{'' if changed else ' (unchanged)'}."
+                )
+            del p_data
+        else:
+            max_age = timedelta(hours=options.get("player_refresh_hours", DEFAULT_REFRESH_HOURS))
             try:
-                p_res = requests.get("https://api.sleeper.app/v1/players/nfl")
-                p_data = p_res.json()
-                for pid, details in p_data.items():
-                    player_lookup[pid] = {
-                        "name": f"{details.get('first_name', '')} {details.get('last_name', '')}".strip(),
-                        "position": details.get("position", "N/A"),
-                        "team": details.get("team", "N/A"),
-                    }
-                self.stdout.write(f"Player database built ({len(player_lookup)} players).")
+                result = refresh_players(session, timeout, max_age)
+                self.stdout.write({
+                    "fresh": "Player database is fresh. Skipping download.",
+                    "unchanged": "Player database downloaded (no changes).",
+                    "updated": "Player database downloaded and updated.",
+                }[result])
             except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Error fetching player DB: {e}"))
+                self.stdout.write(self.style.ERROR(f"Error fetching player DB, using cached copy: {e}"))
+        player_lookup = load_player_lookup()
+        self.stdout.write(f"Player lookup ready ({len(player_lookup)} players).")
 
         # --- 3. LEAGUES ---
+        failed_leagues = 0
         if from_local and snapshot:
-            leagues_data = snapshot.get("leagues", {})
+            # Only league metadata is read here; matchups load one league at a time below
             leagues_to_sync = []
-            for sleeper_league_id, league_raw in leagues_data.items():
-                ld = league_raw.get("league")
+            for sleeper_league_id in snapshot.league_ids():
+                ld = snapshot.league_meta(sleeper_league_id).get("league")
                 if not ld:
                     continue
                 league, _ = League.objects.update_or_create(
                     sleeper_league_id=sleeper_league_id,
-                    defaults={"name": ld.get("name", "League"), "season": ld.get("season", 2025)},
+                    defaults={"name": ld.get("name", "League"), "season": ld.get("season") or current_nfl_season},
                 )
-                leagues_to_sync.append((league, league_raw))
+                leagues_to_sync.append((league, None))
             if not leagues_to_sync:
                 self.stdout.write(self.style.WARNING("No league data in snapshot."))
                 return
+            weeks_by_league = self.weeks_by_league(
+                [league for league, _ in leagues_to_sync], incremental, current_league_week, current_nfl_season
+            )
         else:
             leagues = list(League.objects.all())
             if not leagues:
                 self.stdout.write(self.style.WARNING("No leagues found. Add some in the admin!"))
                 return
-            leagues_to_sync = [(league, None) for league in leagues]
+            self.stdout.write(
+                f"Fetching {len(leagues)} leagues from Sleeper ({concurrency} at a time)..."
+            )
+            weeks_by_league = self.weeks_by_league(leagues, incremental, current_league_week, current_nfl_season)
+            fetched = fetch_leagues(
+                [league.sleeper_league_id for league in leagues],
+                session=session, concurrency=concurrency, timeout=timeout,
+                weeks_by_league=weeks_by_league,
+            )
+            leagues_to_sync = []
+            for league in leagues:
+                league_raw, error = fetched[league.sleeper_league_id]
+                if error is not None:
+                    failed_leagues += 1
+                    self.stdout.write(self.style.ERROR(
+                        f"Error fetching league data for {league.name}: {error}"
+                    ))
+                    continue
+                leagues_to_sync.append((league, league_raw))
 
         all_playoff_player_ids = []
-        player_stats = snapshot.get("player_stats", {}) if (from_local and snapshot) else {}
+        rostered_player_ids = set()
+        written_weeks = defaultdict(set)
 
         for league, league_raw in leagues_to_sync:
             sleeper_league_id = league.sleeper_league_id
             self.stdout.write(f"--- Syncing League: {league.name} (ID: {sleeper_league_id}) ---")
 
-            if from_local and league_raw:
-                sleeper_users = league_raw.get("users") or []
-                sleeper_rosters = league_raw.get("rosters") or []
-                league_data = league_raw.get("league") or {}
-                current_season = league_data.get("season", 2025)
-                matchups_by_week = league_raw.get("matchups") or {}
-                playoff_data = league_raw.get("winners_bracket") or []
-            else:
-                try:
-                    league_res = requests.get(f"https://api.sleeper.app/v1/league/{sleeper_league_id}")
-                    league_res.raise_for_status()
-                    league_data = league_res.json()
-                    current_season = league_data.get("season")
-
-                    users_res = requests.get(f"https://api.sleeper.app/v1/league/{sleeper_league_id}/users")
-                    users_res.raise_for_status()
-                    sleeper_users = users_res.json()
-
-                    rosters_res = requests.get(f"https://api.sleeper.app/v1/league/{sleeper_league_id}/rosters")
-                    rosters_res.raise_for_status()
-                    sleeper_rosters = rosters_res.json()
-                except requests.exceptions.RequestException as e:
-                    self.stdout.write(self.style.ERROR(f"Error fetching league data: {e}"))
-                    continue
+            if league_raw is None:
+                league_raw = snapshot.league(sleeper_league_id, weeks=weeks_by_league[sleeper_league_id])
 
-                matchups_by_week = {}
-                for week in range(1, 19):
-                    m_res = requests.get(
-                        f"https://api.sleeper.app/v1/league/{sleeper_league_id}/matchups/{week}"
-                    )
-                    data = m_res.json() if m_res.status_code == 200 else None
-                    if data:
-                        matchups_by_week[str(week)] = data
+            sleeper_users = league_raw.get("users") or []
+            sleeper_rosters = league_raw.get("rosters") or []
+            league_data = league_raw.get("league") or {}
+            current_season = league_data.get("season") or current_nfl_season
+            matchups_by_week = league_raw.get("matchups") or {}
+            playoff_data = league_raw.get("winners_bracket") or []
 
-                playoff_res = requests.get(
-                    f"https://api.sleeper.app/v1/league/{sleeper_league_id}/winners_bracket"
-                )
-                playoff_data = playoff_res.json() if playoff_res.status_code == 200 else []
-
-            # --- STEP 1: SYNC USERS ---
-            self.stdout.write("Syncing users...")
-            team_name_map = {}
-            for user_data in sleeper_users:
-                uid = user_data.get("user_id")
-                if uid:
-                    team_name_map[uid] = user_data.get("metadata", {}).get("team_name")
-
-            for user_data in sleeper_users:
-                sleeper_id = user_data.get("user_id")
-                display_name = user_data.get("display_name", "SleeperUser")
-                if not sleeper_id:
-                    continue
-                try:
-                    profile = MemberProfile.objects.get(sleeper_id=sleeper_id)
-                    profile.full_name = display_name
-                    profile.save()
-                    user = profile.user
-                    if (
-                        user.username != display_name
-                        and not User.objects.filter(username=display_name).exists()
-                    ):
-                        user.username = display_name
-                        user.save()
-                except MemberProfile.DoesNotExist:
-                    base_username = display_name
-                    username = base_username
-                    counter = 1
-                    while User.objects.filter(username=username).exists():
-                        username = f"{base_username}_{counter}"
-                        counter += 1
-                    user = User.objects.create(username=username)
-                    user.set_unusable_password()
-                    user.save()
-                    profile = MemberProfile.objects.create(
-                        user=user, sleeper_id=sleeper_id, full_name=display_name
-                    )
-            self.stdout.write(self.style.SUCCESS("  Users synced."))
-
-            # --- STEP 2: SYNC TEAMS ---
-            self.stdout.write("Syncing teams...")
-            for roster_data in sleeper_rosters:
-                sleeper_roster_id = roster_data.get("roster_id")
-                owner_sleeper_id = roster_data.get("owner_id")
-
-                owner_profile = None
-                if owner_sleeper_id:
-                    try:
-                        owner_profile = MemberProfile.objects.get(sleeper_id=owner_sleeper_id)
-                    except MemberProfile.DoesNotExist:
-                        pass
-
-                team_name = team_name_map.get(owner_sleeper_id) if owner_sleeper_id else None
-                if not team_name and roster_data.get("metadata", {}).get("team_name"):
-                    team_name = roster_data["metadata"]["team_name"]
-                elif not team_name and owner_profile:
-                    team_name = f"Team {owner_profile.full_name}"
-                if not team_name:
-                    team_name = "Team Name Not Set"
-
-                settings = roster_data.get("settings", {})
-                wins = settings.get("wins", 0)
-                losses = settings.get("losses", 0)
-                ties = settings.get("ties", 0)
-                points_for = settings.get("fpts", 0.00)
-
-                if sleeper_roster_id:
-                    Team.objects.update_or_create(
-                        league=league,
-                        sleeper_roster_id=sleeper_roster_id,
-                        defaults={
-                            "owner": owner_profile,
-                            "team_name": team_name,
-                            "wins": wins,
-                            "losses": losses,
-                            "ties": ties,
-                            "points_for": points_for or 0.00,
-                        },
-                    )
-            self.stdout.write(self.style.SUCCESS("  Teams synced."))
+            # Everyone on a roster or in a loaded matchup gets a label in STEP 7
+            for roster in sleeper_rosters:
+                rostered_player_ids.update(roster.get("players") or [])
+            for matchups in matchups_by_week.values():
+                for m in matchups or []:
+                    rostered_player_ids.update(m.get("players") or [])
+
+            # Rosters and users drive STEP 1 and 2; an unchanged hash means nothing to rewrite
+            roster_hash = hashlib.sha256(
+                json.dumps([sleeper_users, sleeper_rosters], sort_keys=True).encode()
+            ).hexdigest()
+            roster_changed = not incremental or roster_hash != league.roster_hash
+
+            if roster_changed:
+                # --- STEP 1: SYNC USERS ---
+                self.stdout.write("Syncing users...")
+                team_name_map = {}
+                for user_data in sleeper_users:
+                    uid = user_data.get("user_id")
+                    if uid:
+                        team_name_map[uid] = user_data.get("metadata", {}).get("team_name")
+
+                profiles_by_sleeper_id = self.reconcile_users(sleeper_users)
+                self.stdout.write(self.style.SUCCESS("  Users synced."))
+
+                # --- STEP 2: SYNC TEAMS ---
+                self.stdout.write("Syncing teams...")
+                for roster_data in sleeper_rosters:
+                    sleeper_roster_id = roster_data.get("roster_id")
+                    owner_sleeper_id = roster_data.get("owner_id")
+
+                    owner_profile = profiles_by_sleeper_id.get(owner_sleeper_id) if owner_sleeper_id else None
+
+                    team_name = team_name_map.get(owner_sleeper_id) if owner_sleeper_id else None
+                    if not team_name and roster_data.get("metadata", {}).get("team_name"):
+                        team_name = roster_data["metadata"]["team_name"]
+                    elif not team_name and owner_profile:
+                        team_name = f"Team {owner_profile.full_name}"
+                    if not team_name:
+                        team_name = "Team Name Not Set"
+
+                    settings = roster_data.get("settings", {})
+                    wins = settings.get("wins", 0)
+                    losses = settings.get("losses", 0)
+                    ties = settings.get("ties", 0)
+                    points_for = settings.get("fpts", 0.00)
+
+                    if sleeper_roster_id:
+                        Team.objects.update_or_create(
+                            league=league,
+                            sleeper_roster_id=sleeper_roster_id,
+                            defaults={
+                                "owner": owner_profile,
+                                "team_name": team_name,
+                                "wins": wins,
+                                "losses": losses,
+                                "ties": ties,
+                                "points_for": points_for or 0.00,
+                            },
+                        )
+                self.stdout.write(self.style.SUCCESS("  Teams synced."))
+            else:
+                self.stdout.write("Rosters unchanged since last sync. Skipping users and teams.")
 
             # --- STEP 3: SYNC SCORES & TOP 3 ---
             self.stdout.write("Syncing scores and top players...")
             roster_player_points = defaultdict(lambda: defaultdict(float))
-
-            for week in range(1, 19):
+            teams_by_roster = {
+                team.sleeper_roster_id: team
+                for team in Team.objects.filter(league=league)
+            }
+            score_rows = []
+
+            weeks_to_sync = weeks_by_league[sleeper_league_id]
+            # Weeks are written in order up to the first one that's missing
+            last_written_week = None
+            for week in weeks_to_sync:
                 matchups = matchups_by_week.get(str(week))
                 if not matchups:
                     break
+                written_weeks[int(current_season)].add(week)
+                last_written_week = week
 
                 for m in matchups:
                     rid = m.get("roster_id")
                     if not rid:
                         continue
 
-                    pts = m.get("points") or 0.00
-                    try:
-                        team = Team.objects.get(league=league, sleeper_roster_id=rid)
-                        WeeklyScore.objects.update_or_create(
-                            team=team,
-                            week=week,
-                            season=current_season,
-                            defaults={"points_scored": pts},
-                        )
-                    except Team.DoesNotExist:
+                    team = teams_by_roster.get(str(rid))
+                    if team is None:
                         continue
 
+                    score_rows.append(WeeklyScore(
+                        team=team,
+                        week=week,
+                        season=current_season,
+                        points_scored=m.get("points") or 0.00,
+                        matchup_id=m.get("matchup_id"),
+                    ))
+
                     p_points = m.get("players_points") or {}
                     for pid, score in p_points.items():
                         roster_player_points[rid][pid] += score
 
+            # Season totals need every week, so partial incremental runs leave top 3 alone
+            if weeks_to_sync and weeks_to_sync[0] != 1:
+                roster_player_points.clear()
+
+            teams_to_update = []
             for rid, players_dict in roster_player_points.items():
-                try:
-                    team = Team.objects.get(league=league, sleeper_roster_id=rid)
-                    sorted_players = sorted(
-                        players_dict.items(), key=lambda x: x[1], reverse=True
-                    )
-                    top_3 = []
-                    for pid, score in sorted_players[:3]:
-                        p_info = player_lookup.get(str(pid), player_lookup.get(pid, {"name": "Unknown", "position": "?"}))
-                        top_3.append({
-                            "id": str(pid),
-                            "name": p_info.get("name", "Unknown"),
-                            "position": p_info.get("position", "?"),
-                            "total_points": score,
-                            "avatar_url": f"https://sleepercdn.com/content/nfl/players/{pid}.jpg",
-                        })
-                    team.top_three_players = top_3
-                    team.save()
-                except Team.DoesNotExist:
-                    pass
+                team = teams_by_roster[str(rid)]
+                sorted_players = sorted(
+                    players_dict.items(), key=lambda x: x[1], reverse=True
+                )
+                top_3 = []
+                for pid, score in sorted_players[:3]:
+                    p_info = player_lookup.get(str(pid), player_lookup.get(pid, {"name": "Unknown", "position": "?"}))
+                    top_3.append({
+                        "id": str(pid),
+                        "name": p_info.get("name", "Unknown"),
+                        "position": p_info.get("position") or "N/A",
+                        "total_points": score,
+                        "avatar_url": f"https://sleepercdn.com/content/nfl/players/{pid}.jpg",
+                    })
+                team.top_three_players = top_3
+                teams_to_update.append(team)
+
+            # One upsert for the whole league instead of a get + update_or_create per row
+            with transaction.atomic():
+                WeeklyScore.objects.bulk_create(
+                    score_rows,
+                    update_conflicts=True,
+                    unique_fields=["team", "week", "season"],
+                    update_fields=["points_scored", "matchup_id"],
+                    batch_size=500,
+                )
+                Team.objects.bulk_update(teams_to_update, ["top_three_players"])
 
             self.stdout.write(self.style.SUCCESS("  Scores synced."))
 
@@ -330,6 +517,16 @@ class Command(BaseCommand):
                     f"  Week {current_league_week}. Playoffs start Week {PLAYOFF_START_WEEK}."
                 )
 
+            # --- SYNC WATERMARK ---
+            league.last_completed_week = advance_watermark(
+                league.last_completed_week,
+                last_written_week,
+                league_week(league, current_league_week, current_nfl_season),
+            )
+            league.roster_hash = roster_hash
+            league.last_synced_at = timezone.now()
+            league.save(update_fields=["last_completed_week", "roster_hash", "last_synced_at"])
+
             # --- GATHER PLAYOFF PLAYERS FOR STEP 5 ---
             target_roster_ids = set()
             if current_league_week < PLAYOFF_START_WEEK and playoff_data:
@@ -358,70 +555,37 @@ class Command(BaseCommand):
             top_ids_tuples = player_counts.most_common(15)
 
             if top_ids_tuples:
-                player_db = snapshot.get("players", {}) if (from_local and snapshot) else {}
-                if not from_local and not player_db:
-                    try:
-                        p_res = requests.get("https://api.sleeper.app/v1/players/nfl")
-                        player_db = p_res.json()
-                    except Exception:
-                        player_db = {}
-
-                processed_players = []
+                candidates = []
                 for pid, count in top_ids_tuples:
-                    pid_str = str(pid)
-                    player_info = player_db.get(pid_str) or player_db.get(pid)
-                    if not player_info:
-                        continue
-                    position = player_info.get("position")
-                    if position == "DEF":
+                    player_info = player_lookup.get(str(pid))
+                    if not player_info or player_info.get("position") == "DEF":
                         continue
+                    candidates.append((str(pid), count, player_info))
+
+                averages = {}
+                if candidates and current_nfl_season:
+                    if from_local:
+                        # A snapshot never changes under us, so always re-read it
+                        fetch, max_age = snapshot.player_stats, timedelta(0)
+                    else:
+                        fetch = http_stats_source(session, current_nfl_season, timeout)
+                        max_age = timedelta(hours=options.get("stats_ttl_hours", DEFAULT_STATS_TTL_HOURS))
+                    averages = season_averages(
+                        [pid for pid, _, _ in candidates], current_nfl_season, fetch,
+                        max_age=max_age, concurrency=concurrency,
+                    )
 
-                    avg_score = 0.0
-                    if from_local and pid_str in player_stats:
-                        stats_data = player_stats[pid_str]
-                        total_points = 0.0
-                        weeks_played = 0
-                        for week_data in (stats_data or {}).values():
-                            if not week_data:
-                                continue
-                            stats = week_data.get("stats", {})
-                            week_points = stats.get("pts_ppr", 0.0)
-                            if week_points and float(week_points) > 0:
-                                total_points += float(week_points)
-                                weeks_played += 1
-                        if weeks_played > 0:
-                            avg_score = total_points / weeks_played
-                    elif not from_local and current_nfl_season:
-                        try:
-                            stats_res = requests.get(
-                                f"https://api.sleeper.com/stats/nfl/player/{pid}"
-                                f"?season_type=regular&season={current_nfl_season}&grouping=week"
-                            )
-                            if stats_res.status_code == 200:
-                                stats_data = stats_res.json()
-                                total_points = 0.0
-                                weeks_played = 0
-                                for week_data in (stats_data or {}).values():
-                                    if not week_data:
-                                        continue
-                                    stats = week_data.get("stats", {})
-                                    week_points = stats.get("pts_ppr", 0.0)
-                                    if week_points and float(week_points) > 0:
-                                        total_points += float(week_points)
-                                        weeks_played += 1
-                                if weeks_played > 0:
-                                    avg_score = total_points / weeks_played
-                        except Exception:
-                            pass
-
-                    processed_players.append({
-                        "id": pid_str,
-                        "player_name": f"{player_info.get('first_name', '')} {player_info.get('last_name', '')}".strip(),
-                        "position": position,
-                        "nfl_team": player_info.get("team"),
+                processed_players = [
+                    {
+                        "id": pid,
+                        "player_name": player_info["name"],
+                        "position": player_info.get("position") or "N/A",
+                        "nfl_team": player_info.get("team") or "N/A",
                         "count": count,
-                        "average_score": avg_score,
-                    })
+                        "average_score": averages.get(pid, 0.0),
+                    }
+                    for pid, count, player_info in candidates
+                ]
 
                 processed_players.sort(key=lambda x: (-x["count"], -x["average_score"]))
                 CommonPlayer.objects.all().delete()
@@ -441,4 +605,38 @@ class Command(BaseCommand):
                     )
                 self.stdout.write(self.style.SUCCESS("Common Players updated."))
 
+        # --- STEP 6: STANDINGS ---
+        self.stdout.write("\n--- Step 6: Standings ---")
+        count = rebuild_standings()
+        self.stdout.write(self.style.SUCCESS(f"Standings rebuilt for {count} teams."))
+
+        # --- STEP 7: ROSTERED PLAYERS ---
+        self.stdout.write("\n--- Step 7: Rostered Players ---")
+        if failed_leagues:
+            # A partial set would blank out the missing leagues' stickers; keep the last full one
+            self.stdout.write(self.style.WARNING(
+                f"{failed_leagues} league(s) failed to load. Keeping the previous rostered player list."
+            ))
+        else:
+            version, changed = store_rostered_players(rostered_player_ids, player_lookup)
+            self.stdout.write(self.style.SUCCESS(
+                f"Rostered player list {'rebuilt' if changed else 'unchanged'} "
+                f"({len(rostered_player_ids)} players, version {version[:12]})."
+            ))
+
+        # --- STEP 8: RECORDS ---
+        self.stdout.write("\n--- Step 8: Records ---")
+        # A full sync rewrote every week, so rescan; incremental runs only weigh the new weeks
+        count = update_records({
+            season: weeks if incremental else None for season, weeks in written_weeks.items()
+        })
+        self.stdout.write(self.style.SUCCESS(f"Records updated ({count} written)."))
+
+        # --- STEP 9: BIG PLAYOFF BRACKET ---
+        # New playoff-week scores move the projected cut line for the week in progress
+        for season in sorted(written_weeks):
+            if rebuild_bracket(season) is not None:
+                self.stdout.write(self.style.SUCCESS(f"BIG Playoff bracket rebuilt for {season}."))
+
+        invalidate_public_cache()
         self.stdout.write(self.style.SUCCESS("--- Sync complete! ---"))
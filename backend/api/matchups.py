@@ -0,0 +1,102 @@
+"""
+Matchup drill-downs: one league-week's matchups joined with its players' stats.
+
+Both come from Sleeper through SharedValues, so every visitor shares a single
+copy instead of downloading the whole week's stats dump. A completed week
+can't change, so it is kept under its own key that never goes stale; the week
+in progress is refetched once it is older than LIVE_WEEK_TTL seconds. Stats
+are trimmed to the players in the matchups and the fields the stat lines use.
+Callers pass the league's own season, so a key is never filed under the
+wrong one; at most MAX_SHARED_VALUES keys are held in process.
+"""
+
+from functools import lru_cache
+
+from django.conf import settings
+
+from .cache import SharedValue
+from .nfl_state import get_nfl_state, nfl_week
+from .sleeper import SLEEPER_BASE, build_session, fetch_json
+
+# Everything the frontend's getStatLine() reads, plus the fantasy total
+STAT_FIELDS = (
+    'pts_ppr',
+    'pass_cmp', 'pass_att', 'pass_yd', 'pass_td', 'pass_int',
+    'rush_att', 'rush_yd', 'rush_td',
+    'rec', 'rec_tgt', 'rec_yd', 'rec_td',
+    'fgm', 'fga', 'xpm',
+    'pts_allow', 'sack', 'def_int', 'fum_rec', 'safe',
+)
+
+# A season's worth of league-weeks plus their stats, with room to spare
+MAX_SHARED_VALUES = 512
+
+_session = None
+
+
+@lru_cache(maxsize=MAX_SHARED_VALUES)
+def _shared(key):
+    return SharedValue(key)
+
+
+def _fetch(path):
+    global _session
+    _session = _session or build_session()
+    return fetch_json(_session, f"{SLEEPER_BASE}{path}")
+
+
+def is_completed(season, week):
+    """Whether `week` of `season` is over, per the NFL state. Unknown counts as live."""
+    try:
+        state = get_nfl_state()
+        current = (int(state.get('season') or 0), nfl_week(state))
+    except Exception:
+        return False
+    return (season, week) < current
+
+
+def slim_stats(raw):
+    """Sleeper's {player_id: {stat: value}} week dump, cut down to STAT_FIELDS."""
+    slim = {}
+    for pid, stats in (raw or {}).items():
+        fields = {key: stats[key] for key in STAT_FIELDS if (stats or {}).get(key) is not None}
+        if fields:
+            slim[pid] = fields
+    return slim
+
+
+def matchup_detail(league_id, season, week):
+    """
+    {'leagueId', 'season', 'week', 'completed', 'matchups', 'stats'} where
+    stats covers only players on the rosters in `matchups`. Raises the
+    upstream error if the matchups can't be fetched and nothing is cached yet;
+    missing stats just leave `stats` empty.
+    """
+    completed = is_completed(season, week)
+    suffix = 'final' if completed else 'live'
+    max_age = float('inf') if completed else settings.LIVE_WEEK_TTL
+
+    matchups = _shared(f'matchups:{league_id}:{season}:{week}:{suffix}').get(
+        lambda: _fetch(f"/league/{league_id}/matchups/{week}") or [], max_age,
+    )['value']
+    try:
+        week_stats = _shared(f'week-stats:{season}:{week}:{suffix}').get(
+            lambda: slim_stats(_fetch(f"/stats/nfl/regular/{season}/{week}")), max_age,
+        )['value']
+    except Exception:
+        # Lineups are still worth showing without stat lines
+        week_stats = {}
+
+    player_ids = {
+        pid
+        for matchup in matchups
+        for pid in (matchup.get('players') or []) + (matchup.get('starters') or [])
+    }
+    return {
+        'leagueId':  league_id,
+        'season':    season,
+        'week':      week,
+        'completed': completed,
+        'matchups':  matchups,
+        'stats':     {pid: week_stats[pid] for pid in sorted(player_ids) if pid in week_stats},
+    }
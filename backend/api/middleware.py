@@ -0,0 +1,113 @@
+"""
+Per-request timing: database query count/time, view time, serializer time
+(turning model instances into dicts) and response rendering (dicts into
+JSON) time.
+
+Every request gets one structured log line on the "api.timing" logger.
+With DEBUG on, or for staff, the response also carries a Server-Timing
+header, which browser devtools show under the request's Timing tab:
+
+    Server-Timing: db;dur=4.1;desc="3 queries", view;dur=9.6, serialize;dur=3.2, render;dur=1.2, total;dur=14.3
+
+"view" is everything else the view does, database time included.
+
+It isn't sent to anyone else, since query counts and timings say more
+about the backend than the public needs to know.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger('api.timing')
+
+_current = ContextVar('request_timing_metrics', default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self.serializing = False
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+@contextmanager
+def timed_serialization():
+    """Counts the enclosed block as the current request's serializer time."""
+    metrics = _current.get()
+    # Nested serializers run inside their parent's block; count that once
+    if metrics is None or metrics.serializing:
+        yield
+        return
+    metrics.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_time += time.perf_counter() - started
+        metrics.serializing = False
+
+
+class RequestTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = request.timing_metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(metrics.record_query):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        view = total - metrics.serialize_time - metrics.render_time
+        # DRF copies the user it authenticates (e.g. from a JWT) onto the request
+        user = getattr(request, 'user', None)
+        if settings.DEBUG or getattr(user, 'is_staff', False):
+            response['Server-Timing'] = ', '.join([
+                f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+                f'view;dur={view * 1000:.1f}',
+                f'serialize;dur={metrics.serialize_time * 1000:.1f}',
+                f'render;dur={metrics.render_time * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            ])
+        logger.info(json.dumps({
+            'method':    request.method,
+            'path':      request.path,
+            'status':    response.status_code,
+            'queries':   metrics.queries,
+            'db_ms':     round(metrics.db_time * 1000, 1),
+            'view_ms':      round(view * 1000, 1),
+            'serialize_ms': round(metrics.serialize_time * 1000, 1),
+            'render_ms':    round(metrics.render_time * 1000, 1),
+            'total_ms':     round(total * 1000, 1),
+        }))
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Responses are rendered to JSON right after this hook
+        started = time.perf_counter()
+
+        def rendered(response):
+            request.timing_metrics.render_time += time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
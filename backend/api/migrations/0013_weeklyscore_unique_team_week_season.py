@@ -0,0 +1,31 @@
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def drop_duplicate_scores(apps, schema_editor):
+    """Keep only the newest row for each (team, week, season) before adding the constraint."""
+    WeeklyScore = apps.get_model('api', 'WeeklyScore')
+    dupes = (
+        WeeklyScore.objects.values('team', 'week', 'season')
+        .annotate(n=Count('id'), keep=Max('id'))
+        .filter(n__gt=1)
+    )
+    for d in dupes:
+        WeeklyScore.objects.filter(
+            team=d['team'], week=d['week'], season=d['season']
+        ).exclude(id=d['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_memberprofile_has_completed_onboarding'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_scores, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='weeklyscore',
+            unique_together={('team', 'week', 'season')},
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_weeklyscore_unique_team_week_season'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='league',
+            name='last_completed_week',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='league',
+            name='roster_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='league',
+            name='last_synced_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
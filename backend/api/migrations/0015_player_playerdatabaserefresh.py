@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_league_sync_watermarks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Player',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('player_id', models.CharField(max_length=50, unique=True)),
+                ('first_name', models.CharField(blank=True, default='', max_length=100)),
+                ('last_name', models.CharField(blank=True, default='', max_length=100)),
+                ('position', models.CharField(blank=True, max_length=10, null=True)),
+                ('nfl_team', models.CharField(blank=True, max_length=10, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PlayerDatabaseRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('refreshed_at', models.DateTimeField()),
+                ('content_hash', models.CharField(max_length=64)),
+                ('player_count', models.IntegerField(default=0)),
+            ],
+        ),
+    ]
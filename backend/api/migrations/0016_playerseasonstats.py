@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_player_playerdatabaserefresh'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSeasonStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('player_id', models.CharField(max_length=50)),
+                ('season', models.IntegerField()),
+                ('total_points', models.DecimalField(decimal_places=2, default=0.0, max_digits=7)),
+                ('weeks_played', models.IntegerField(default=0)),
+                ('average_score', models.DecimalField(decimal_places=2, default=0.0, max_digits=5)),
+                ('fetched_at', models.DateTimeField()),
+            ],
+            options={
+                'unique_together': {('player_id', 'season')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_team_league_standing_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('rank', models.IntegerField(help_text='Overall rank by points_for across the season')),
+                ('league_rank', models.IntegerField(help_text='Rank within the league by wins, then points_for')),
+                ('team_name', models.CharField(max_length=100)),
+                ('owner_name', models.CharField(max_length=200)),
+                ('league_name', models.CharField(max_length=100)),
+                ('wins', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('ties', models.IntegerField(default=0)),
+                ('record', models.CharField(max_length=20)),
+                ('points_for', models.DecimalField(decimal_places=2, default=0.0, max_digits=7)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='api.league')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='api.team')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['season', 'rank'], name='standing_season_rank_idx'),
+                    models.Index(fields=['season', 'league', 'league_rank'], name='standing_league_rank_idx'),
+                ],
+                'unique_together': {('season', 'team')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_standing'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='weeklyscore',
+            index=models.Index(fields=['season', 'week', '-id'], name='weeklyscore_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['season', '-id'], name='payout_season_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+from django.db import migrations
+from django.db.models import Count, Max
+
+
+def move_rows(model, from_team, to_team, key_fields):
+    """Moves `from_team`'s rows to `to_team`, except any whose `key_fields` `to_team` already has a row for."""
+    taken = set(model.objects.filter(team_id=to_team).values_list(*key_fields))
+    rows = model.objects.filter(team_id=from_team).values_list('id', *key_fields)
+    model.objects.filter(id__in=[row[0] for row in rows if row[1:] not in taken]).update(team_id=to_team)
+
+
+def merge_duplicate_teams(apps, schema_editor):
+    """
+    Folds every duplicate (league, sleeper_roster_id) team into the newest one
+    before 0021 adds the constraint. Its scores and standings move across
+    unless the kept team already has one for that week/season (the newest
+    team is the one sync has been writing to); its playoff entries all move,
+    and drop_duplicate_playoff_entries settles any overlap.
+    """
+    Team = apps.get_model('api', 'Team')
+    WeeklyScore = apps.get_model('api', 'WeeklyScore')
+    UltimatePlayoffEntry = apps.get_model('api', 'UltimatePlayoffEntry')
+    Standing = apps.get_model('api', 'Standing')
+    dupes = (
+        Team.objects.values('league', 'sleeper_roster_id')
+        .annotate(n=Count('id'), keep=Max('id'))
+        .filter(n__gt=1)
+    )
+    for d in dupes:
+        duplicates = (
+            Team.objects.filter(league=d['league'], sleeper_roster_id=d['sleeper_roster_id'])
+            .exclude(id=d['keep']).order_by('-id').values_list('id', flat=True)
+        )
+        for team_id in duplicates:
+            move_rows(WeeklyScore, team_id, d['keep'], ('season', 'week'))
+            move_rows(Standing, team_id, d['keep'], ('season',))
+            UltimatePlayoffEntry.objects.filter(team_id=team_id).update(team_id=d['keep'])
+        Team.objects.filter(id__in=list(duplicates)).delete()
+
+
+def drop_duplicate_playoff_entries(apps, schema_editor):
+    """Keep only the newest entry for each (team, season, playoff_week) before adding the constraint."""
+    UltimatePlayoffEntry = apps.get_model('api', 'UltimatePlayoffEntry')
+    dupes = (
+        UltimatePlayoffEntry.objects.values('team', 'season', 'playoff_week')
+        .annotate(n=Count('id'), keep=Max('id'))
+        .filter(n__gt=1)
+    )
+    for d in dupes:
+        UltimatePlayoffEntry.objects.filter(
+            team=d['team'], season=d['season'], playoff_week=d['playoff_week']
+        ).exclude(id=d['keep']).delete()
+
+
+class Migration(migrations.Migration):
+    # Data only: PostgreSQL won't ALTER a table with deletes still pending in the same transaction
+
+    dependencies = [
+        ('api', '0019_history_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_teams, migrations.RunPython.noop),
+        migrations.RunPython(drop_duplicate_playoff_entries, migrations.RunPython.noop),
+    ]
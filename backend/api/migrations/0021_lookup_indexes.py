@@ -0,0 +1,32 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0020_dedupe_lookup_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='memberprofile',
+            name='sleeper_id',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name='team',
+            unique_together={('league', 'sleeper_roster_id')},
+        ),
+        migrations.AddIndex(
+            model_name='weeklyscore',
+            index=models.Index(fields=['season', 'week', '-points_scored'], name='weeklyscore_week_points_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='ultimateplayoffentry',
+            unique_together={('team', 'season', 'playoff_week')},
+        ),
+        migrations.AddIndex(
+            model_name='ultimateplayoffentry',
+            index=models.Index(fields=['season', 'playoff_week', 'is_eliminated'], name='playoff_entry_week_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0021_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RosteredPlayers',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(help_text='sha256 of the uncompressed JSON', max_length=64, unique=True)),
+                ('payload', models.BinaryField()),
+                ('player_count', models.IntegerField(default=0)),
+                ('built_at', models.DateTimeField()),
+            ],
+        ),
+    ]
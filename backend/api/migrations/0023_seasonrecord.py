@@ -0,0 +1,39 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0022_rosteredplayers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='weeklyscore',
+            name='matchup_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='SeasonRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField()),
+                ('kind', models.CharField(choices=[('high_score', 'Highest score'), ('low_score', 'Lowest score'), ('blowout', 'Biggest blowout'), ('closest', 'Closest game')], max_length=20)),
+                ('week', models.IntegerField()),
+                ('points', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('opponent_points', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('margin', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('team_name', models.CharField(max_length=100)),
+                ('owner_name', models.CharField(max_length=200)),
+                ('opponent_name', models.CharField(blank=True, default='', max_length=100)),
+                ('league_name', models.CharField(max_length=100)),
+                ('league', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.league')),
+                ('opponent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.team')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='api.team')),
+            ],
+            options={
+                'unique_together': {('season', 'kind')},
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0023_seasonrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayoffBracket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.IntegerField(unique=True)),
+                ('payload', models.JSONField(default=dict)),
+                ('built_at', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -7,7 +7,7 @@ class MemberProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     first_name = models.CharField(max_length=100, blank=True)
     last_name = models.CharField(max_length=100, blank=True)
-    sleeper_id = models.CharField(max_length=100, blank=True, null=True)
+    sleeper_id = models.CharField(max_length=100, blank=True, null=True, db_index=True)
     sleeper_display_name = models.CharField(max_length=100, blank=True, null=True)
     payment_info = models.CharField(max_length=100, blank=True, null=True)
     phone = models.CharField(max_length=30, blank=True, null=True)
@@ -41,6 +41,11 @@ class League(models.Model):
         blank=True
     )
 
+    # Watermarks for `sync_sleeper --incremental`
+    last_completed_week = models.IntegerField(default=0)
+    roster_hash = models.CharField(max_length=64, blank=True, default='')
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
         # This will show "League Name (2025)" in the admin
         return f"{self.name} ({self.season})"
@@ -57,6 +62,14 @@ class Team(models.Model):
     points_for = models.DecimalField(max_digits=7, decimal_places=2, default=0.00)
     top_three_players = models.JSONField(default=list, blank=True)
 
+    class Meta:
+        # sync_sleeper and post_weekly_winners look teams up by league + roster id
+        unique_together = ('league', 'sleeper_roster_id')
+        indexes = [
+            # TeamList filters by league and sorts by record
+            models.Index(fields=['league', '-wins', '-points_for'], name='team_league_standing_idx'),
+        ]
+
     def __str__(self):
         if self.owner:
             return f"{self.team_name} ({self.owner.user.username})"
@@ -68,6 +81,18 @@ class WeeklyScore(models.Model):
     week = models.IntegerField()
     points_scored = models.DecimalField(max_digits=5, decimal_places=2)
     season = models.IntegerField()
+    # Sleeper's pairing key: the two teams in a league/week sharing one played each other
+    matchup_id = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        # One score per team per week — lets sync_sleeper upsert in bulk
+        unique_together = ('team', 'week', 'season')
+        indexes = [
+            # WeeklyScoreList ?season= / ?week= pages, already in cursor (-id) order
+            models.Index(fields=['season', 'week', '-id'], name='weeklyscore_history_idx'),
+            # Weekly winners (top score per week)
+            models.Index(fields=['season', 'week', '-points_scored'], name='weeklyscore_week_points_idx'),
+        ]
 
     def __str__(self):
         # Shows "Team Name - Week 1: 120.50" in admin
@@ -82,6 +107,14 @@ class UltimatePlayoffEntry(models.Model):
     is_eliminated = models.BooleanField(default=False)
     final_rank = models.IntegerField(null=True, blank=True)
 
+    class Meta:
+        # A team has one entry per playoff week
+        unique_together = ('team', 'season', 'playoff_week')
+        indexes = [
+            # Elimination and bracket status read the active entries for one week
+            models.Index(fields=['season', 'playoff_week', 'is_eliminated'], name='playoff_entry_week_idx'),
+        ]
+
     def __str__(self):
         # Shows "Team Name (Season 2025 - Week 15)" in admin
         return f"{self.team.team_name} ({self.season} - Week {self.playoff_week})"
@@ -94,6 +127,12 @@ class Payout(models.Model):
     season = models.IntegerField()
     is_paid = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # PayoutList ?season= pages, already in cursor (-id) order
+            models.Index(fields=['season', '-id'], name='payout_season_idx'),
+        ]
+
     def __str__(self):
         # Shows "Nic - $5.00 (Weekly Winner Week 5)" in admin
         return f"{self.recipient.user.username} - ${self.amount} ({self.reason})"
@@ -154,4 +193,134 @@ class CommonPlayer(models.Model):
     average_score = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
 
     def __str__(self):
-        return f"#{self.rank} {self.player_name} ({self.count})"
\ No newline at end of file
+        return f"#{self.rank} {self.player_name} ({self.count})"
+
+
+class Player(models.Model):
+    # Local copy of Sleeper's /players/nfl dump, refreshed by sync_sleeper
+    player_id = models.CharField(max_length=50, unique=True)
+    first_name = models.CharField(max_length=100, blank=True, default='')
+    last_name = models.CharField(max_length=100, blank=True, default='')
+    position = models.CharField(max_length=10, null=True, blank=True)
+    nfl_team = models.CharField(max_length=10, null=True, blank=True)
+
+    @property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}".strip()
+
+    def __str__(self):
+        return f"{self.full_name} ({self.position or '?'})"
+
+
+class PlayerDatabaseRefresh(models.Model):
+    # One row per /players/nfl check; the newest row says how fresh Player is
+    refreshed_at = models.DateTimeField()
+    content_hash = models.CharField(max_length=64)
+    player_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.player_count} players @ {self.refreshed_at:%Y-%m-%d %H:%M}"
+
+
+class PlayerSeasonStats(models.Model):
+    # Per-player season averages, cached by sync_sleeper so widgets don't refetch them
+    player_id = models.CharField(max_length=50)
+    season = models.IntegerField()
+    total_points = models.DecimalField(max_digits=7, decimal_places=2, default=0.00)
+    weeks_played = models.IntegerField(default=0)
+    average_score = models.DecimalField(max_digits=5, decimal_places=2, default=0.00)
+    fetched_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('player_id', 'season')
+
+    def __str__(self):
+        return f"{self.player_id} {self.season}: {self.average_score} avg"
+
+
+class RosteredPlayers(models.Model):
+    # Gzipped {player_id: {full_name, position, team}} for every player on a
+    # synced roster, rebuilt by sync_sleeper; browsers fetch this instead of
+    # Sleeper's multi-MB /players/nfl dump
+    version = models.CharField(max_length=64, unique=True, help_text="sha256 of the uncompressed JSON")
+    payload = models.BinaryField()
+    player_count = models.IntegerField(default=0)
+    built_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.player_count} rostered players ({self.version[:12]})"
+
+
+class SeasonRecord(models.Model):
+    # A season's best/worst single-week marks, kept current by sync_sleeper
+    # (see api/records.py); /api/records/ reads these rows as they are
+    HIGH_SCORE = "high_score"
+    LOW_SCORE = "low_score"
+    BLOWOUT = "blowout"
+    CLOSEST = "closest"
+    KIND_CHOICES = [
+        (HIGH_SCORE, "Highest score"),
+        (LOW_SCORE, "Lowest score"),
+        (BLOWOUT, "Biggest blowout"),
+        (CLOSEST, "Closest game"),
+    ]
+
+    season = models.IntegerField()
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    week = models.IntegerField()
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name="+")
+    # For blowout/closest, team is the winner and opponent the loser
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="+")
+    opponent = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="+", null=True, blank=True)
+    points = models.DecimalField(max_digits=5, decimal_places=2)
+    opponent_points = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    margin = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    team_name = models.CharField(max_length=100)
+    owner_name = models.CharField(max_length=200)
+    opponent_name = models.CharField(max_length=100, blank=True, default="")
+    league_name = models.CharField(max_length=100)
+
+    class Meta:
+        unique_together = ('season', 'kind')
+
+    def __str__(self):
+        return f"{self.season} {self.get_kind_display()}: {self.team_name} (Week {self.week})"
+
+
+class PlayoffBracket(models.Model):
+    # One season's BIG Playoff laid out week by week (see api/bracket.py),
+    # rebuilt whenever entries or playoff-week scores change
+    season = models.IntegerField(unique=True)
+    payload = models.JSONField(default=dict)
+    built_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.season} BIG Playoff bracket"
+
+
+class Standing(models.Model):
+    # Denormalized, pre-ranked copy of Team rebuilt at the end of every sync;
+    # public widgets read these rows instead of sorting and joining Team
+    season = models.IntegerField()
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="standings")
+    league = models.ForeignKey(League, on_delete=models.CASCADE, related_name="standings")
+    rank = models.IntegerField(help_text="Overall rank by points_for across the season")
+    league_rank = models.IntegerField(help_text="Rank within the league by wins, then points_for")
+    team_name = models.CharField(max_length=100)
+    owner_name = models.CharField(max_length=200)
+    league_name = models.CharField(max_length=100)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    ties = models.IntegerField(default=0)
+    record = models.CharField(max_length=20)
+    points_for = models.DecimalField(max_digits=7, decimal_places=2, default=0.00)
+
+    class Meta:
+        unique_together = ('season', 'team')
+        indexes = [
+            models.Index(fields=['season', 'rank'], name='standing_season_rank_idx'),
+            models.Index(fields=['season', 'league', 'league_rank'], name='standing_league_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.season} #{self.rank} {self.team_name} ({self.record})"
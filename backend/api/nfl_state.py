@@ -0,0 +1,52 @@
+"""
+Cached view of Sleeper's /state/nfl (current season and week).
+
+Views call get_nfl_state() instead of hitting Sleeper themselves. The state
+is a SharedValue: held in-process and in the shared Django cache for
+NFL_STATE_TTL seconds, refreshed by one caller at a time, and served stale
+while Sleeper is down. sync_sleeper decides what to write from the week, so
+it uses refresh_nfl_state(), which never falls back to an old copy.
+"""
+
+from django.conf import settings
+
+from .cache import SharedValue
+from .sleeper import SLEEPER_BASE, build_session, fetch_json
+
+REQUEST_TIMEOUT = 5
+
+_state = SharedValue('nfl-state')
+_session = None
+
+
+def nfl_week(state):
+    """Sleeper reports week 0 in the offseason; fall back to display_week like sync always has."""
+    return state.get('week', 0) or state.get('display_week', 0)
+
+
+def _fetch(session, timeout):
+    global _session
+    if session is None:
+        _session = _session or build_session(1)
+        session = _session
+    return fetch_json(session, f"{SLEEPER_BASE}/state/nfl", timeout)
+
+
+def get_nfl_state(max_age=None, session=None, timeout=REQUEST_TIMEOUT):
+    """
+    Returns the /state/nfl payload, at most `max_age` seconds old
+    (NFL_STATE_TTL by default; pass 0 to force a refresh).
+
+    If the refresh fails, the last known state is returned instead, however
+    old it is. The upstream error is only raised when there is no state at all.
+    """
+    max_age = settings.NFL_STATE_TTL if max_age is None else max_age
+    return _state.get(lambda: _fetch(session, timeout), max_age)['value']
+
+
+def refresh_nfl_state(session=None, timeout=REQUEST_TIMEOUT):
+    """
+    Fetches /state/nfl now and shares it with get_nfl_state() callers.
+    Raises the upstream error instead of returning a stale state.
+    """
+    return _state.set(_fetch(session, timeout))['value']
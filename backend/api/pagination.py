@@ -0,0 +1,61 @@
+"""
+Cursor pagination and query-param filtering for the history endpoints
+(weekly scores, payouts), whose tables grow every season.
+
+Cursors walk the primary key, so every page is an indexed range scan and
+there is no COUNT(*), however many rows pile up.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class HistoryCursorPagination(CursorPagination):
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    # Newest rows first; ids never change, so cursors stay valid across syncs
+    ordering = '-id'
+
+
+def int_filters(request, params):
+    """
+    Maps the query params in `params` ({param: lookup}) to ORM filter kwargs,
+    skipping any that are absent. Raises ValueError naming a non-numeric one.
+    """
+    filters = {}
+    for param, lookup in params.items():
+        value = request.query_params.get(param)
+        if value is None or value == '':
+            continue
+        try:
+            filters[lookup] = int(value)
+        except ValueError:
+            raise ValueError(f'{param} must be a number.')
+    return filters
+
+
+def requested_fields(request, serializer_class):
+    """
+    The ?fields=a,b,c sparse fieldset, or None for all fields.
+    Raises ValueError for names the serializer doesn't have.
+    """
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = set(fields) - set(serializer_class.Meta.fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    return fields
+
+
+def paginated_response(view, request, queryset, serializer_class):
+    """One cursor page of `queryset`, serialized with only the ?fields= requested."""
+    fields = requested_fields(request, serializer_class)
+    if fields:
+        # The cursor needs id even when the client didn't ask for it
+        queryset = queryset.only(*{'id', *fields})
+    paginator = HistoryCursorPagination()
+    page = paginator.paginate_queryset(queryset, request, view=view)
+    serializer = serializer_class(page, many=True, fields=fields)
+    return paginator.get_paginated_response(serializer.data)
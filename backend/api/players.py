@@ -0,0 +1,239 @@
+"""
+Local copies of Sleeper player data.
+
+The /players/nfl dump is several MB, so sync_sleeper keeps it in the Player
+table and only downloads it again once the last refresh is older than the
+configured interval. A download whose content hash matches the previous one
+just bumps the refresh timestamp instead of rewriting every row.
+
+RosteredPlayers holds the slim, gzipped name/position/team map of just the
+players on synced rosters that the frontend labels stickers with, keyed by
+the hash of its content so clients can cache each version indefinitely.
+
+Per-player season averages live in PlayerSeasonStats and are refetched only
+when older than their TTL; season_averages() is the one place that fetches
+and aggregates them.
+"""
+
+import gzip
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Player, PlayerDatabaseRefresh, PlayerSeasonStats, RosteredPlayers
+from .sleeper import SLEEPER_BASE, SLEEPER_STATS_BASE, DEFAULT_CONCURRENCY, fetch_json
+
+DEFAULT_REFRESH_HOURS = 24
+DEFAULT_STATS_TTL_HOURS = 12
+# The dump is large enough that the normal per-request timeout is too tight
+MIN_DOWNLOAD_TIMEOUT = 30
+
+
+def content_hash(players):
+    return hashlib.sha256(json.dumps(players, sort_keys=True).encode()).hexdigest()
+
+
+def latest_refresh():
+    return PlayerDatabaseRefresh.objects.order_by('-refreshed_at').first()
+
+
+def _clip(value, field):
+    """`value` cut to Player.<field>'s max_length, so an odd upstream value can't fail the insert."""
+    return value[:Player._meta.get_field(field).max_length] if isinstance(value, str) else value
+
+
+def store_players(players, digest=None):
+    """
+    Upserts a /players/nfl payload into Player and records the refresh.
+    Returns True if rows were rewritten, False if the content was unchanged.
+    """
+    digest = digest or content_hash(players)
+    last = latest_refresh()
+    now = timezone.now()
+    if last and last.content_hash == digest:
+        last.refreshed_at = now
+        last.save(update_fields=['refreshed_at'])
+        return False
+
+    max_id_length = Player._meta.get_field('player_id').max_length
+    rows = [
+        Player(
+            player_id=str(pid),
+            first_name=_clip(details.get('first_name') or '', 'first_name'),
+            last_name=_clip(details.get('last_name') or '', 'last_name'),
+            position=_clip(details.get('position') or None, 'position'),
+            nfl_team=_clip(details.get('team') or None, 'nfl_team'),
+        )
+        for pid, details in players.items()
+        # Cutting an id short could merge two players, so those are left out instead
+        if len(str(pid)) <= max_id_length
+    ]
+    with transaction.atomic():
+        Player.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['player_id'],
+            update_fields=['first_name', 'last_name', 'position', 'nfl_team'],
+            batch_size=1000,
+        )
+        PlayerDatabaseRefresh.objects.create(
+            refreshed_at=now, content_hash=digest, player_count=len(rows)
+        )
+    return True
+
+
+def refresh_players(session, timeout, max_age=timedelta(hours=DEFAULT_REFRESH_HOURS)):
+    """
+    Downloads /players/nfl if the local copy is missing or older than `max_age`.
+    Returns "fresh", "unchanged" or "updated". Raises requests.RequestException
+    if the download fails — the existing table is left as it was.
+    """
+    last = latest_refresh()
+    if last and timezone.now() - last.refreshed_at < max_age:
+        return "fresh"
+
+    res = session.get(f"{SLEEPER_BASE}/players/nfl", timeout=max(timeout, MIN_DOWNLOAD_TIMEOUT))
+    res.raise_for_status()
+    digest = hashlib.sha256(res.content).hexdigest()
+    if last and last.content_hash == digest:
+        last.refreshed_at = timezone.now()
+        last.save(update_fields=['refreshed_at'])
+        return "unchanged"
+    return "updated" if store_players(res.json(), digest) else "unchanged"
+
+
+def player_lookup():
+    """
+    {player_id: {"name", "position", "team"}} for every cached player.
+    Position and team are None when Sleeper has none (free agents, retired
+    players), as in its own dump; callers that need a label supply "N/A".
+    """
+    return {
+        pid: {
+            "name": f"{first} {last}".strip(),
+            "position": position,
+            "team": team,
+        }
+        for pid, first, last, position, team in Player.objects.values_list(
+            'player_id', 'first_name', 'last_name', 'position', 'nfl_team'
+        )
+    }
+
+
+def store_rostered_players(player_ids, lookup):
+    """
+    Rebuilds RosteredPlayers from `player_ids`, labelled via `lookup`
+    (see player_lookup()); ids the lookup doesn't know are left out.
+    Returns (version, changed). An unchanged payload isn't rewritten.
+    """
+    players = {}
+    for pid in {str(pid) for pid in player_ids}:
+        info = lookup.get(pid)
+        if info:
+            players[pid] = {"full_name": info["name"], "position": info["position"], "team": info["team"]}
+    body = json.dumps(players, sort_keys=True, separators=(",", ":")).encode()
+    version = hashlib.sha256(body).hexdigest()
+    if RosteredPlayers.objects.filter(version=version).exists():
+        return version, False
+
+    with transaction.atomic():
+        RosteredPlayers.objects.all().delete()
+        RosteredPlayers.objects.create(
+            version=version,
+            # mtime=0 keeps the compressed bytes identical for identical content
+            payload=gzip.compress(body, mtime=0),
+            player_count=len(players),
+            built_at=timezone.now(),
+        )
+    return version, True
+
+
+def rostered_players_version():
+    """The current RosteredPlayers version, or None before the first sync."""
+    return RosteredPlayers.objects.order_by('-built_at').values_list('version', flat=True).first()
+
+
+def summarize_stats(stats_data):
+    """(total_points, weeks_played) over weeks with positive PPR points."""
+    total_points = 0.0
+    weeks_played = 0
+    for week_data in (stats_data or {}).values():
+        if not week_data:
+            continue
+        week_points = (week_data.get("stats") or {}).get("pts_ppr", 0.0)
+        if week_points and float(week_points) > 0:
+            total_points += float(week_points)
+            weeks_played += 1
+    return total_points, weeks_played
+
+
+def http_stats_source(session, season, timeout):
+    """A fetch(player_id) callable that reads weekly stats from the Sleeper stats API."""
+    def fetch(player_id):
+        return fetch_json(
+            session,
+            f"{SLEEPER_STATS_BASE}/player/{player_id}?season_type=regular&season={season}&grouping=week",
+            timeout,
+        )
+    return fetch
+
+
+def season_averages(player_ids, season, fetch, max_age=timedelta(hours=DEFAULT_STATS_TTL_HOURS),
+                    concurrency=DEFAULT_CONCURRENCY):
+    """
+    {player_id: average PPR points} for `season`.
+
+    Rows in PlayerSeasonStats younger than `max_age` are used as-is; the rest
+    are fetched concurrently with fetch(player_id) and written back. A player
+    whose fetch fails keeps their older row's average (0.0 if there is none)
+    and isn't rewritten, so the next run retries.
+    """
+    season = int(season)
+    player_ids = [str(pid) for pid in player_ids]
+    cutoff = timezone.now() - max_age
+    stored = {
+        row.player_id: row
+        for row in PlayerSeasonStats.objects.filter(season=season, player_id__in=player_ids)
+    }
+    averages = {pid: float(row.average_score) for pid, row in stored.items() if row.fetched_at > cutoff}
+    missing = [pid for pid in player_ids if pid not in averages]
+    if not missing:
+        return averages
+
+    def run(pid):
+        try:
+            return pid, fetch(pid)
+        except Exception:
+            return pid, None
+
+    now = timezone.now()
+    rows = []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(missing)))) as pool:
+        for pid, stats_data in pool.map(run, missing):
+            if stats_data is None:
+                averages[pid] = float(stored[pid].average_score) if pid in stored else 0.0
+                continue
+            total_points, weeks_played = summarize_stats(stats_data)
+            average = Decimal(f"{total_points / weeks_played if weeks_played else 0.0:.2f}")
+            averages[pid] = float(average)
+            rows.append(PlayerSeasonStats(
+                player_id=pid,
+                season=season,
+                total_points=Decimal(f"{total_points:.2f}"),
+                weeks_played=weeks_played,
+                average_score=average,
+                fetched_at=now,
+            ))
+
+    PlayerSeasonStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['player_id', 'season'],
+        update_fields=['total_points', 'weeks_played', 'average_score', 'fetched_at'],
+    )
+    return averages
@@ -0,0 +1,157 @@
+"""
+Association records: highest and lowest single-week score, biggest blowout
+and closest game, kept as four SeasonRecord rows per season.
+
+sync_sleeper calls update_records() with the weeks it just wrote. A season's
+stored records are only compared against those weeks' scores, unless one of
+them came from a re-written week (its score may have gone down as well as
+up); then that season is rescanned in full. /api/records/ reads the rows
+back in one query and derives the all-time bests from them.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import SeasonRecord, WeeklyScore
+
+# Same window the frontend's history view used: regular season only
+LAST_RECORD_WEEK = 17
+
+# Whether `new` beats `old` for each kind; ties keep the earlier record
+BEATS = {
+    SeasonRecord.HIGH_SCORE: lambda new, old: new.points > old.points,
+    SeasonRecord.LOW_SCORE: lambda new, old: new.points < old.points,
+    SeasonRecord.BLOWOUT: lambda new, old: new.margin > old.margin,
+    SeasonRecord.CLOSEST: lambda new, old: new.margin < old.margin,
+}
+
+# Response keys, in the shape the frontend's RecordsBox renders
+KEYS = {
+    SeasonRecord.HIGH_SCORE: 'highScore',
+    SeasonRecord.LOW_SCORE: 'lowScore',
+    SeasonRecord.BLOWOUT: 'bigBlowout',
+    SeasonRecord.CLOSEST: 'closestGame',
+}
+
+
+def _names(score):
+    team = score.team
+    return {
+        'team_name': team.team_name,
+        'owner_name': team.owner.full_name if team.owner else "Unclaimed Team",
+        'league_id': team.league_id,
+        'league_name': team.league.name,
+    }
+
+
+def season_candidates(season, weeks=None):
+    """
+    {kind: unsaved SeasonRecord} — the best of each kind among `season`'s
+    scores in `weeks` (every week when None). Unplayed (zero) scores are
+    ignored, and so is any matchup missing one of its two sides.
+    """
+    scores = (
+        WeeklyScore.objects
+        .filter(season=season, week__lte=LAST_RECORD_WEEK, points_scored__gt=0)
+        .select_related('team__owner', 'team__league')
+        .order_by('week', 'team__league_id', 'team_id')
+    )
+    if weeks is not None:
+        scores = scores.filter(week__in=weeks)
+
+    best = {}
+
+    def offer(record):
+        current = best.get(record.kind)
+        if current is None or BEATS[record.kind](record, current):
+            best[record.kind] = record
+
+    pairs = defaultdict(list)
+    for score in scores:
+        for kind in (SeasonRecord.HIGH_SCORE, SeasonRecord.LOW_SCORE):
+            offer(SeasonRecord(
+                season=season, kind=kind, week=score.week, team=score.team,
+                points=score.points_scored, **_names(score),
+            ))
+        if score.matchup_id:
+            pairs[(score.team.league_id, score.week, score.matchup_id)].append(score)
+
+    for pair in pairs.values():
+        if len(pair) != 2:
+            continue
+        a, b = pair
+        winner, loser = (a, b) if a.points_scored > b.points_scored else (b, a)
+        for kind in (SeasonRecord.BLOWOUT, SeasonRecord.CLOSEST):
+            offer(SeasonRecord(
+                season=season, kind=kind, week=winner.week, team=winner.team, opponent=loser.team,
+                points=winner.points_scored, opponent_points=loser.points_scored,
+                margin=winner.points_scored - loser.points_scored,
+                opponent_name=loser.team.team_name, **_names(winner),
+            ))
+    return best
+
+
+def update_records(weeks_by_season):
+    """
+    Brings SeasonRecord up to date after scores were written.
+    `weeks_by_season` is {season: weeks written}; None rescans the season.
+    Returns how many rows were written.
+    """
+    written = 0
+    for season, weeks in weeks_by_season.items():
+        stored = {record.kind: record for record in SeasonRecord.objects.filter(season=season)}
+        if weeks is None or any(record.week in weeks for record in stored.values()):
+            weeks, keep = None, {}
+        else:
+            keep = stored
+
+        best = season_candidates(season, weeks)
+        for kind, record in keep.items():
+            if kind not in best or not BEATS[kind](best[kind], record):
+                best[kind] = record
+
+        new_rows = [record for record in best.values() if record.pk is None]
+        with transaction.atomic():
+            if weeks is None:
+                # A full rescan can come up empty for a kind (e.g. scores were removed)
+                SeasonRecord.objects.filter(season=season).exclude(kind__in=best).delete()
+            SeasonRecord.objects.bulk_create(
+                new_rows,
+                update_conflicts=True,
+                unique_fields=['season', 'kind'],
+                update_fields=[
+                    'week', 'league', 'team', 'opponent', 'points', 'opponent_points', 'margin',
+                    'team_name', 'owner_name', 'opponent_name', 'league_name',
+                ],
+            )
+        written += len(new_rows)
+    return written
+
+
+def record_payload(record):
+    payload = {'season': record.season, 'week': record.week, 'leagueName': record.league_name}
+    if record.margin is None:
+        payload.update(points=float(record.points), teamName=record.team_name, ownerName=record.owner_name)
+    else:
+        payload.update(
+            margin=float(record.margin),
+            winTeam=record.team_name, losTeam=record.opponent_name,
+            winPts=float(record.points), losPts=float(record.opponent_points),
+        )
+    return payload
+
+
+def records_payload(records):
+    """{'allTime': {...}, 'seasons': {season: {...}}} from SeasonRecord rows; one key per kind."""
+    seasons = defaultdict(dict)
+    all_time = {}
+    for record in sorted(records, key=lambda r: (r.season, r.kind)):
+        seasons[str(record.season)][KEYS[record.kind]] = record_payload(record)
+        current = all_time.get(record.kind)
+        if current is None or BEATS[record.kind](record, current):
+            all_time[record.kind] = record
+    return {
+        'allTime': {KEYS[kind]: record_payload(record) for kind, record in all_time.items()},
+        'seasons': dict(seasons),
+    }
@@ -1,19 +1,38 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from .middleware import timed_serialization
 from .models import (
     MemberProfile, League, Team, WeeklyScore,
     UltimatePlayoffEntry, Payout, CommonPlayer,
-    Season, PlannedLeague, LeagueAssignment, SeasonDues,
+    Season, PlannedLeague, LeagueAssignment, SeasonDues, Standing,
 )
 
 
-class UserSerializer(serializers.ModelSerializer):
+class TimedModelSerializer(serializers.ModelSerializer):
+    """Reports its to_representation() time as the request's serializer time (see middleware.py)."""
+
+    def to_representation(self, instance):
+        with timed_serialization():
+            return super().to_representation(instance)
+
+
+class SparseFieldsMixin:
+    """Accepts fields=[...] to serialize only a subset of Meta.fields (None means all)."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class UserSerializer(TimedModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email']
 
 
-class MemberProfileSerializer(serializers.ModelSerializer):
+class MemberProfileSerializer(TimedModelSerializer):
     """Public-safe serializer — no payment info or contact details."""
     user = UserSerializer(read_only=True)
 
@@ -22,7 +41,7 @@ class MemberProfileSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'first_name', 'last_name', 'sleeper_id']
 
 
-class MemberProfileAdminSerializer(serializers.ModelSerializer):
+class MemberProfileAdminSerializer(TimedModelSerializer):
     """Full serializer — only used in admin-authenticated endpoints."""
     user = UserSerializer(read_only=True)
 
@@ -35,13 +54,13 @@ class MemberProfileAdminSerializer(serializers.ModelSerializer):
         ]
 
 
-class LeagueSerializer(serializers.ModelSerializer):
+class LeagueSerializer(TimedModelSerializer):
     class Meta:
         model = League
         fields = ['id', 'name', 'sleeper_league_id', 'season', 'commissioner']
 
 
-class TeamOwnerSerializer(serializers.ModelSerializer):
+class TeamOwnerSerializer(TimedModelSerializer):
     """Minimal owner info safe to embed in public team responses."""
     username = serializers.CharField(source='user.username', read_only=True)
     full_name = serializers.CharField(read_only=True)  # reads @property
@@ -51,7 +70,7 @@ class TeamOwnerSerializer(serializers.ModelSerializer):
         fields = ['id', 'first_name', 'last_name', 'full_name', 'username']
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(TimedModelSerializer):
     owner = TeamOwnerSerializer(read_only=True)
 
     class Meta:
@@ -63,13 +82,13 @@ class TeamSerializer(serializers.ModelSerializer):
         ]
 
 
-class WeeklyScoreSerializer(serializers.ModelSerializer):
+class WeeklyScoreSerializer(SparseFieldsMixin, TimedModelSerializer):
     class Meta:
         model = WeeklyScore
         fields = ['id', 'team', 'week', 'points_scored', 'season']
 
 
-class UltimatePlayoffEntrySerializer(serializers.ModelSerializer):
+class UltimatePlayoffEntrySerializer(TimedModelSerializer):
     team = serializers.StringRelatedField()
 
     class Meta:
@@ -80,21 +99,30 @@ class UltimatePlayoffEntrySerializer(serializers.ModelSerializer):
         ]
 
 
-class PayoutSerializer(serializers.ModelSerializer):
+class PayoutSerializer(SparseFieldsMixin, TimedModelSerializer):
     class Meta:
         model = Payout
         fields = ['id', 'recipient', 'amount', 'reason', 'season', 'is_paid']
 
 
-class CommonPlayerSerializer(serializers.ModelSerializer):
+class CommonPlayerSerializer(TimedModelSerializer):
     class Meta:
         model = CommonPlayer
         fields = ['rank', 'player_name', 'player_id', 'position', 'nfl_team', 'count', 'average_score']
 
 
+class StandingSerializer(TimedModelSerializer):
+    class Meta:
+        model = Standing
+        fields = [
+            'season', 'rank', 'league_rank', 'team', 'league', 'team_name', 'owner_name',
+            'league_name', 'wins', 'losses', 'ties', 'record', 'points_for',
+        ]
+
+
 # ── Season / Organizer serializers ────────────────────────────────────────────
 
-class SeasonSerializer(serializers.ModelSerializer):
+class SeasonSerializer(TimedModelSerializer):
     season_type = serializers.SerializerMethodField()
 
     def get_season_type(self, obj):
@@ -107,13 +135,13 @@ class SeasonSerializer(serializers.ModelSerializer):
         fields = ['id', 'year', 'label', 'is_active', 'league_ids', 'season_type']
 
 
-class PlannedLeagueSerializer(serializers.ModelSerializer):
+class PlannedLeagueSerializer(TimedModelSerializer):
     class Meta:
         model = PlannedLeague
         fields = ['id', 'season', 'name', 'sleeper_league_id', 'order']
 
 
-class OrganizerMemberSerializer(serializers.ModelSerializer):
+class OrganizerMemberSerializer(TimedModelSerializer):
     """Member card for the organizer view — includes contact info for admin."""
     username = serializers.CharField(source='user.username', read_only=True)
     email = serializers.CharField(source='user.email', read_only=True)
@@ -129,16 +157,16 @@ class OrganizerMemberSerializer(serializers.ModelSerializer):
             'assigned_league_id', 'dues_paid',
         ]
 
+    # OrganizerView prefetches the season's rows into season_assignments / season_dues_rows
+
     def get_assigned_league_id(self, obj):
-        season = self.context.get('season')
-        if not season:
+        if not self.context.get('season'):
             return None
-        assignment = obj.league_assignments.filter(season=season).select_related('planned_league').first()
-        return assignment.planned_league_id if assignment else None
+        assignments = obj.season_assignments
+        return assignments[0].planned_league_id if assignments else None
 
     def get_dues_paid(self, obj):
-        season = self.context.get('season')
-        if not season:
+        if not self.context.get('season'):
             return False
-        dues = obj.season_dues.filter(season=season).first()
-        return dues.paid if dues else False
+        dues = obj.season_dues_rows
+        return dues[0].paid if dues else False
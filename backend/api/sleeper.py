@@ -0,0 +1,155 @@
+"""
+Thin client for the Sleeper API, shared by the management commands.
+
+All requests go through one pooled requests.Session so concurrent fetches
+reuse keep-alive connections instead of opening a new socket per call.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SLEEPER_BASE = "https://api.sleeper.app/v1"
+SLEEPER_STATS_BASE = "https://api.sleeper.com/stats/nfl"
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 10
+MATCHUP_WEEKS = range(1, 19)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` requests per second on average,
+    with bursts of up to `capacity`. Workers call acquire() before each request.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError(f"rate must be greater than 0, got {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _retry_delay(res, attempt):
+    """Honours a numeric Retry-After header, otherwise exponential backoff with jitter."""
+    retry_after = res.headers.get("Retry-After") if res is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return 0.5 * (2 ** attempt) + random.uniform(0, 0.25)
+
+
+def build_session(pool_size=DEFAULT_CONCURRENCY):
+    """Returns a Session whose connection pool can serve `pool_size` threads at once."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def fetch_json(session, url, timeout=DEFAULT_TIMEOUT, limiter=None, retries=0):
+    """
+    GET `url` and return its JSON body. Raises requests.RequestException on failure.
+
+    Each attempt waits on `limiter` (a TokenBucket) when one is given.
+    Connection errors, timeouts, 429s and 5xx responses are retried up to
+    `retries` times with backoff; other HTTP errors fail immediately.
+    """
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            res = session.get(url, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == retries:
+                raise
+            time.sleep(_retry_delay(None, attempt))
+            continue
+        if res.status_code in RETRY_STATUSES and attempt < retries:
+            time.sleep(_retry_delay(res, attempt))
+            continue
+        res.raise_for_status()
+        return res.json()
+
+
+def league_endpoints(league_id, weeks=MATCHUP_WEEKS):
+    """(key, url) pairs for everything sync_sleeper needs from one league."""
+    base = f"{SLEEPER_BASE}/league/{league_id}"
+    endpoints = [
+        ("league", base),
+        ("users", f"{base}/users"),
+        ("rosters", f"{base}/rosters"),
+        ("winners_bracket", f"{base}/winners_bracket"),
+    ]
+    endpoints += [(f"matchups/{week}", f"{base}/matchups/{week}") for week in weeks]
+    return endpoints
+
+
+def fetch_leagues(league_ids, session=None, concurrency=DEFAULT_CONCURRENCY,
+                  timeout=DEFAULT_TIMEOUT, weeks_by_league=None):
+    """
+    Fetches every league's endpoints concurrently on a bounded thread pool.
+
+    Returns {league_id: (league_raw, None)} where league_raw has the same shape
+    as a league entry in the download_sleeper snapshot. A league whose /league,
+    /users or /rosters call fails maps to (None, error) instead, so callers
+    can report it and move on. Missing matchup weeks and brackets are dropped
+    quietly, just like the serial loop used to do.
+
+    `weeks_by_league` limits which matchup weeks are requested per league;
+    leagues missing from it get the full 1-18 range.
+    """
+    session = session or build_session(concurrency)
+    jobs = [
+        (lid, key, url)
+        for lid in league_ids
+        for key, url in league_endpoints(lid, (weeks_by_league or {}).get(lid, MATCHUP_WEEKS))
+    ]
+
+    def run(job):
+        lid, key, url = job
+        try:
+            return lid, key, fetch_json(session, url, timeout), None
+        except (requests.exceptions.RequestException, ValueError) as e:
+            return lid, key, None, e
+
+    raw = {lid: {"league": None, "users": None, "rosters": None,
+                 "matchups": {}, "winners_bracket": []} for lid in league_ids}
+    errors = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for lid, key, data, error in pool.map(run, jobs):
+            if key.startswith("matchups/"):
+                if data:
+                    raw[lid]["matchups"][key.split("/", 1)[1]] = data
+            elif key == "winners_bracket":
+                raw[lid]["winners_bracket"] = data or []
+            elif error is not None:
+                errors.setdefault(lid, error)
+            else:
+                raw[lid][key] = data
+
+    return {
+        lid: (None, errors[lid]) if lid in errors else (raw[lid], None)
+        for lid in league_ids
+    }
@@ -0,0 +1,286 @@
+"""
+On-disk Sleeper snapshots for download_sleeper.py and `sync_sleeper --from-local`.
+
+A snapshot is a directory of small gzip-compressed JSON records plus an index:
+
+    index.json                       state, league IDs + weeks, player-stats IDs
+    players.json.gz                  the /players/nfl dump
+    leagues/<id>/league.json.gz      league, users, rosters, winners_bracket
+    leagues/<id>/matchups/<wk>.json.gz
+    player_stats/<player_id>.json.gz
+
+Records are written as they arrive and read back one at a time, so neither
+side ever holds the whole season in memory. This module must not import
+Django — download_sleeper.py runs outside of it.
+
+The original single-file JSON snapshot is still readable through
+open_snapshot(), which picks the right reader from the path.
+"""
+
+import gzip
+import json
+import os
+
+FORMAT_VERSION = 2
+INDEX_FILE = "index.json"
+LEAGUE_META_KEYS = ("league", "users", "rosters", "winners_bracket")
+
+
+def _write_record(path, data):
+    """Writes one gzip JSON record atomically, so a crash never leaves half a file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _read_record(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_complete_league(meta):
+    """
+    True once the league, users and rosters calls all came back. A failed
+    call is stored as None; an empty list is a real answer.
+    """
+    return bool(meta.get("league")) and meta.get("users") is not None and meta.get("rosters") is not None
+
+
+def _is_valid_record(path):
+    """True when `path` decompresses and parses — gzip's CRC catches truncated files."""
+    try:
+        _read_record(path)
+        return True
+    except (OSError, EOFError, ValueError):
+        return False
+
+
+class SnapshotWriter:
+    """
+    Streams a snapshot to `root`. Call close() to write the final index.
+
+    With resume=True the records already under `root` are checked and kept,
+    so an interrupted download can pick up where it stopped. A league only
+    counts as done once its league.json.gz record exists, which is written
+    after every other call for that league has finished and only if its
+    league, users and rosters all arrived (see is_complete_league()).
+    """
+
+    def __init__(self, root, resume=False):
+        self.root = root
+        self.state = None
+        self.has_players = False
+        self.weeks = {}
+        self.completed_leagues = set()
+        self.player_stats = set()
+        os.makedirs(root, exist_ok=True)
+        if resume:
+            self._load_existing()
+
+    def _league_dir(self, league_id):
+        return os.path.join(self.root, "leagues", str(league_id))
+
+    def _load_existing(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".tmp"):
+                    os.remove(os.path.join(dirpath, name))
+
+        index_path = os.path.join(self.root, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "r") as f:
+                self.state = json.load(f).get("state")
+
+        self.has_players = _is_valid_record(os.path.join(self.root, "players.json.gz"))
+
+        leagues_dir = os.path.join(self.root, "leagues")
+        for lid in os.listdir(leagues_dir) if os.path.isdir(leagues_dir) else []:
+            matchups_dir = os.path.join(leagues_dir, lid, "matchups")
+            for name in os.listdir(matchups_dir) if os.path.isdir(matchups_dir) else []:
+                if name.endswith(".json.gz") and _is_valid_record(os.path.join(matchups_dir, name)):
+                    self.weeks.setdefault(lid, set()).add(int(name.split(".")[0]))
+            meta_path = os.path.join(leagues_dir, lid, "league.json.gz")
+            if _is_valid_record(meta_path) and is_complete_league(_read_record(meta_path)):
+                self.completed_leagues.add(lid)
+
+        stats_dir = os.path.join(self.root, "player_stats")
+        for name in os.listdir(stats_dir) if os.path.isdir(stats_dir) else []:
+            if name.endswith(".json.gz") and _is_valid_record(os.path.join(stats_dir, name)):
+                self.player_stats.add(name[: -len(".json.gz")])
+
+    def is_league_complete(self, league_id):
+        return str(league_id) in self.completed_leagues
+
+    def has_week(self, league_id, week):
+        return int(week) in self.weeks.get(str(league_id), ())
+
+    def has_player_stats(self, player_id):
+        return str(player_id) in self.player_stats
+
+    def league_meta(self, league_id):
+        return _read_record(os.path.join(self._league_dir(league_id), "league.json.gz"))
+
+    def write_state(self, state):
+        self.state = state
+        self.write_index()
+
+    def write_players(self, players):
+        _write_record(os.path.join(self.root, "players.json.gz"), players)
+        self.has_players = True
+
+    def write_league(self, league_id, league_raw):
+        """
+        Writes the league/users/rosters/winners_bracket record, marking the
+        league done. An incomplete league isn't written, so a resumed download
+        fetches it again; returns whether it was.
+        """
+        meta = {key: league_raw.get(key) for key in LEAGUE_META_KEYS}
+        if not is_complete_league(meta):
+            return False
+        _write_record(os.path.join(self._league_dir(league_id), "league.json.gz"), meta)
+        self.completed_leagues.add(str(league_id))
+        return True
+
+    def write_week(self, league_id, week, matchups):
+        path = os.path.join(self._league_dir(league_id), "matchups", f"{int(week)}.json.gz")
+        _write_record(path, matchups)
+        self.weeks.setdefault(str(league_id), set()).add(int(week))
+
+    def write_player_stats(self, player_id, stats):
+        _write_record(os.path.join(self.root, "player_stats", f"{player_id}.json.gz"), stats)
+        self.player_stats.add(str(player_id))
+
+    def write_index(self):
+        index = {
+            "format": FORMAT_VERSION,
+            "state": self.state,
+            "players": self.has_players,
+            "leagues": {
+                lid: sorted(self.weeks.get(lid, ()))
+                for lid in sorted(self.completed_leagues)
+            },
+            "player_stats": sorted(self.player_stats),
+        }
+        tmp_path = os.path.join(self.root, f"{INDEX_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.root, INDEX_FILE))
+
+    def close(self):
+        self.write_index()
+
+
+class SnapshotReader:
+    """Lazy reader for a chunked snapshot directory."""
+
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, INDEX_FILE), "r") as f:
+            self.index = json.load(f)
+        self._stats_ids = set(self.index.get("player_stats") or [])
+
+    @property
+    def state(self):
+        return self.index.get("state") or {}
+
+    def players(self):
+        if not self.index.get("players"):
+            return {}
+        return _read_record(os.path.join(self.root, "players.json.gz"))
+
+    def league_ids(self):
+        return list(self.index.get("leagues") or {})
+
+    def league_meta(self, league_id):
+        """League/users/rosters/bracket only — no matchups."""
+        path = os.path.join(self.root, "leagues", str(league_id), "league.json.gz")
+        return _read_record(path)
+
+    def league(self, league_id, weeks=None):
+        """
+        One league in the same shape as a live fetch. Only `weeks` are read
+        from disk when given; otherwise every week in the index is.
+        """
+        league_raw = self.league_meta(league_id)
+        available = self.index["leagues"].get(str(league_id)) or []
+        wanted = available if weeks is None else [w for w in weeks if w in available]
+        league_raw["matchups"] = {
+            str(week): _read_record(os.path.join(
+                self.root, "leagues", str(league_id), "matchups", f"{week}.json.gz"
+            ))
+            for week in wanted
+        }
+        return league_raw
+
+    def player_stats_ids(self):
+        return list(self.index.get("player_stats") or [])
+
+    def has_player_stats(self, player_id):
+        return str(player_id) in self._stats_ids
+
+    def player_stats(self, player_id):
+        if not self.has_player_stats(player_id):
+            return None
+        return _read_record(os.path.join(self.root, "player_stats", f"{player_id}.json.gz"))
+
+
+class LegacySnapshotReader:
+    """Same interface as SnapshotReader over the original single-file JSON snapshot."""
+
+    def __init__(self, path):
+        with open(path, "r") as f:
+            self.data = json.load(f)
+
+    @property
+    def state(self):
+        return self.data.get("state") or {}
+
+    def players(self):
+        return self.data.get("players") or {}
+
+    def league_ids(self):
+        return list(self.data.get("leagues") or {})
+
+    def league_meta(self, league_id):
+        league_raw = self.data["leagues"][league_id]
+        return {key: league_raw.get(key) for key in LEAGUE_META_KEYS}
+
+    def league(self, league_id, weeks=None):
+        league_raw = dict(self.data["leagues"][league_id])
+        matchups = league_raw.get("matchups") or {}
+        if weeks is not None:
+            matchups = {str(w): matchups[str(w)] for w in weeks if str(w) in matchups}
+        league_raw["matchups"] = matchups
+        return league_raw
+
+    def player_stats_ids(self):
+        return list(self.data.get("player_stats") or {})
+
+    def has_player_stats(self, player_id):
+        return str(player_id) in (self.data.get("player_stats") or {})
+
+    def player_stats(self, player_id):
+        return (self.data.get("player_stats") or {}).get(str(player_id))
+
+
+def open_snapshot(path):
+    """Returns a reader for either snapshot format, or None if nothing is at `path`."""
+    if os.path.isdir(path) and os.path.exists(os.path.join(path, INDEX_FILE)):
+        return SnapshotReader(path)
+    if os.path.isfile(path):
+        return LegacySnapshotReader(path)
+    return None
+
+
+def export_json(reader, path):
+    """Writes a snapshot back out in the single-file JSON format (for the frontend's offline mode)."""
+    snapshot = {
+        "state": reader.state,
+        "players": reader.players(),
+        "leagues": {lid: reader.league(lid) for lid in reader.league_ids()},
+        "player_stats": {pid: reader.player_stats(pid) for pid in reader.player_stats_ids()},
+    }
+    with open(path, "w") as f:
+        json.dump(snapshot, f, indent=2)
@@ -0,0 +1,57 @@
+"""
+Materialized standings.
+
+sync_sleeper calls rebuild_standings() once its Team rows are final, and the
+public widgets read Standing instead of ranking Team on every request.
+A team's season is its league's season. Every season is rebuilt each time;
+that is one row per team, and it keeps past seasons right if a team is
+edited in the admin.
+"""
+
+from itertools import groupby
+
+from django.db import transaction
+
+from .models import Standing, Team
+
+
+def standing_rows(teams):
+    """Unsaved Standing rows for `teams`, ranked overall per season and within each league."""
+    rows = []
+    teams = sorted(teams, key=lambda t: t.league.season)
+    for season, season_teams in groupby(teams, key=lambda t: t.league.season):
+        season_teams = list(season_teams)
+
+        league_ranks = {}
+        by_league = sorted(season_teams, key=lambda t: (t.league_id, -t.wins, -t.points_for, t.id))
+        for _, league_teams in groupby(by_league, key=lambda t: t.league_id):
+            for league_rank, team in enumerate(league_teams, start=1):
+                league_ranks[team.id] = league_rank
+
+        overall = sorted(season_teams, key=lambda t: (-t.points_for, -t.wins, t.id))
+        for rank, team in enumerate(overall, start=1):
+            rows.append(Standing(
+                season=season,
+                team=team,
+                league_id=team.league_id,
+                rank=rank,
+                league_rank=league_ranks[team.id],
+                team_name=team.team_name,
+                owner_name=team.owner.full_name if team.owner else "Unclaimed Team",
+                league_name=team.league.name,
+                wins=team.wins,
+                losses=team.losses,
+                ties=team.ties,
+                record=f"{team.wins}-{team.losses}-{team.ties}",
+                points_for=team.points_for,
+            ))
+    return rows
+
+
+def rebuild_standings():
+    """Replaces every Standing row from the current Team table. Returns the row count."""
+    rows = standing_rows(Team.objects.select_related('owner', 'league'))
+    with transaction.atomic():
+        Standing.objects.all().delete()
+        Standing.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
@@ -1,3 +1,1254 @@
-from django.test import TestCase
+import gzip
+import json
+import os
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import requests
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import (
+    CommonPlayer, League, LeagueAssignment, MemberProfile, Payout, PlannedLeague, PlayerSeasonStats,
+    PlayoffBracket, Season, SeasonDues, SeasonRecord, Team, UltimatePlayoffEntry, WeeklyScore,
+)
+from . import dashboard, matchups, nfl_state
+from .dashboard import MAX_LEAGUES as MAX_DASHBOARD_LEAGUES
+from .sleeper import TokenBucket, fetch_json
+from .snapshot import LegacySnapshotReader, SnapshotReader, SnapshotWriter, export_json, open_snapshot
+from .management.commands.sync_sleeper import Command as SyncSleeperCommand, advance_watermark, incremental_weeks
+from .bracket import rebuild_bracket
+from .players import DEFAULT_STATS_TTL_HOURS, player_lookup, season_averages, store_players, store_rostered_players
+from .records import update_records
+from .standings import rebuild_standings
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def make_teams(league, count, start=0):
+    for i in range(start, start + count):
+        user = User.objects.create_user(username=f'member{i}')
+        owner = MemberProfile.objects.create(user=user, first_name='Member', last_name=str(i))
+        Team.objects.create(owner=owner, league=league, sleeper_roster_id=str(i), team_name=f'Team {i}')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class TeamListQueryTests(TestCase):
+    """TeamList must not issue a query per team (owner + owner.user)."""
+
+    def setUp(self):
+        cache.clear()
+        self.league = League.objects.create(name='League A', sleeper_league_id='1', season=2025)
+        self.other = League.objects.create(name='League B', sleeper_league_id='2', season=2025)
+
+    def assert_constant_queries(self, url):
+        make_teams(self.league, 2)
+        with self.assertNumQueries(1):
+            small = self.client.get(url)
+        cache.clear()
+        make_teams(self.league, 20, start=2)
+        with self.assertNumQueries(1):
+            large = self.client.get(url)
+        self.assertEqual(len(small.data), 2)
+        self.assertEqual(len(large.data), 22)
+        self.assertEqual(large.data[0]['owner']['username'], 'member0')
+
+    def test_team_list_query_count(self):
+        self.assert_constant_queries('/api/teams/')
+
+    def test_team_list_league_filter_query_count(self):
+        make_teams(self.other, 3, start=100)
+        self.assert_constant_queries(f'/api/teams/?league={self.league.id}')
+
+    def test_non_numeric_league_is_rejected(self):
+        response = self.client.get('/api/teams/?league=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'league must be a number.'})
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class StandingsListTests(TestCase):
+    """Standings filters are numeric; anything else is the client's mistake, not a 500."""
+
+    def setUp(self):
+        cache.clear()
+        self.league = League.objects.create(name='League A', sleeper_league_id='1', season=2025)
+        make_teams(self.league, 2)
+        rebuild_standings()
+
+    def test_filters(self):
+        self.assertEqual(len(self.client.get('/api/standings/').data), 2)
+        self.assertEqual(len(self.client.get(f'/api/standings/?season=2025&league={self.league.id}').data), 2)
+        self.assertEqual(self.client.get('/api/standings/?season=2024').data, [])
+
+    def test_non_numeric_filters_are_rejected(self):
+        for query in ('season=abc', 'league=abc'):
+            response = self.client.get(f'/api/standings/?{query}')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data, {'error': f"{query.split('=')[0]} must be a number."})
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class HistoryPaginationTests(TestCase):
+    """Scores and payouts page by cursor, filter by number and trim to ?fields=."""
+
+    def setUp(self):
+        league = League.objects.create(name='League A', sleeper_league_id='1', season=2025)
+        make_teams(league, 2)
+        for season in (2024, 2025):
+            for week in (1, 2, 3):
+                for team in Team.objects.all():
+                    WeeklyScore.objects.create(team=team, season=season, week=week, points_scored=Decimal(100 + week))
+        for member in MemberProfile.objects.all():
+            Payout.objects.create(recipient=member, amount=Decimal('5.00'), reason='Weekly winner', season=2025)
+
+    def walk(self, url):
+        """Every page from `url` on, as (ids, page count)."""
+        ids, pages = [], 0
+        while url:
+            data = self.client.get(url).json()
+            ids += [row['id'] for row in data['results']]
+            pages += 1
+            url = data['next']
+        return ids, pages
+
+    def test_cursor_walks_every_row_newest_first(self):
+        ids, pages = self.walk('/api/scores/?page_size=5')
+        self.assertEqual(ids, sorted(WeeklyScore.objects.values_list('id', flat=True), reverse=True))
+        self.assertEqual(pages, 3)
+        # Not a numbered page: no total to count
+        self.assertNotIn('count', self.client.get('/api/scores/').json())
+
+    def test_filters(self):
+        team = Team.objects.first()
+        ids, _ = self.walk(f'/api/scores/?season=2025&week=2&team={team.id}&page_size=1')
+        self.assertEqual(ids, list(WeeklyScore.objects.filter(season=2025, week=2, team=team).values_list('id', flat=True)))
+        self.assertEqual(len(self.walk('/api/scores/?season=2024')[0]), 6)
+        self.assertEqual(len(self.walk('/api/payouts/?season=2025')[0]), 2)
+        self.assertEqual(self.walk('/api/payouts/?season=2024')[0], [])
+
+    def test_non_numeric_filters_are_rejected(self):
+        for url in ('/api/scores/?week=two', '/api/scores/?league=abc', '/api/payouts/?recipient=me'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400, url)
+            self.assertIn('must be a number.', response.json()['error'])
+
+    def test_sparse_fields(self):
+        row = self.client.get('/api/scores/?fields=week,points_scored').json()['results'][0]
+        self.assertEqual(set(row), {'week', 'points_scored'})
+        self.assertEqual(set(self.client.get('/api/payouts/?fields=amount').json()['results'][0]), {'amount'})
+        response = self.client.get('/api/scores/?fields=week,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Unknown fields: password.'})
+
+    def test_filtered_pages_need_no_sort(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Plan text is SQLite-specific')
+        for queryset, index in (
+            (WeeklyScore.objects.filter(season=2025, week=2), 'weeklyscore_history_idx'),
+            (Payout.objects.filter(season=2025), 'payout_season_idx'),
+        ):
+            plan = queryset.order_by('-id').explain()
+            self.assertIn(index, plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+
+# Every endpoint in api/urls.py with the most queries it may run against the
+# fixture in QueryBudgetTests.setUp (2 leagues x 4 teams, 9 members).
+# String placeholders in url kwargs / data ('member', 'team', ...) are
+# replaced with the pk of the matching fixture object.
+QUERY_BUDGETS = [
+    # (url name, method, url kwargs, request data, max queries)
+    ('register',                  'post',   {}, {'username': 'newbie', 'password': 'pw-12345', 'sleeper_username': 'newbie'}, 3),
+    ('me',                        'get',    {}, None, 0),
+    ('me',                        'patch',  {}, {'first_name': 'Ada'}, 1),
+    ('member-list',               'get',    {}, None, 1),
+    ('league-list',               'get',    {}, None, 1),
+    ('league-detail',             'get',    {'pk': 'league'}, None, 1),
+    ('team-list',                 'get',    {}, None, 1),
+    ('score-list',                'get',    {}, None, 1),
+    ('playoff-entry-list',        'get',    {}, None, 1),
+    ('playoff-bracket',           'get',    {}, None, 1),
+    ('payout-list',               'get',    {}, None, 1),
+    ('widget-weekly-winner',      'get',    {}, None, 1),
+    ('widget-power-rankings',     'get',    {}, None, 1),
+    ('widget-common-players',     'get',    {}, None, 1),
+    ('standings',                 'get',    {}, None, 1),
+    ('records',                   'get',    {}, None, 1),
+    ('season-list',               'get',    {}, None, 1),
+    ('season-list',               'post',   {}, {'year': 2026, 'label': '2026 Season'}, 2),
+    ('season-detail',             'patch',  {'year': 2025}, {'is_active': True}, 3),
+    ('season-preview',            'get',    {'year': 2025}, None, 3),
+    ('organizer',                 'get',    {'year': 2025}, None, 5),
+    ('planned-league-create',     'post',   {'year': 2025}, {'name': 'League C', 'order': 3}, 3),
+    ('planned-league-detail',     'patch',  {'pk': 'planned'}, {'name': 'Renamed'}, 2),
+    ('planned-league-detail',     'delete', {'pk': 'planned'}, None, 3),
+    ('assign-member',             'post',   {'pk': 'planned'}, {'member_id': 'member'}, 5),
+    ('unassign-member',           'delete', {'pk': 'planned', 'member_id': 'member'}, None, 3),
+    ('season-dues-toggle',        'patch',  {'year': 2025, 'member_id': 'member'}, None, 4),
+    ('nfl-state',                 'get',    {}, None, 0),
+    ('dashboard',                 'get',    {}, {'league_ids': '0,1'}, 2),
+    ('matchup-detail',            'get',    {'league_id': '0', 'week': 3}, None, 3),
+    ('players',                   'get',    {}, None, 1),
+    ('players-version',           'get',    {'version': 'version'}, None, 1),
+    ('playoff-status',            'get',    {}, None, 6),
+    ('admin-run-sync',            'post',   {}, None, 0),
+    ('admin-start-playoff',       'post',   {}, None, 0),
+    ('admin-run-elimination',     'post',   {}, {'week': 15}, 0),
+    ('admin-post-winners',        'post',   {}, {'week': 1}, 0),
+    ('admin-update-venmo',        'post',   {'pk': 'member'}, {'venmo_info': '@someone'}, 2),
+    ('admin-all-members',         'get',    {}, None, 1),
+    ('admin-toggle-dues',         'post',   {'pk': 'member'}, None, 2),
+    ('admin-toggle-playoff-flag', 'post',   {'pk': 'team'}, None, 2),
+]
+
+
+class FakeSleeperUser:
+    status_code = 200
+
+    def json(self):
+        return {'user_id': '999', 'display_name': 'newbie'}
+
+
+FAKE_DASHBOARD = {'payload': {'currentWeek': 3, 'leagues': []}, 'etag': '"abc123"'}
+FAKE_MATCHUP_DETAIL = {'leagueId': '0', 'season': 2025, 'week': 3, 'completed': False, 'matchups': [], 'stats': {}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+@mock.patch('api.views.matchup_detail', return_value=FAKE_MATCHUP_DETAIL)
+@mock.patch('api.views.get_dashboard', return_value=FAKE_DASHBOARD)
+@mock.patch('api.views.call_command')
+@mock.patch('api.views.requests.get', return_value=FakeSleeperUser())
+@mock.patch('api.views.get_nfl_state', return_value={'week': 3, 'season': '2025'})
+class QueryBudgetTests(TestCase):
+    """Pins how many queries each endpoint may run, so N+1 regressions fail here."""
+
+    def setUp(self):
+        cache.clear()
+        admin_user = User.objects.create_user(username='admin', is_staff=True)
+        self.admin = MemberProfile.objects.create(user=admin_user, first_name='Admin')
+        self.client = APIClient()
+        self.client.force_authenticate(admin_user)
+
+        season = Season.objects.create(year=2025, label='2025 Season')
+        planned = [PlannedLeague.objects.create(season=season, name=f'Planned {i}', order=i) for i in range(2)]
+        for i in range(2):
+            league = League.objects.create(name=f'League {i}', sleeper_league_id=str(i), season=2025)
+            make_teams(league, 4, start=i * 4)
+        for i, member in enumerate(MemberProfile.objects.exclude(pk=self.admin.pk)):
+            LeagueAssignment.objects.create(member=member, planned_league=planned[i % 2], season=season)
+            SeasonDues.objects.create(member=member, season=season, paid=i % 2 == 0)
+            Payout.objects.create(recipient=member, amount=Decimal('5.00'), reason='Weekly winner', season=2025)
+        for team in Team.objects.all():
+            for week in (1, 2):
+                WeeklyScore.objects.create(team=team, week=week, season=2025,
+                                           points_scored=Decimal(100 + team.pk + week))
+            UltimatePlayoffEntry.objects.create(team=team, season=2025, playoff_week=15)
+        for rank in range(1, 4):
+            CommonPlayer.objects.create(rank=rank, player_name=f'Player {rank}', position='WR', count=3)
+        rebuild_standings()
+        update_records({2025: None})
+        rebuild_bracket(2025)
+        version, _ = store_rostered_players(['1'], {'1': {'name': 'Player 1', 'position': 'WR', 'team': 'KC'}})
+
+        self.placeholders = {
+            'league':  League.objects.first().pk,
+            'team':    Team.objects.first().pk,
+            'member':  MemberProfile.objects.exclude(pk=self.admin.pk).first().pk,
+            'planned': planned[0].pk,
+            'version': version,
+        }
+
+    def resolve(self, values):
+        return {key: self.placeholders.get(value, value) for key, value in (values or {}).items()}
+
+    def test_every_endpoint_has_a_budget(self, *mocks):
+        budgeted = {name for name, *_ in QUERY_BUDGETS}
+        names = {pattern.name for pattern in get_resolver('api.urls').url_patterns}
+        self.assertEqual(names - budgeted, set())
+
+    def test_query_budgets(self, *mocks):
+        for name, method, kwargs, data, budget in QUERY_BUDGETS:
+            with self.subTest(endpoint=name, method=method.upper()):
+                url = reverse(name, kwargs=self.resolve(kwargs))
+                # Roll back each request so writes don't leak into the next one
+                with transaction.atomic():
+                    with CaptureQueriesContext(connection) as queries, \
+                            self.assertLogs('api.timing', 'INFO') as logs:
+                        response = getattr(self.client, method)(url, self.resolve(data), format='json')
+                    transaction.set_rollback(True)
+                cache.clear()
+
+                self.assertLess(response.status_code, 400, response.content)
+                self.assertLessEqual(len(queries), budget, '\n'.join(q['sql'] for q in queries))
+                self.assertIn(f'desc="{len(queries)} queries"', response['Server-Timing'])
+                self.assertEqual(json.loads(logs.records[-1].getMessage())['queries'], len(queries))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DashboardViewTests(TestCase):
+    """The dashboard only proxies tracked leagues and honours If-None-Match."""
+
+    def setUp(self):
+        cache.clear()
+        League.objects.create(name='League A', sleeper_league_id='111', season=2025)
+        Season.objects.create(year=2026, label='2026 Season', league_ids=['222'], is_active=True)
+
+    def get(self, **kwargs):
+        return self.client.get('/api/dashboard/', **kwargs)
+
+    @mock.patch('api.views.get_dashboard', return_value=FAKE_DASHBOARD)
+    def test_defaults_to_active_season_leagues(self, get_dashboard):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"abc123"')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        get_dashboard.assert_called_once_with(['222'])
+
+    @mock.patch('api.views.get_dashboard', return_value=FAKE_DASHBOARD)
+    def test_matching_etag_returns_304(self, get_dashboard):
+        response = self.get(data={'league_ids': '111,222'}, HTTP_IF_NONE_MATCH='"abc123"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        get_dashboard.assert_called_once_with(['111', '222'])
+
+    @mock.patch('api.views.get_dashboard')
+    def test_unknown_league_is_rejected(self, get_dashboard):
+        response = self.get(data={'league_ids': '111,999'})
+        self.assertEqual(response.status_code, 400)
+        get_dashboard.assert_not_called()
+
+    @mock.patch('api.views.get_dashboard', return_value=FAKE_DASHBOARD)
+    def test_duplicate_ids_are_dropped(self, get_dashboard):
+        self.assertEqual(self.get(data={'league_ids': '222,111,222'}).status_code, 200)
+        get_dashboard.assert_called_once_with(['222', '111'])
+
+    @mock.patch('api.views.get_dashboard')
+    def test_too_many_leagues_are_rejected(self, get_dashboard):
+        response = self.get(data={'league_ids': ','.join(str(n) for n in range(MAX_DASHBOARD_LEAGUES + 1))})
+        self.assertEqual(response.status_code, 400)
+        get_dashboard.assert_not_called()
+
+    @mock.patch('api.dashboard.get_nfl_state', return_value={'season': '2025', 'week': 3})
+    @mock.patch('api.dashboard.fetch_leagues')
+    def test_leagues_are_shared_across_requests(self, fetch_leagues, state):
+        fetch_leagues.side_effect = lambda ids, **kwargs: {
+            lid: ({'league': {'name': f'League {lid}', 'season': '2025'}, 'users': [], 'rosters': [],
+                   'matchups': {'3': [{'roster_id': 1}]}}, None)
+            for lid in ids
+        }
+        dashboard._league.cache_clear()
+        in_order = dashboard.get_dashboard(['111', '222'])
+        reordered = dashboard.get_dashboard(['222', '111', '222'])
+        # Another subset only fetches the league nobody asked for yet
+        subset = dashboard.get_dashboard(['333', '111'])
+        self.assertEqual(
+            sorted(call.args[0][0] for call in fetch_leagues.call_args_list), ['111', '222', '333'],
+        )
+        self.assertEqual(
+            [(league['sleeperId'], league['index']) for league in reordered['payload']['leagues']],
+            [('222', 0), ('111', 1)],
+        )
+        self.assertEqual(subset['payload']['leagues'][1]['recentMatchups'], [{'roster_id': 1}])
+        self.assertNotEqual(in_order['etag'], reordered['etag'])
+        self.assertEqual(dashboard.get_dashboard(['222', '111'])['etag'], reordered['etag'])
+
+
+class RosteredPlayersTests(TestCase):
+    """The slim player list is content-addressed and served compressed."""
+
+    LOOKUP = {
+        '1': {'name': 'Patrick Mahomes', 'position': 'QB', 'team': 'KC'},
+        '2': {'name': 'Travis Kelce', 'position': 'TE', 'team': 'KC'},
+        '3': {'name': 'Benched Guy', 'position': 'RB', 'team': None},
+    }
+
+    def test_only_known_rostered_players_are_stored(self):
+        version, changed = store_rostered_players([1, '2', '999'], self.LOOKUP)
+        self.assertTrue(changed)
+        self.assertEqual(store_rostered_players(['2', '1'], self.LOOKUP), (version, False))
+
+        response = self.client.get(f'/api/players/{version}/')
+        self.assertEqual(json.loads(response.content), {
+            '1': {'full_name': 'Patrick Mahomes', 'position': 'QB', 'team': 'KC'},
+            '2': {'full_name': 'Travis Kelce', 'position': 'TE', 'team': 'KC'},
+        })
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_latest_version_redirect_and_gzip(self):
+        old, _ = store_rostered_players(['1'], self.LOOKUP)
+        new, _ = store_rostered_players(['1', '2'], self.LOOKUP)
+        self.assertNotEqual(old, new)
+
+        response = self.client.get('/api/players/')
+        self.assertRedirects(response, f'/api/players/{new}/', fetch_redirect_response=False)
+        self.assertEqual(self.client.get(f'/api/players/{old}/').status_code, 404)
+
+        response = self.client.get(f'/api/players/{new}/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 2)
+
+    def test_stored_players_fit_their_columns(self):
+        store_players({
+            '1': {'first_name': 'Patrick', 'last_name': 'Mahomes', 'position': 'QB', 'team': 'KC'},
+            '2': {'first_name': 'X' * 150, 'last_name': 'Free Agent', 'position': 'OFFENSIVE LINE', 'team': 'FREE AGENCY'},
+            '3': {'first_name': 'Retired', 'team': None},
+            '9' * 60: {'first_name': 'Bad', 'last_name': 'Id'},
+        })
+        lookup = player_lookup()
+        self.assertEqual(sorted(lookup), ['1', '2', '3'])
+        self.assertEqual(lookup['2'], {'name': f"{'X' * 100} Free Agent", 'position': 'OFFENSIVE ', 'team': 'FREE AGENC'})
+        # Missing position/team stay None (as in Sleeper's dump), so the frontend can leave them out
+        self.assertEqual(lookup['3'], {'name': 'Retired', 'position': None, 'team': None})
+        version, _ = store_rostered_players(['3'], lookup)
+        self.assertEqual(
+            json.loads(self.client.get(f'/api/players/{version}/').content),
+            {'3': {'full_name': 'Retired', 'position': None, 'team': None}},
+        )
+
+
+class SeasonAveragesTests(TestCase):
+    """Season averages are fetched once per TTL and fall back to the last good copy."""
+
+    STATS = {'1': {'stats': {'pts_ppr': 20.0}}, '2': {'stats': {'pts_ppr': 10.0}}, '3': None}
+
+    def age(self, hours):
+        PlayerSeasonStats.objects.update(fetched_at=timezone.now() - timedelta(hours=hours))
+
+    def test_cached_within_ttl(self):
+        fetch = mock.Mock(return_value=self.STATS)
+        self.assertEqual(season_averages(['4046', '4984'], '2025', fetch), {'4046': 15.0, '4984': 15.0})
+        self.assertEqual(fetch.call_count, 2)
+
+        self.age(DEFAULT_STATS_TTL_HOURS - 1)
+        fetch.reset_mock()
+        self.assertEqual(season_averages(['4046', '4984'], 2025, fetch), {'4046': 15.0, '4984': 15.0})
+        fetch.assert_not_called()
+
+    def test_refetched_after_ttl(self):
+        season_averages(['4046'], 2025, mock.Mock(return_value=self.STATS))
+        self.age(DEFAULT_STATS_TTL_HOURS + 1)
+
+        fetch = mock.Mock(return_value={'1': {'stats': {'pts_ppr': 30.0}}})
+        self.assertEqual(season_averages(['4046'], 2025, fetch), {'4046': 30.0})
+        fetch.assert_called_once_with('4046')
+        row = PlayerSeasonStats.objects.get()
+        self.assertEqual((row.average_score, row.weeks_played), (Decimal('30.00'), 1))
+        self.assertGreater(row.fetched_at, timezone.now() - timedelta(minutes=1))
+
+    def test_stale_copy_when_upstream_fails(self):
+        season_averages(['4046'], 2025, mock.Mock(return_value=self.STATS))
+        self.age(DEFAULT_STATS_TTL_HOURS + 1)
+        stale_at = PlayerSeasonStats.objects.get().fetched_at
+
+        fetch = mock.Mock(side_effect=requests.exceptions.ConnectionError('down'))
+        self.assertEqual(season_averages(['4046', '4984'], 2025, fetch), {'4046': 15.0, '4984': 0.0})
+        self.assertEqual(fetch.call_count, 2)
+        # Left stale, so the next run tries again
+        self.assertEqual(list(PlayerSeasonStats.objects.values_list('player_id', 'fetched_at')), [('4046', stale_at)])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class WeeklyWinnerTests(TestCase):
+    """The default week follows Sleeper even while the cached copy is fresh."""
+
+    def setUp(self):
+        cache.clear()
+        league = League.objects.create(name='League A', sleeper_league_id='1', season=2025)
+        make_teams(league, 2)
+        first, second = Team.objects.order_by('id')
+        for week, winner in ((2, first), (3, second)):
+            WeeklyScore.objects.create(team=winner, week=week, season=2025, points_scored=Decimal('120.50'))
+            WeeklyScore.objects.create(
+                team=second if winner == first else first, week=week, season=2025, points_scored=Decimal('80.00'),
+            )
+
+    def winners(self, url='/api/widget/weekly-winner/'):
+        return [(row['week'], row['team_name']) for row in self.client.get(url).data]
+
+    @mock.patch('api.views.get_nfl_state')
+    def test_week_rollover_is_not_served_from_cache(self, state):
+        state.return_value = {'season': '2025', 'week': 3}
+        self.assertEqual(self.winners(), [(2, 'Team 0')])
+        state.return_value = {'season': '2025', 'week': 4}
+        self.assertEqual(self.winners(), [(3, 'Team 1')])
+        # An explicit week doesn't depend on Sleeper at all
+        state.reset_mock()
+        self.assertEqual(self.winners('/api/widget/weekly-winner/?week=2&season=2025'), [(2, 'Team 0')])
+        state.assert_not_called()
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SeasonRecordTests(TestCase):
+    """Records update incrementally and match a full rescan."""
+
+    def setUp(self):
+        cache.clear()
+        self.league = League.objects.create(name='League A', sleeper_league_id='1', season=2025)
+        make_teams(self.league, 4)
+        self.teams = list(Team.objects.order_by('id'))
+
+    def play(self, week, *points, season=2025):
+        """Writes one week; teams 0v1 are matchup 1, teams 2v3 matchup 2."""
+        for i, pts in enumerate(points):
+            WeeklyScore.objects.update_or_create(
+                team=self.teams[i], week=week, season=season,
+                defaults={'points_scored': Decimal(pts), 'matchup_id': i // 2 + 1},
+            )
+
+    def records(self, season=2025):
+        return {r.kind: r for r in SeasonRecord.objects.filter(season=season)}
+
+    def test_full_scan(self):
+        self.play(1, '100', '90', '150', '60')
+        self.play(2, '80', '79.5', '0', '0')  # teams 2 and 3 haven't played yet
+        update_records({2025: None})
+        records = self.records()
+        self.assertEqual(records['high_score'].points, Decimal('150'))
+        self.assertEqual(records['low_score'].points, Decimal('60'))
+        self.assertEqual((records['blowout'].team, records['blowout'].margin), (self.teams[2], Decimal('90')))
+        self.assertEqual((records['closest'].week, records['closest'].margin), (2, Decimal('0.5')))
+        self.assertEqual(records['closest'].opponent_name, 'Team 1')
+
+    def test_incremental_update_matches_rescan(self):
+        self.play(1, '100', '90', '150', '60')
+        update_records({2025: None})
+        low = self.records()['low_score']
+
+        # A new week only replaces the records it beats
+        self.play(2, '160', '95', '110', '108')
+        self.assertEqual(update_records({2025: {2}}), 2)
+        records = self.records()
+        self.assertEqual(records['high_score'].points, Decimal('160'))
+        self.assertEqual(records['closest'].margin, Decimal('2'))
+        self.assertEqual(records['low_score'].pk, low.pk)
+
+        # Rewriting the week that holds a record forces a rescan
+        self.play(1, '100', '90', '150', '130')
+        update_records({2025: {1}})
+        incremental = {kind: (r.week, r.team_id, r.points, r.margin) for kind, r in self.records().items()}
+        update_records({2025: None})
+        rescanned = {kind: (r.week, r.team_id, r.points, r.margin) for kind, r in self.records().items()}
+        self.assertEqual(incremental, rescanned)
+        self.assertEqual(rescanned['low_score'][2], Decimal('90'))
+
+    def test_endpoint_has_season_and_all_time_scopes(self):
+        self.play(1, '100', '90', '150', '60')
+        self.play(1, '170', '40', '120', '110', season=2024)
+        update_records({2024: None, 2025: None})
+
+        with self.assertNumQueries(1):
+            data = self.client.get('/api/records/').json()
+        self.assertEqual(set(data['seasons']), {'2024', '2025'})
+        self.assertEqual(data['seasons']['2025']['highScore']['points'], 150.0)
+        self.assertEqual(data['allTime']['highScore'], {
+            'season': 2024, 'week': 1, 'leagueName': 'League A',
+            'points': 170.0, 'teamName': 'Team 0', 'ownerName': 'Member 0',
+        })
+        self.assertEqual(data['allTime']['bigBlowout']['margin'], 130.0)
+        self.assertEqual(data['allTime']['closestGame']['losTeam'], 'Team 3')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class PlayoffBracketTests(TestCase):
+    """The stored bracket projects the live week exactly as the elimination later decides it."""
+
+    def setUp(self):
+        cache.clear()
+        for i in range(2):
+            league = League.objects.create(name=f'League {i}', sleeper_league_id=str(i), season=2025)
+            make_teams(league, 3, start=i * 3)
+        self.teams = list(Team.objects.order_by('id'))
+        for team in self.teams:
+            UltimatePlayoffEntry.objects.create(team=team, season=2025, playoff_week=15)
+
+    def score(self, week, *points):
+        for team, pts in zip(self.teams, points):
+            WeeklyScore.objects.create(team=team, week=week, season=2025, points_scored=Decimal(pts))
+
+    def bracket(self):
+        cache.clear()
+        response = self.client.get('/api/playoff-bracket/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def survivors(self, week):
+        return [(e['teamName'], e['final_rank']) for e in week['entries'] if not e['is_eliminated']]
+
+    def test_projection_matches_elimination(self):
+        rebuild_bracket(2025)
+        week15 = self.bracket()['weeks'][0]
+        self.assertEqual((week15['status'], week15['cutLine']), ('upcoming', None))
+
+        # Ties keep entry order, like run_playoff_elimination
+        self.score(15, '90', '120', '100', '100', '80', '130')
+        rebuild_bracket(2025)
+        projected = self.bracket()['weeks'][0]
+        self.assertEqual(projected['status'], 'projected')
+        self.assertEqual((projected['advancing'], projected['cutLine']), (3, '100.00'))
+        self.assertEqual(self.survivors(projected), [('Team 5', 1), ('Team 1', 2), ('Team 2', 3)])
+
+        call_command('run_playoff_elimination', week=15, season=2025, stdout=StringIO())
+        bracket = self.bracket()
+        final, upcoming = bracket['weeks']
+        self.assertEqual(final['status'], 'final')
+        self.assertEqual(self.survivors(final), self.survivors(projected))
+        self.assertEqual((upcoming['week'], upcoming['status'], upcoming['teams']), (16, 'upcoming', 3))
+        self.assertEqual(bracket['currentWeek'], 16)
+        self.assertFalse(bracket['isComplete'])
+
+    def test_missing_bracket_and_bad_season(self):
+        self.assertEqual(self.client.get('/api/playoff-bracket/').status_code, 404)
+        self.assertEqual(self.client.get('/api/playoff-bracket/?season=abc').status_code, 400)
+
+    def admin(self):
+        # The admin views run the commands without redirecting their output
+        self.enterContext(mock.patch('sys.stdout', new=StringIO()))
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='admin', is_staff=True))
+        return client
+
+    def test_start_playoff_is_idempotent(self):
+        # One qualified team is still missing its entry; a re-run must add it and nothing else
+        UltimatePlayoffEntry.objects.filter(team=self.teams[0]).delete()
+        Team.objects.update(made_league_playoffs=True)
+        client = self.admin()
+        self.assertEqual(client.post('/api/admin/start-playoff/', {'season': 'abc'}, format='json').status_code, 400)
+
+        for _ in range(2):
+            response = client.post('/api/admin/start-playoff/', {'season': '2025'}, format='json')
+            self.assertEqual(response.status_code, 200)
+            entries = sorted(UltimatePlayoffEntry.objects.values_list('team_id', 'season', 'playoff_week'))
+            bracket = PlayoffBracket.objects.get()
+            self.assertEqual(bracket.payload['season'], 2025)
+            self.assertEqual(bracket.payload['weeks'][0]['teams'], 6)
+        self.assertEqual(entries, sorted((team.id, 2025, 15) for team in self.teams))
+        self.assertEqual(PlayoffBracket.objects.count(), 1)
+
+    def test_admin_elimination_season_is_a_number(self):
+        client = self.admin()
+        self.score(15, '90', '120', '100', '100', '80', '130')
+        response = client.post('/api/admin/run-elimination/', {'week': 15, 'season': 'abc'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = client.post('/api/admin/run-elimination/', {'week': '15', 'season': '2025'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(PlayoffBracket.objects.get().payload['season'], 2025)
+        self.assertEqual(UltimatePlayoffEntry.objects.filter(season=2025, playoff_week=16).count(), 3)
+
+
+SLEEPER_MATCHUPS = [
+    {'roster_id': 1, 'matchup_id': 1, 'points': 101.5, 'players': ['4046', '6794'], 'starters': ['4046']},
+    {'roster_id': 2, 'matchup_id': 1, 'points': 88.0, 'players': ['4984'], 'starters': ['4984']},
+]
+SLEEPER_WEEK_STATS = {
+    '4046': {'pass_yd': 310.0, 'pass_td': 3.0, 'pts_ppr': 27.4, 'gp': 1.0, 'off_snp': 64.0},
+    '4984': {'pass_yd': 250.0, 'pts_ppr': 18.0},
+    '9999': {'rush_yd': 80.0},  # not in this league's matchups
+}
+
+
+def fake_sleeper(path):
+    return SLEEPER_MATCHUPS if '/matchups/' in path else SLEEPER_WEEK_STATS
+
+
+@override_settings(CACHES=LOCMEM_CACHE, LIVE_WEEK_TTL=0)
+@mock.patch('api.matchups.get_nfl_state', return_value={'season': '2025', 'week': 10})
+class MatchupDetailTests(TestCase):
+    """Matchup drill-downs share one trimmed copy; only the live week is refetched."""
+
+    def setUp(self):
+        cache.clear()
+        matchups._shared.cache_clear()
+        League.objects.create(name='League A', sleeper_league_id='111', season=2025)
+
+    @mock.patch('api.matchups._fetch', side_effect=fake_sleeper)
+    def test_completed_week_is_fetched_once(self, fetch, state):
+        for _ in range(3):
+            response = self.client.get('/api/matchups/111/9/')
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+        data = response.json()
+        self.assertTrue(data['completed'])
+        self.assertEqual(data['matchups'], SLEEPER_MATCHUPS)
+        # Only players in these matchups, only the fields stat lines use
+        self.assertEqual(data['stats'], {
+            '4046': {'pass_yd': 310.0, 'pass_td': 3.0, 'pts_ppr': 27.4},
+            '4984': {'pass_yd': 250.0, 'pts_ppr': 18.0},
+        })
+
+    @mock.patch('api.matchups._fetch', side_effect=fake_sleeper)
+    def test_live_week_refetches_after_ttl(self, fetch, state):
+        self.client.get('/api/matchups/111/10/?season=2025')
+        response = self.client.get('/api/matchups/111/10/?season=2025')
+        self.assertEqual(fetch.call_count, 4)
+        self.assertFalse(response.json()['completed'])
+        self.assertEqual(response['Cache-Control'], 'public, max-age=0')
+
+    @mock.patch('api.matchups._fetch', side_effect=fake_sleeper)
+    def test_rejects_untracked_league_and_bad_week(self, fetch, state):
+        self.assertEqual(self.client.get('/api/matchups/222/9/').status_code, 400)
+        self.assertEqual(self.client.get('/api/matchups/111/30/').status_code, 400)
+        fetch.assert_not_called()
+
+    @mock.patch('api.matchups._fetch', side_effect=fake_sleeper)
+    def test_season_comes_from_the_league(self, fetch, state):
+        # The live week asked for under an older season must not be filed as final
+        response = self.client.get('/api/matchups/111/10/?season=2024')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get('/api/matchups/111/10/?season=abc').status_code, 400)
+        fetch.assert_not_called()
+
+        Season.objects.create(year=2025, label='2025 Season', league_ids=['333'])
+        data = self.client.get('/api/matchups/333/10/').json()
+        self.assertEqual((data['season'], data['completed']), (2025, False))
+        fetch.assert_any_call('/stats/nfl/regular/2025/10')
+
+
+class DedupeLookupKeysMigrationTests(TransactionTestCase):
+    """0020 folds duplicate teams into one without losing their scores."""
+
+    def tearDown(self):
+        call_command('migrate', 'api', verbosity=0)
+
+    def apps_at(self, migration):
+        call_command('migrate', 'api', migration, verbosity=0)
+        return MigrationExecutor(connection).loader.project_state(('api', migration)).apps
+
+    def test_duplicate_teams_are_merged_into_the_newest(self):
+        apps = self.apps_at('0019_history_filter_indexes')
+        User_, MemberProfile_, League_, Team_, WeeklyScore_, Standing_, Entry_ = (
+            apps.get_model(*name.split('.')) for name in (
+                'auth.User', 'api.MemberProfile', 'api.League', 'api.Team',
+                'api.WeeklyScore', 'api.Standing', 'api.UltimatePlayoffEntry',
+            )
+        )
+        owner = MemberProfile_.objects.create(user=User_.objects.create(username='owner'))
+        league = League_.objects.create(name='League A', sleeper_league_id='1', season=2025)
+        old, new = (
+            Team_.objects.create(owner=owner, league=league, sleeper_roster_id='1', team_name=name)
+            for name in ('Old', 'New')
+        )
+        WeeklyScore_.objects.create(team=old, season=2025, week=1, points_scored=Decimal('90'))
+        WeeklyScore_.objects.create(team=old, season=2025, week=2, points_scored=Decimal('10'))
+        WeeklyScore_.objects.create(team=new, season=2025, week=2, points_scored=Decimal('110'))
+        Standing_.objects.create(team=old, league=league, season=2025, rank=1, league_rank=1)
+        Entry_.objects.create(team=old, season=2025, playoff_week=15)
+        Entry_.objects.create(team=new, season=2025, playoff_week=15)
+
+        apps = self.apps_at('0021_lookup_indexes')
+        Team_, WeeklyScore_, Standing_, Entry_ = (
+            apps.get_model('api', name) for name in ('Team', 'WeeklyScore', 'Standing', 'UltimatePlayoffEntry')
+        )
+        self.assertEqual(list(Team_.objects.values_list('team_name', flat=True)), ['New'])
+        self.assertEqual(
+            sorted(WeeklyScore_.objects.values_list('team_id', 'week', 'points_scored')),
+            [(new.id, 1, Decimal('90')), (new.id, 2, Decimal('110'))],
+        )
+        self.assertEqual(list(Standing_.objects.values_list('team_id', flat=True)), [new.id])
+        self.assertEqual(Entry_.objects.filter(team_id=new.id).count(), 1)
+
+
+class BenchmarkQueryPlansTests(TransactionTestCase):
+    """benchmark_query_plans must keep seeding the older schema as models gain fields."""
+
+    def tearDown(self):
+        call_command('migrate', 'api', verbosity=0)
+
+    def test_runs_against_the_test_database(self):
+        out = StringIO()
+        # Already on a throwaway database; don't let the command swap in another
+        with mock.patch.object(connection.creation, 'create_test_db'), \
+                mock.patch.object(connection.creation, 'destroy_test_db'):
+            call_command('benchmark_query_plans', seasons=1, leagues=1, teams=2, runs=1, stdout=out)
+        self.assertIn('Seeded 2 members, 1 leagues, 2 teams, 36 weekly scores.', out.getvalue())
+        self.assertIn('Team by (league, sleeper_roster_id)', out.getvalue())
+
+
+def sleeper_league(league_id, weeks, season='2025'):
+    """One league in the shape Sleeper (and a snapshot) returns it: two rosters playing each other."""
+    return {
+        'league': {'league_id': league_id, 'name': f'League {league_id}', 'season': season},
+        'users': [
+            {'user_id': f'{league_id}1', 'display_name': 'alice', 'metadata': {'team_name': 'Aces'}},
+            {'user_id': f'{league_id}2', 'display_name': 'bob', 'metadata': {'team_name': 'Bolts'}},
+        ],
+        'rosters': [
+            {'roster_id': 1, 'owner_id': f'{league_id}1', 'players': [], 'settings': {}},
+            {'roster_id': 2, 'owner_id': f'{league_id}2', 'players': [], 'settings': {}},
+        ],
+        'winners_bracket': [],
+        'matchups': {
+            str(week): [
+                {'roster_id': 1, 'matchup_id': 1, 'points': 100 + week, 'players_points': {}},
+                {'roster_id': 2, 'matchup_id': 1, 'points': 90 + week, 'players_points': {}},
+            ]
+            for week in weeks
+        },
+    }
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SyncWatermarkTests(TestCase):
+    """--incremental only skips weeks that a previous sync actually wrote."""
+
+    def test_incremental_weeks(self):
+        self.assertEqual(list(incremental_weeks(0, 1)), [1])
+        # Everything after the watermark, plus last week for stat corrections
+        self.assertEqual(list(incremental_weeks(2, 6)), [3, 4, 5, 6])
+        self.assertEqual(list(incremental_weeks(5, 6)), [5, 6])
+        self.assertEqual(list(incremental_weeks(5, 19)), list(range(6, 19)))
+        self.assertEqual(list(incremental_weeks(18, 19)), [])
+
+    def test_advance_watermark(self):
+        self.assertEqual(advance_watermark(0, 5, 6), 5)
+        # Stops at the last week written, never past the week in progress
+        self.assertEqual(advance_watermark(0, 2, 6), 2)
+        self.assertEqual(advance_watermark(0, 6, 6), 5)
+        self.assertEqual(advance_watermark(17, 18, 19), 18)
+        # Nothing written, or an older run: never moves backwards
+        self.assertEqual(advance_watermark(4, None, 6), 4)
+        self.assertEqual(advance_watermark(4, 3, 6), 4)
+
+    def sync(self, leagues, *args, state=None, stdout=None):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'snapshot.json')
+            with open(path, 'w') as f:
+                json.dump({'state': state or {'season': '2025', 'week': 6}, 'leagues': leagues}, f)
+            call_command('sync_sleeper', '--from-local', '--snapshot', path, *args, stdout=stdout or StringIO())
+        return League.objects.filter(sleeper_league_id='111').first()
+
+    def test_season_falls_back_to_the_nfl_state(self):
+        no_season = sleeper_league('111', [1])
+        del no_season['league']['season']
+        out = StringIO()
+        self.assertIsNone(self.sync({'111': no_season}, state={'week': 6}, stdout=out))
+        self.assertIn('the NFL state has no season', out.getvalue())
+
+        league = self.sync({'111': no_season}, state={'season': '2024', 'week': 6})
+        self.assertEqual(league.season, 2024)
+        self.assertEqual(set(WeeklyScore.objects.values_list('season', flat=True)), {2024})
+
+    def test_missing_week_is_retried(self):
+        # Week 3 failed to download: nothing from it on is written, so the watermark stops at 2
+        league = self.sync({'111': sleeper_league('111', [1, 2, 4, 5])})
+        self.assertEqual(league.last_completed_week, 2)
+        self.assertEqual(
+            sorted(WeeklyScore.objects.filter(team__league=league).values_list('week', flat=True).distinct()),
+            [1, 2],
+        )
+
+        league = self.sync({'111': sleeper_league('111', [1, 2, 3, 4, 5])}, '--incremental')
+        self.assertEqual(league.last_completed_week, 5)
+        self.assertEqual(
+            sorted(WeeklyScore.objects.filter(team__league=league).values_list('week', flat=True).distinct()),
+            [1, 2, 3, 4, 5],
+        )
+
+    def test_resync_updates_scores_in_place(self):
+        league = self.sync({'111': sleeper_league('111', [1, 2])})
+        first = dict(WeeklyScore.objects.values_list('id', 'points_scored'))
+
+        # Stat corrections and a re-paired matchup come through on the next sync
+        corrected = sleeper_league('111', [1, 2])
+        for week in corrected['matchups'].values():
+            for row in week:
+                row['points'] += 0.5
+                row['matchup_id'] = 2
+        league = self.sync({'111': corrected})
+
+        scores = WeeklyScore.objects.filter(team__league=league)
+        self.assertEqual(set(scores.values_list('id', flat=True)), set(first))
+        self.assertEqual(
+            sorted(scores.values_list('team__sleeper_roster_id', 'week', 'points_scored', 'matchup_id')),
+            [('1', 1, Decimal('101.50'), 2), ('1', 2, Decimal('102.50'), 2),
+             ('2', 1, Decimal('91.50'), 2), ('2', 2, Decimal('92.50'), 2)],
+        )
+        score = scores.first()
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            WeeklyScore.objects.create(team=score.team, week=score.week, season=score.season, points_scored=0)
+
+
+class WeeklyScoreDedupeMigrationTests(TransactionTestCase):
+    """0013 keeps the newest of each duplicated (team, week, season) score."""
+
+    def tearDown(self):
+        call_command('migrate', 'api', verbosity=0)
+
+    def apps_at(self, migration):
+        call_command('migrate', 'api', migration, verbosity=0)
+        return MigrationExecutor(connection).loader.project_state(('api', migration)).apps
+
+    def test_newest_duplicate_is_kept(self):
+        apps = self.apps_at('0012_memberprofile_has_completed_onboarding')
+        User_, MemberProfile_, League_, Team_, WeeklyScore_ = (
+            apps.get_model(*name.split('.')) for name in (
+                'auth.User', 'api.MemberProfile', 'api.League', 'api.Team', 'api.WeeklyScore',
+            )
+        )
+        owner = MemberProfile_.objects.create(user=User_.objects.create(username='owner'))
+        league = League_.objects.create(name='League A', sleeper_league_id='1', season=2025)
+        team = Team_.objects.create(owner=owner, league=league, sleeper_roster_id='1', team_name='Aces')
+        for week, points in ((1, '90'), (1, '95'), (2, '80')):
+            WeeklyScore_.objects.create(team=team, season=2025, week=week, points_scored=Decimal(points))
+
+        apps = self.apps_at('0013_weeklyscore_unique_team_week_season')
+        self.assertEqual(
+            sorted(apps.get_model('api', 'WeeklyScore').objects.values_list('week', 'points_scored')),
+            [(1, Decimal('95')), (2, Decimal('80'))],
+        )
+
+
+class FakeSleeperApi:
+    """Stands in for api.sleeper.fetch_json, answering from sleeper_league('111', [1, 2])."""
+
+    def __init__(self, failing=()):
+        self.failing = failing
+        self.urls = []
+        self.league = sleeper_league('111', [1, 2])
+
+    def __call__(self, session, url, timeout, limiter=None, retries=0):
+        self.urls.append(url)
+        path = url.split('/v1/', 1)[1]
+        if path in self.failing:
+            raise requests.exceptions.ConnectionError(path)
+        if path == 'state/nfl':
+            return {'season': '2025', 'week': 3}
+        if path == 'players/nfl':
+            return {'4046': {'first_name': 'Patrick', 'last_name': 'Mahomes', 'position': 'QB', 'team': 'KC'}}
+        key = path.split('/', 2)[2] if path.count('/') > 1 else 'league'
+        if key.startswith('matchups/'):
+            return self.league['matchups'].get(key.split('/')[1], [])
+        return self.league[key]
+
+
+class DownloadResumeTests(TestCase):
+    """--resume keeps only leagues whose league, users and rosters all downloaded."""
+
+    def download(self, output, sleeper, *args):
+        import download_sleeper
+        argv = ['download_sleeper.py', '--output', output, '--league-ids', '111', '--skip-stats', '--rps', '1000', *args]
+        with mock.patch.object(download_sleeper, 'fetch_json_or_raise', sleeper), \
+                mock.patch('sys.argv', argv), mock.patch('sys.stdout', StringIO()):
+            download_sleeper.main()
+
+    def test_failed_users_call_is_retried_on_resume(self):
+        with tempfile.TemporaryDirectory() as output:
+            self.download(output, FakeSleeperApi(failing={'league/111/users'}))
+            self.assertEqual(SnapshotReader(output).league_ids(), [])
+            self.assertFalse(SnapshotWriter(output, resume=True).is_league_complete('111'))
+
+            sleeper = FakeSleeperApi()
+            self.download(output, sleeper, '--resume')
+            self.assertIn('https://api.sleeper.app/v1/league/111/users', sleeper.urls)
+            # The matchup weeks that did arrive the first time aren't fetched again
+            self.assertNotIn('https://api.sleeper.app/v1/league/111/matchups/1', sleeper.urls)
+            league = SnapshotReader(output).league('111')
+            self.assertEqual(len(league['users']), 2)
+            self.assertEqual(sorted(league['matchups']), ['1', '2'])
+
+            sleeper = FakeSleeperApi()
+            self.download(output, sleeper, '--resume')
+            self.assertEqual(sleeper.urls, ['https://api.sleeper.app/v1/state/nfl'])
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class SyncNflStateTests(TestCase):
+    """Views may serve a stale NFL state; the sync must not act on one."""
+
+    def setUp(self):
+        cache.clear()
+        nfl_state._state._entry = None
+        self.addCleanup(setattr, nfl_state._state, '_entry', None)
+        League.objects.create(name='League A', sleeper_league_id='111', season=2025)
+        nfl_state._state.set({'season': '2025', 'week': 5})
+
+    @mock.patch('api.nfl_state._fetch', side_effect=requests.exceptions.ConnectionError('down'))
+    def test_sync_aborts_without_a_fresh_state(self, fetch):
+        self.assertEqual(nfl_state.get_nfl_state(max_age=0)['week'], 5)
+        out = StringIO()
+        with mock.patch('api.management.commands.sync_sleeper.fetch_leagues') as fetch_leagues:
+            call_command('sync_sleeper', stdout=out)
+        self.assertIn('Fatal Error fetching state: down', out.getvalue())
+        fetch_leagues.assert_not_called()
+
+    @mock.patch('api.nfl_state._fetch', return_value={'season': '2025', 'week': 6})
+    def test_refreshed_state_is_shared_with_views(self, fetch):
+        self.assertEqual(nfl_state.refresh_nfl_state()['week'], 6)
+        self.assertEqual(nfl_state.get_nfl_state()['week'], 6)
+        fetch.assert_called_once()
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() just moves monotonic() forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def sleeper_response(status, body=None, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    response.url = 'https://api.sleeper.app/v1/state/nfl'
+    response._content = json.dumps(body).encode()
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return response
+
+
+@mock.patch('api.sleeper.random.uniform', return_value=0)
+class RateLimitTests(TestCase):
+    """The token bucket and retry backoff, against a fake clock."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('api.sleeper.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch(self, *responses, retries=3, limiter=None):
+        session = mock.Mock()
+        session.get.side_effect = list(responses)
+        return fetch_json(session, 'https://api.sleeper.app/v1/state/nfl', limiter=limiter, retries=retries), session
+
+    def test_bucket_allows_a_burst_then_the_rate(self, uniform):
+        bucket = TokenBucket(rate=2, capacity=3)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [])
+        for _ in range(4):
+            bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [0.5] * 4)
+        # Idle time refills the bucket, but only up to its capacity
+        self.clock.now += 10
+        for _ in range(4):
+            bucket.acquire()
+        self.assertEqual(self.clock.sleeps, [0.5] * 5)
+
+    def test_bucket_rejects_a_non_positive_rate(self, uniform):
+        for rate in (0, -1):
+            with self.assertRaises(ValueError):
+                TokenBucket(rate)
+
+    def test_retries_honour_retry_after_then_back_off(self, uniform):
+        data, session = self.fetch(
+            sleeper_response(429, retry_after='3'),
+            requests.exceptions.ConnectionError(),
+            sleeper_response(503),
+            sleeper_response(200, {'week': 3}),
+            limiter=TokenBucket(rate=100),
+        )
+        self.assertEqual(data, {'week': 3})
+        self.assertEqual(session.get.call_count, 4)
+        self.assertEqual(self.clock.sleeps, [3.0, 1.0, 2.0])
+
+    def test_gives_up_after_the_last_retry(self, uniform):
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.fetch(*[sleeper_response(503)] * 3, retries=2)
+        self.assertEqual(self.clock.sleeps, [0.5, 1.0])
+
+    def test_client_errors_are_not_retried(self, uniform):
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.fetch(sleeper_response(404))
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_download_rejects_a_zero_rate(self, uniform):
+        import download_sleeper
+        with mock.patch('sys.argv', ['download_sleeper.py', '--rps', '0']), \
+                mock.patch('sys.stderr', StringIO()) as stderr, self.assertRaises(SystemExit):
+            download_sleeper.main()
+        self.assertIn('--rps: must be greater than 0', stderr.getvalue())
+
+
+class ReconcileUsersTests(TestCase):
+    """Sleeper renames follow unclaimed accounts only; registered members keep their login."""
+
+    def member(self, username, sleeper_id, password=None):
+        user = User.objects.create_user(username=username, password=password)
+        return MemberProfile.objects.create(
+            user=user, sleeper_id=sleeper_id, first_name='Member', sleeper_display_name=username,
+        )
+
+    def reconcile(self, *users):
+        return SyncSleeperCommand().reconcile_users(
+            [{'user_id': sleeper_id, 'display_name': name} for sleeper_id, name in users]
+        )
+
+    def test_unclaimed_account_follows_the_display_name(self):
+        self.member('oldname', '1')
+        profiles = self.reconcile(('1', 'newname'))
+        profile = MemberProfile.objects.select_related('user').get(sleeper_id='1')
+        self.assertEqual(profile.user.username, 'newname')
+        self.assertEqual(profile.sleeper_display_name, 'newname')
+        self.assertEqual(profiles['1'].pk, profile.pk)
+
+    def test_claimed_account_keeps_its_username(self):
+        self.member('alice', '2', password='pw-12345')
+        self.reconcile(('2', 'alice_on_sleeper'))
+        profile = MemberProfile.objects.select_related('user').get(sleeper_id='2')
+        self.assertEqual(profile.user.username, 'alice')
+        self.assertTrue(profile.user.check_password('pw-12345'))
+        self.assertEqual(profile.sleeper_display_name, 'alice_on_sleeper')
+        self.assertEqual(profile.first_name, 'Member')
+
+    def test_rename_never_takes_someone_elses_username(self):
+        self.member('oldname', '1')
+        self.member('taken', '2', password='pw-12345')
+        self.reconcile(('1', 'taken'), ('2', 'taken'))
+        profile = MemberProfile.objects.select_related('user').get(sleeper_id='1')
+        self.assertEqual(profile.user.username, 'oldname')
+        self.assertEqual(profile.sleeper_display_name, 'taken')
+
+    def test_new_members_get_a_free_username(self):
+        self.member('bob', '1', password='pw-12345')
+        with self.assertNumQueries(6):
+            profiles = self.reconcile(('1', 'bob'), ('3', 'bob'), ('4', 'carol'))
+        self.assertEqual(profiles['3'].user.username, 'bob_1')
+        self.assertFalse(profiles['3'].user.has_usable_password())
+        self.assertEqual(profiles['4'].sleeper_display_name, 'carol')
+        self.assertEqual(MemberProfile.objects.count(), 3)
+
+
+class SnapshotFormatTests(TestCase):
+    """Chunked snapshots read back exactly what was written; the single-file format still loads."""
+
+    STATE = {'season': '2025', 'week': 4}
+    PLAYERS = {'4046': {'first_name': 'Patrick', 'last_name': 'Mahomes', 'position': 'QB', 'team': 'KC'}}
+    STATS = {'4046': {'1': {'stats': {'pts_ppr': 27.4}}}}
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.league = sleeper_league('111', [1, 2, 3])
+
+    def write_snapshot(self, path):
+        writer = SnapshotWriter(path)
+        writer.write_state(self.STATE)
+        writer.write_players(self.PLAYERS)
+        for week, matchups in self.league['matchups'].items():
+            writer.write_week('111', week, matchups)
+        writer.write_league('111', self.league)
+        writer.write_player_stats('4046', self.STATS['4046'])
+        writer.close()
+
+    def assert_reads_back(self, reader):
+        self.assertEqual(reader.state, self.STATE)
+        self.assertEqual(reader.players(), self.PLAYERS)
+        self.assertEqual(reader.league_ids(), ['111'])
+        self.assertEqual(reader.league_meta('111')['users'], self.league['users'])
+        self.assertEqual(reader.league('111'), self.league)
+        # Only the weeks asked for (and present) are loaded
+        self.assertEqual(sorted(reader.league('111', weeks=[2, 3, 9])['matchups']), ['2', '3'])
+        self.assertEqual(reader.league('111', weeks=[])['matchups'], {})
+        self.assertTrue(reader.has_player_stats('4046'))
+        self.assertEqual(reader.player_stats('4046'), self.STATS['4046'])
+        self.assertIsNone(reader.player_stats('9999'))
+
+    def test_round_trip(self):
+        path = os.path.join(self.root, 'snapshot')
+        self.write_snapshot(path)
+        reader = open_snapshot(path)
+        self.assertIsInstance(reader, SnapshotReader)
+        self.assert_reads_back(reader)
+
+    def test_export_reads_back_as_the_legacy_format(self):
+        path = os.path.join(self.root, 'snapshot')
+        self.write_snapshot(path)
+        export_path = os.path.join(self.root, 'snapshot.json')
+        export_json(SnapshotReader(path), export_path)
+        reader = open_snapshot(export_path)
+        self.assertIsInstance(reader, LegacySnapshotReader)
+        self.assert_reads_back(reader)
+
+    def test_legacy_file(self):
+        path = os.path.join(self.root, 'sleeper_snapshot_2025.json')
+        with open(path, 'w') as f:
+            json.dump({
+                'state': self.STATE, 'players': self.PLAYERS,
+                'leagues': {'111': self.league}, 'player_stats': self.STATS,
+            }, f)
+        self.assert_reads_back(open_snapshot(path))
+        self.assertIsNone(open_snapshot(os.path.join(self.root, 'missing')))
+
+    def test_default_path_falls_back_to_the_legacy_file(self):
+        base = os.path.join(self.root, 'sleeper_snapshot_2025')
+        with open(f'{base}.json', 'w') as f:
+            json.dump({'state': self.STATE, 'leagues': {'111': self.league}}, f)
+        command = SyncSleeperCommand(stdout=StringIO())
+        self.assertIsInstance(command.load_snapshot(base), LegacySnapshotReader)
+
+        # Once downloaded, the directory wins
+        self.write_snapshot(base)
+        self.assertIsInstance(command.load_snapshot(base), SnapshotReader)
+        self.assertIsNone(command.load_snapshot(os.path.join(self.root, 'missing')))
+
+    def test_resume_drops_truncated_records(self):
+        path = os.path.join(self.root, 'snapshot')
+        self.write_snapshot(path)
+        week_path = os.path.join(path, 'leagues', '111', 'matchups', '3.json.gz')
+        with open(week_path, 'rb') as f:
+            data = f.read()
+        with open(week_path, 'wb') as f:
+            f.write(data[: len(data) // 2])
+        writer = SnapshotWriter(path, resume=True)
+        self.assertTrue(writer.is_league_complete('111'))
+        self.assertTrue(writer.has_week('111', 2))
+        self.assertFalse(writer.has_week('111', 3))
+        self.assertTrue(writer.has_player_stats('4046'))
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class ServerTimingTests(TestCase):
+    """Per-request query counts are for developers and staff, not every visitor."""
+
+    URL = '/api/widget/common-players/'
+
+    def test_hidden_from_the_public(self):
+        self.assertNotIn('Server-Timing', self.client.get(self.URL))
+
+    @override_settings(DEBUG=True)
+    def test_sent_with_debug(self):
+        self.assertIn('desc="', self.client.get(self.URL)['Server-Timing'])
+
+    def test_sent_to_jwt_staff(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='staff', is_staff=True))
+        self.assertIn('desc="', client.get(self.URL)['Server-Timing'])
+        client.force_authenticate(User.objects.create_user(username='member'))
+        self.assertNotIn('Server-Timing', client.get(self.URL))
+
+    @override_settings(DEBUG=True, CACHES=LOCMEM_CACHE)
+    def test_serializer_time_is_split_from_the_view(self):
+        cache.clear()
+        CommonPlayer.objects.create(rank=1, player_id='4046', player_name='Patrick Mahomes', count=3)
+        ticks = iter(range(100))
+        # Every perf_counter() call is one second later; the serializer's block spans exactly one tick
+        with mock.patch('api.middleware.time.perf_counter', side_effect=lambda: next(ticks)):
+            header = self.client.get(self.URL)['Server-Timing']
+        timings = dict(part.split(';dur=') for part in header.split(', ') if not part.startswith('db;'))
+        self.assertEqual(list(timings), ['view', 'serialize', 'render', 'total'])
+        self.assertEqual(timings['serialize'], '1000.0')
+        self.assertEqual(
+            float(timings['view']) + float(timings['serialize']) + float(timings['render']),
+            float(timings['total']),
+        )
@@ -13,12 +13,15 @@ urlpatterns = [
     path('teams/', views.TeamList.as_view(), name='team-list'),
     path('scores/', views.WeeklyScoreList.as_view(), name='score-list'),
     path('playoff-entries/', views.UltimatePlayoffEntryList.as_view(), name='playoff-entry-list'),
+    path('playoff-bracket/', views.PlayoffBracketView.as_view(), name='playoff-bracket'),
     path('payouts/', views.PayoutList.as_view(), name='payout-list'),
 
     # ── Widgets ───────────────────────────────────────────────────────────────
     path('widget/weekly-winner/', views.WeeklyWinner.as_view(), name='widget-weekly-winner'),
     path('widget/power-rankings/', views.PowerRankings.as_view(), name='widget-power-rankings'),
     path('widget/common-players/', views.CommonPlayersWidget.as_view(), name='widget-common-players'),
+    path('standings/', views.StandingsList.as_view(), name='standings'),
+    path('records/', views.RecordsList.as_view(), name='records'),
 
     # ── Seasons (public list + admin create/update) ────────────────────────
     path('seasons/', views.SeasonListView.as_view(), name='season-list'),
@@ -35,6 +38,10 @@ urlpatterns = [
 
     # ── Utility ───────────────────────────────────────────────────────────────
     path('nfl-state/',      views.NflStateView.as_view(),    name='nfl-state'),
+    path('dashboard/',      views.DashboardView.as_view(),   name='dashboard'),
+    path('matchups/<str:league_id>/<int:week>/', views.MatchupDetailView.as_view(), name='matchup-detail'),
+    path('players/',        views.RosteredPlayersView.as_view(), name='players'),
+    path('players/<str:version>/', views.RosteredPlayersView.as_view(), name='players-version'),
     path('playoff-status/', views.PlayoffStatusView.as_view(), name='playoff-status'),
 
     # ── Admin commands ────────────────────────────────────────────────────────
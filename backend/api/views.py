@@ -1,10 +1,16 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.db import connection
+from django.db.models import F, Prefetch, Subquery, Window
+from django.db.models.functions import RowNumber
 from .models import (
     MemberProfile, League, Team, WeeklyScore,
     UltimatePlayoffEntry, Payout, CommonPlayer,
-    Season, PlannedLeague, LeagueAssignment, SeasonDues,
+    Season, PlannedLeague, LeagueAssignment, SeasonDues, Standing, RosteredPlayers,
+    SeasonRecord, PlayoffBracket,
 )
 from .serializers import (
     MemberProfileSerializer, MemberProfileAdminSerializer,
@@ -12,11 +18,24 @@ from .serializers import (
     WeeklyScoreSerializer, UltimatePlayoffEntrySerializer,
     PayoutSerializer, CommonPlayerSerializer,
     SeasonSerializer, PlannedLeagueSerializer, OrganizerMemberSerializer,
+    StandingSerializer,
 )
+from .cache import cache_public_response, invalidate_public_cache
+from .dashboard import MAX_LEAGUES as MAX_DASHBOARD_LEAGUES, get_dashboard
+from .matchups import matchup_detail
+from .nfl_state import get_nfl_state, nfl_week
+from .pagination import int_filters, paginated_response
+from .players import rostered_players_version
+from .records import records_payload
+from .sleeper import MATCHUP_WEEKS
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from django.core.management import call_command
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.conf import settings
 from django.contrib.auth.models import User
+import gzip
 import requests
 
 # ── Auth endpoints ─────────────────────────────────────────────────────────────
@@ -140,12 +159,13 @@ class MemberProfileList(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        profiles   = MemberProfile.objects.all()
+        profiles   = MemberProfile.objects.select_related('user')
         serializer = MemberProfileSerializer(profiles, many=True)
         return Response(serializer.data)
 
 
 class LeagueList(APIView):
+    @cache_public_response
     def get(self, request):
         leagues    = League.objects.all()
         serializer = LeagueSerializer(leagues, many=True)
@@ -160,99 +180,199 @@ class LeagueDetail(APIView):
 
 
 class TeamList(APIView):
+    @cache_public_response
     def get(self, request):
-        queryset  = Team.objects.all()
-        league_id = request.query_params.get('league')
-        if league_id is not None:
-            queryset = queryset.filter(league__id=league_id)
-        queryset   = queryset.order_by('-wins', '-points_for')
+        try:
+            filters = int_filters(request, {'league': 'league_id'})
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        queryset   = Team.objects.select_related('owner__user').filter(**filters).order_by('-wins', '-points_for')
         serializer = TeamSerializer(queryset, many=True)
         return Response(serializer.data)
 
 
 class WeeklyScoreList(APIView):
+    """
+    Cursor-paginated scores, newest first. Filters: ?season= ?week= ?team= ?league=.
+    ?fields=week,points_scored returns only those fields.
+    """
+
     def get(self, request):
-        scores     = WeeklyScore.objects.all()
-        serializer = WeeklyScoreSerializer(scores, many=True)
-        return Response(serializer.data)
+        try:
+            filters = int_filters(request, {
+                'season': 'season', 'week': 'week', 'team': 'team_id', 'league': 'team__league_id',
+            })
+            scores = WeeklyScore.objects.filter(**filters)
+            return paginated_response(self, request, scores, WeeklyScoreSerializer)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+
+class PlayoffBracketView(APIView):
+    """
+    The precomputed BIG Playoff bracket for ?season= (default: latest):
+    every week's entries, scores, ranks and cut line, with the week in
+    progress projected from live scores.
+    """
+
+    @cache_public_response
+    def get(self, request):
+        try:
+            filters = int_filters(request, {'season': 'season'})
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        bracket = PlayoffBracket.objects.filter(**filters).order_by('-season').first()
+        if bracket is None:
+            return Response({'error': 'The BIG Playoff has not started.'}, status=404)
+        return Response(bracket.payload)
 
 
 class UltimatePlayoffEntryList(APIView):
     def get(self, request):
-        entries    = UltimatePlayoffEntry.objects.all().order_by('playoff_week', '-week_score')
+        # StringRelatedField renders Team.__str__, which reads owner.user
+        entries    = UltimatePlayoffEntry.objects.select_related('team__owner__user').order_by(
+            'playoff_week', '-week_score'
+        )
         serializer = UltimatePlayoffEntrySerializer(entries, many=True)
         return Response(serializer.data)
 
 
 class PayoutList(APIView):
+    """Cursor-paginated payouts, newest first. Filters: ?season= ?recipient=. Supports ?fields=."""
+
     def get(self, request):
-        payouts    = Payout.objects.all()
-        serializer = PayoutSerializer(payouts, many=True)
-        return Response(serializer.data)
+        try:
+            filters = int_filters(request, {'season': 'season', 'recipient': 'recipient_id'})
+            payouts = Payout.objects.filter(**filters)
+            return paginated_response(self, request, payouts, PayoutSerializer)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
 
 
 # ── Widgets ────────────────────────────────────────────────────────────────────
 
+def weekly_high_scores(week, season=None):
+    """
+    Each league's top WeeklyScore for `week`, in one query. `season` defaults
+    to the latest season with any scores. Databases without window functions
+    get every score for the week (still one query) and pick the top in Python.
+    """
+    scores = WeeklyScore.objects.filter(week=week).select_related('team__owner', 'team__league')
+    if season is None:
+        season = Subquery(WeeklyScore.objects.order_by('-season').values('season')[:1])
+    scores = scores.filter(season=season)
+
+    if connection.features.supports_over_clause:
+        return list(scores.annotate(league_rank=Window(
+            RowNumber(),
+            partition_by=[F('team__league')],
+            order_by=[F('points_scored').desc(), F('id')],
+        )).filter(league_rank=1).order_by('team__league_id'))
+
+    top = {}
+    for score in scores.order_by('-points_scored', 'id'):
+        top.setdefault(score.team.league_id, score)
+    return [top[league_id] for league_id in sorted(top)]
+
+
+def default_week_key(request):
+    """Cache-key part for views that default to Sleeper's week, so a new week isn't served last week's copy."""
+    if request.query_params.get('week') is not None:
+        return ''
+    try:
+        state = get_nfl_state()
+    except Exception:
+        return ''
+    return f"{state.get('season')}-{nfl_week(state)}"
+
+
 class WeeklyWinner(APIView):
+    """
+    Each league's high scorer for a week. Defaults to the last completed
+    week from Sleeper; ?week= (and optionally ?season=) serves any past week
+    straight from the database.
+    """
+
+    @cache_public_response(vary=default_week_key)
     def get(self, request):
         try:
-            state_response = requests.get("https://api.sleeper.app/v1/state/nfl")
-            state_response.raise_for_status()
-            state_data = state_response.json()
-
-            current_week = state_data.get('week', 0)
-            if current_week == 0:
-                current_week = state_data.get('display_week', 0)
-            target_week = current_week - 1
-
-            if target_week < 1:
+            week   = request.query_params.get('week')
+            season = request.query_params.get('season')
+            try:
+                week   = int(week) if week is not None else None
+                season = int(season) if season is not None else None
+            except ValueError:
+                return Response({"message": "week and season must be numbers."}, status=400)
+
+            if week is None:
+                state  = get_nfl_state()
+                week   = nfl_week(state) - 1
+                season = season or (int(state['season']) if state.get('season') else None)
+
+            if week < 1:
                 return Response({"message": "Regular season has not started yet."}, status=404)
 
-            all_leagues  = League.objects.all()
             winners_list = []
-
-            for league in all_leagues:
-                try:
-                    top_score_entry = WeeklyScore.objects.filter(
-                        team__league=league, week=target_week
-                    ).order_by('-points_scored').first()
-
-                    if top_score_entry:
-                        owner_name = "Unclaimed Team"
-                        if top_score_entry.team.owner:
-                            owner_name = top_score_entry.team.owner.full_name
-                        winners_list.append({
-                            'week':        target_week,
-                            'team_name':   top_score_entry.team.team_name,
-                            'owner_name':  owner_name,
-                            'score':       top_score_entry.points_scored,
-                            'league_name': league.name,
-                        })
-                except WeeklyScore.DoesNotExist:
-                    continue
+            for top_score_entry in weekly_high_scores(week, season):
+                owner_name = "Unclaimed Team"
+                if top_score_entry.team.owner:
+                    owner_name = top_score_entry.team.owner.full_name
+                winners_list.append({
+                    'week':        week,
+                    'team_name':   top_score_entry.team.team_name,
+                    'owner_name':  owner_name,
+                    'score':       top_score_entry.points_scored,
+                    'league_name': top_score_entry.team.league.name,
+                })
 
             return Response(winners_list)
         except Exception as e:
             return Response({"message": str(e)}, status=500)
 
 
+def latest_standings_season():
+    return Subquery(Standing.objects.order_by('-season').values('season')[:1])
+
+
 class PowerRankings(APIView):
+    @cache_public_response
     def get(self, request):
-        top_teams = Team.objects.all().order_by('-points_for')[:5]
-        data = []
-        for team in top_teams:
-            owner_name = team.owner.full_name if team.owner else "Unclaimed Team"
-            data.append({
-                'team_name':   team.team_name,
-                'owner_name':  owner_name,
-                'points_for':  team.points_for,
-                'league_name': team.league.name,
-                'record':      f"{team.wins}-{team.losses}-{team.ties}",
-            })
-        return Response(data)
+        # Standing is pre-ranked and denormalized by sync_sleeper — one query, no joins
+        data = Standing.objects.filter(season=latest_standings_season()).order_by('rank').values(
+            'team_name', 'owner_name', 'points_for', 'league_name', 'record',
+        )[:5]
+        return Response(list(data))
+
+
+class StandingsList(APIView):
+    """Pre-ranked standings for ?season= (default: latest), optionally one ?league=."""
+
+    @cache_public_response
+    def get(self, request):
+        try:
+            filters = int_filters(request, {'season': 'season', 'league': 'league_id'})
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        filters.setdefault('season', latest_standings_season())
+        queryset = Standing.objects.filter(**filters)
+        if 'league_id' in filters:
+            queryset = queryset.order_by('league_rank')
+        else:
+            queryset = queryset.order_by('rank')
+        serializer = StandingSerializer(queryset, many=True)
+        return Response(serializer.data)
+
+
+class RecordsList(APIView):
+    """High/low score, biggest blowout and closest game — per season and all-time."""
+
+    @cache_public_response
+    def get(self, request):
+        return Response(records_payload(SeasonRecord.objects.all()))
 
 
 class CommonPlayersWidget(APIView):
+    @cache_public_response
     def get(self, request):
         common_players = CommonPlayer.objects.all().order_by('rank')
         serializer     = CommonPlayerSerializer(common_players, many=True)
@@ -276,8 +396,14 @@ class RunStartPlayoff(APIView):
     permission_classes = [IsAdminUser]
 
     def post(self, request):
+        season = request.data.get('season')
+        # call_command passes keyword options through as given, so the command would get the client's string
         try:
-            call_command('start_big_playoff')
+            season = int(season) if season else None
+        except (TypeError, ValueError):
+            return Response({"status": "error", "message": "Season must be a number."}, status=400)
+        try:
+            call_command('start_big_playoff', season=season)
             return Response({"status": "success", "message": "BIG Playoff started successfully."})
         except Exception as e:
             return Response({"status": "error", "message": str(e)}, status=500)
@@ -287,11 +413,18 @@ class RunPlayoffElimination(APIView):
     permission_classes = [IsAdminUser]
 
     def post(self, request):
-        week = request.data.get('week')
+        week   = request.data.get('week')
+        season = request.data.get('season')
         if not week:
             return Response({"status": "error", "message": "Week number is required."}, status=400)
+        # call_command passes keyword options through as given, so the command would get the client's strings
         try:
-            call_command('run_playoff_elimination', week=week)
+            week   = int(week)
+            season = int(season) if season else None
+        except (TypeError, ValueError):
+            return Response({"status": "error", "message": "Week and season must be numbers."}, status=400)
+        try:
+            call_command('run_playoff_elimination', week=week, season=season)
             return Response({"status": "success", "message": f"Playoff elimination for week {week} complete."})
         except Exception as e:
             return Response({"status": "error", "message": str(e)}, status=500)
@@ -330,7 +463,7 @@ class AllMembersList(APIView):
     permission_classes = [IsAdminUser]
 
     def get(self, request):
-        profiles   = MemberProfile.objects.all().order_by('last_name', 'first_name')
+        profiles   = MemberProfile.objects.select_related('user').order_by('last_name', 'first_name')
         serializer = MemberProfileAdminSerializer(profiles, many=True)
         return Response(serializer.data)
 
@@ -360,6 +493,7 @@ class TogglePlayoffFlag(APIView):
             team = get_object_or_404(Team, pk=pk)
             team.made_league_playoffs = not team.made_league_playoffs
             team.save()
+            invalidate_public_cache()
             return Response({
                 "status": "success",
                 "message": "Playoff flag updated.",
@@ -428,8 +562,12 @@ class OrganizerView(APIView):
     def get(self, request, year):
         season = get_object_or_404(Season, year=year)
 
-        members = MemberProfile.objects.all().order_by('last_name', 'first_name').prefetch_related(
-            'league_assignments', 'season_dues'
+        # Only this season's assignment/dues rows, so the serializer never queries per member
+        members = MemberProfile.objects.select_related('user').order_by('last_name', 'first_name').prefetch_related(
+            Prefetch('league_assignments', queryset=LeagueAssignment.objects.filter(season=season),
+                     to_attr='season_assignments'),
+            Prefetch('season_dues', queryset=SeasonDues.objects.filter(season=season),
+                     to_attr='season_dues_rows'),
         )
         member_serializer = OrganizerMemberSerializer(members, many=True, context={'season': season})
 
@@ -521,13 +659,143 @@ class NflStateView(APIView):
 
     def get(self, request):
         try:
-            r = requests.get('https://api.sleeper.app/v1/state/nfl', timeout=5)
-            r.raise_for_status()
-            return Response(r.json())
+            return Response(get_nfl_state())
         except Exception as e:
             return Response({'error': str(e)}, status=503)
 
 
+class MatchupDetailView(APIView):
+    """
+    Public — a league-week's matchups plus stat lines for the players in
+    them, from the server-side week cache (see api/matchups.py). The
+    season is the league's own; ?season= is accepted only if it matches.
+    """
+    permission_classes = []
+
+    def get(self, request, league_id, week):
+        if week not in MATCHUP_WEEKS:
+            return Response({'error': f'week must be between {MATCHUP_WEEKS[0]} and {MATCHUP_WEEKS[-1]}.'}, status=400)
+        if league_id not in tracked_league_ids():
+            return Response({'error': f'Unknown league id: {league_id}'}, status=400)
+        try:
+            requested = int_filters(request, {'season': 'season'}).get('season')
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+        season = tracked_league_season(league_id)
+        if season is None:
+            return Response({'error': f'No season is known for league {league_id}.'}, status=400)
+        if requested is not None and requested != season:
+            return Response({'error': f'League {league_id} is in the {season} season.'}, status=400)
+
+        try:
+            detail = matchup_detail(league_id, season, week)
+        except Exception as e:
+            return Response({'error': str(e)}, status=502)
+
+        response = Response(detail)
+        # A finished week never changes; the live one is only as fresh as the server copy
+        max_age = 86400 if detail['completed'] else settings.LIVE_WEEK_TTL
+        response['Cache-Control'] = f'public, max-age={max_age}'
+        return response
+
+
+class RosteredPlayersView(APIView):
+    """
+    Public — name/position/team for every player on a synced roster.
+    players/ redirects to players/<version>/, whose content never changes,
+    so browsers keep the body cached and only re-ask for the redirect.
+    """
+    permission_classes = []
+
+    def get(self, request, version=None):
+        if version is None:
+            current = rostered_players_version()
+            if current is None:
+                return Response({'error': 'Player list not built yet. Run sync_sleeper.'}, status=404)
+            response = HttpResponseRedirect(reverse('players-version', kwargs={'version': current}))
+            response['Cache-Control'] = 'no-cache'
+            return response
+
+        row = RosteredPlayers.objects.filter(version=version).first()
+        if row is None:
+            return Response({'error': 'Unknown player list version.'}, status=404)
+        payload = bytes(row.payload)
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = HttpResponse(payload, content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(payload), content_type='application/json')
+        patch_vary_headers(response, ['Accept-Encoding'])
+        response['ETag'] = f'"{version}"'
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+
+def tracked_league_ids():
+    """
+    Sleeper IDs of every league we sync or have planned. Endpoints that call
+    Sleeper on a visitor's behalf only accept these, so they can't be used
+    as an open proxy.
+    """
+    known = set(League.objects.values_list('sleeper_league_id', flat=True))
+    for ids in Season.objects.values_list('league_ids', flat=True):
+        known.update(str(lid) for lid in ids)
+    return known
+
+
+def tracked_league_season(league_id):
+    """The synced league's season, else the year of the Season that plans it (None if neither)."""
+    season = League.objects.filter(sleeper_league_id=league_id).values_list('season', flat=True).first()
+    if season is not None:
+        return season
+    for year, ids in Season.objects.order_by('-year').values_list('year', 'league_ids'):
+        if league_id in {str(lid) for lid in ids}:
+            return year
+    return None
+
+
+class DashboardView(APIView):
+    """
+    Public — the homepage's combined Sleeper payload (state, leagues, users,
+    rosters, matchups), built server-side and shared by every visitor.
+    ?league_ids=a,b,c picks up to MAX_DASHBOARD_LEAGUES tracked leagues
+    (default: the active season's).
+    Send If-None-Match to get a 304 when nothing changed.
+    """
+    permission_classes = []
+
+    def get(self, request):
+        league_ids = list(dict.fromkeys(
+            lid.strip() for lid in request.query_params.get('league_ids', '').split(',') if lid.strip()
+        ))
+        if len(league_ids) > MAX_DASHBOARD_LEAGUES:
+            return Response({'error': f'At most {MAX_DASHBOARD_LEAGUES} league ids.'}, status=400)
+        if not league_ids:
+            active = Season.objects.filter(is_active=True).first()
+            league_ids = [str(lid) for lid in active.league_ids] if active else []
+        if not league_ids:
+            return Response({'error': 'No league_ids given and no active season.'}, status=400)
+
+        known = tracked_league_ids()
+        unknown = [lid for lid in league_ids if lid not in known]
+        if unknown:
+            return Response({'error': f"Unknown league ids: {', '.join(unknown)}"}, status=400)
+
+        try:
+            dashboard = get_dashboard(league_ids)
+        except Exception as e:
+            return Response({'error': str(e)}, status=502)
+
+        if dashboard['etag'] in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = Response(status=304)
+        else:
+            response = Response(dashboard['payload'])
+        response['ETag'] = dashboard['etag']
+        # Let browsers keep a copy but revalidate it on every poll
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+
 class PlayoffStatusView(APIView):
     """Returns BIG Playoff bracket status from the DB."""
     permission_classes = [IsAdminUser]
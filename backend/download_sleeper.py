@@ -1,13 +1,28 @@
 #!/usr/bin/env python3
 """
-Mirrors Sleeper API endpoints to a local JSON file.
+Mirrors Sleeper API endpoints to a local snapshot directory.
 Run once while online to capture a full season snapshot.
-sync_sleeper --from-local will then read from this file instead of the live API.
+sync_sleeper --from-local will then read from it instead of the live API.
+
+Each league, matchup week and player's stats is written to its own gzip
+record as soon as it arrives (see api/snapshot.py for the layout), so memory
+stays flat no matter how many leagues are mirrored.
 
 Usage:
   python download_sleeper.py
-  python download_sleeper.py --output my_snapshot.json
+  python download_sleeper.py --output my_snapshot
   python download_sleeper.py --league-ids 1252701932896657408,1252704674759315456
+  python download_sleeper.py --json-output sleeper_snapshot_2025.json   # also write the old single-file JSON
+  python download_sleeper.py --rps 15 --workers 12
+  python download_sleeper.py --resume        # continue an interrupted download
+
+Requests run on a worker pool throttled by a token bucket (--rps), so the
+download is bounded by Sleeper's rate limit rather than fixed sleeps.
+429s and 5xx responses are retried with backoff (--retries).
+
+Every record is checkpointed to disk the moment it arrives. --resume keeps
+whatever is already there and valid (finished leagues, matchup weeks,
+player stats) and only fetches the rest.
 
 Requires: league_ids.json in this directory, or pass --league-ids.
 See league_ids.example.json for format.
@@ -18,12 +33,22 @@ import os
 import sys
 import time
 import argparse
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Default output file
-DEFAULT_OUTPUT = "sleeper_snapshot_2025.json"
-SLEEPER_BASE = "https://api.sleeper.app/v1"
-SLEEPER_STATS_BASE = "https://api.sleeper.com/stats/nfl"
+from api.sleeper import (
+    SLEEPER_BASE, SLEEPER_STATS_BASE, MATCHUP_WEEKS,
+    TokenBucket, build_session, fetch_json as fetch_json_or_raise, league_endpoints,
+)
+from api.snapshot import SnapshotWriter, SnapshotReader, export_json
+
+# Default output directory
+DEFAULT_OUTPUT = "sleeper_snapshot_2025"
+# Sleeper asks clients to stay under 1000 calls a minute
+DEFAULT_RPS = 10
+DEFAULT_WORKERS = 8
+DEFAULT_RETRIES = 3
+REQUEST_TIMEOUT = 30
 
 
 def load_league_ids(args):
@@ -38,25 +63,69 @@ def load_league_ids(args):
     return []
 
 
-def fetch_json(url, session=None):
+def positive_rate(value):
+    """argparse type for --rps: the token bucket never refills at a rate of 0 or less."""
+    rate = float(value)
+    if rate <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return rate
+
+
+def fetch_json(url, session, limiter=None, retries=0):
     """Fetch URL and return JSON. Returns None on failure."""
-    sess = session or requests
     try:
-        r = sess.get(url, timeout=30)
-        r.raise_for_status()
-        return r.json()
+        return fetch_json_or_raise(session, url, REQUEST_TIMEOUT, limiter=limiter, retries=retries)
     except Exception as e:
         print(f"  Warning: {url} -> {e}")
         return None
 
 
+class Progress:
+    """Prints a running count and request throughput every `every` completions."""
+
+    def __init__(self, label, total, every=50):
+        self.label = label
+        self.total = total
+        self.every = every
+        self.count = 0
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def tick(self):
+        with self.lock:
+            self.count += 1
+            if self.count % self.every == 0 or self.count == self.total:
+                print(f"  ... {self.label} {self.count}/{self.total} ({self.rate():.1f} req/s)")
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        return f"{self.count} requests in {elapsed:.1f}s ({self.rate():.1f} req/s)"
+
+
+def run_pool(jobs, fetch, workers, progress):
+    """Runs fetch(url) for each (key, url) job on a thread pool; yields (key, data) as they finish."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch, url): key for key, url in jobs}
+        for future in as_completed(futures):
+            progress.tick()
+            yield futures[future], future.result()
+
+
 def main():
-    parser = argparse.ArgumentParser(description="Mirror Sleeper API to local JSON")
+    parser = argparse.ArgumentParser(description="Mirror Sleeper API to a local snapshot")
     parser.add_argument(
         "--output",
         "-o",
         default=DEFAULT_OUTPUT,
-        help=f"Output file (default: {DEFAULT_OUTPUT})",
+        help=f"Output snapshot directory (default: {DEFAULT_OUTPUT})",
+    )
+    parser.add_argument(
+        "--json-output",
+        help="Also export the snapshot as a single JSON file (used by the frontend's offline mode)",
     )
     parser.add_argument(
         "--league-ids",
@@ -67,6 +136,29 @@ def main():
         action="store_true",
         help="Skip per-player stats (reduces API calls significantly)",
     )
+    parser.add_argument(
+        "--rps",
+        type=positive_rate,
+        default=DEFAULT_RPS,
+        help=f"Request budget in requests per second across all workers (default: {DEFAULT_RPS})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent download workers (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries per request on 429/5xx or connection errors (default: {DEFAULT_RETRIES})",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Keep valid records already in the output directory and only fetch what's missing",
+    )
     args = parser.parse_args()
 
     league_ids = load_league_ids(args)
@@ -75,98 +167,125 @@ def main():
         print("Example league_ids.json: {\"league_ids\": [\"1252701932896657408\", \"1252704674759315456\"]}")
         sys.exit(1)
 
-    print(f"Downloading Sleeper data for {len(league_ids)} leagues...")
+    print(f"Downloading Sleeper data for {len(league_ids)} leagues "
+          f"({args.workers} workers, {args.rps:g} req/s)...")
     output_path = os.path.join(os.path.dirname(__file__), args.output)
-    session = requests.Session()
+    workers = max(1, args.workers)
+    session = build_session(workers)
+    limiter = TokenBucket(args.rps)
 
-    snapshot = {
-        "state": None,
-        "players": None,
-        "leagues": {},
-        "player_stats": {},
-    }
+    def fetch(url):
+        return fetch_json(url, session, limiter, args.retries)
+
+    writer = SnapshotWriter(output_path, resume=args.resume)
+    if args.resume:
+        print(f"Resuming: {len(writer.completed_leagues)} leagues and "
+              f"{len(writer.player_stats)} player stats already on disk.")
 
     # --- 1. Global state ---
     print("1. Fetching NFL state...")
-    snapshot["state"] = fetch_json(f"{SLEEPER_BASE}/state/nfl", session)
-    if not snapshot["state"]:
+    state = fetch(f"{SLEEPER_BASE}/state/nfl")
+    if not state:
         print("  Failed to fetch state. Aborting.")
         sys.exit(1)
-    current_season = snapshot["state"].get("season", "2025")
+    if args.resume and writer.state and writer.state.get("season") != state.get("season"):
+        print(f"  Snapshot on disk is for season {writer.state.get('season')}, "
+              f"Sleeper is on {state.get('season')}. Start a fresh download instead of --resume.")
+        sys.exit(1)
+    writer.write_state(state)
+    current_season = state.get("season", "2025")
     print(f"  Season: {current_season}")
 
     # --- 2. Player database ---
-    print("2. Fetching player database (this may take a moment)...")
-    snapshot["players"] = fetch_json(f"{SLEEPER_BASE}/players/nfl", session)
-    if not snapshot["players"]:
-        print("  Failed to fetch players. Continuing without player names.")
+    if writer.has_players:
+        print("2. Player database already downloaded. Skipping.")
     else:
-        print(f"  Loaded {len(snapshot['players'])} players.")
+        print("2. Fetching player database (this may take a moment)...")
+        players = fetch(f"{SLEEPER_BASE}/players/nfl")
+        if not players:
+            print("  Failed to fetch players. Continuing without player names.")
+        else:
+            writer.write_players(players)
+            print(f"  Loaded {len(players)} players.")
+        del players
 
     # --- 3. Per-league data ---
+    # Every league's endpoints go into one pool; a league is indexed once all of its calls are back
+    print("3. Fetching leagues...")
     roster_player_ids = set()
-
-    for i, lid in enumerate(league_ids, 1):
-        print(f"3.{i} League {lid}...")
-        league_data = {
-            "league": None,
-            "users": None,
-            "rosters": None,
-            "matchups": {},
-            "winners_bracket": None,
-        }
-
-        # League details
-        league_data["league"] = fetch_json(f"{SLEEPER_BASE}/league/{lid}", session)
-        time.sleep(0.2)  # Rate limit
-
-        # Users
-        league_data["users"] = fetch_json(f"{SLEEPER_BASE}/league/{lid}/users", session) or []
-        time.sleep(0.2)
-
-        # Rosters
-        league_data["rosters"] = fetch_json(f"{SLEEPER_BASE}/league/{lid}/rosters", session) or []
-        for r in league_data["rosters"]:
-            roster_player_ids.update(r.get("players", []))
-        time.sleep(0.2)
-
-        # Matchups for weeks 1-18
-        for week in range(1, 19):
-            matchups = fetch_json(f"{SLEEPER_BASE}/league/{lid}/matchups/{week}", session)
-            if matchups:
-                league_data["matchups"][str(week)] = matchups
-            time.sleep(0.2)
-
-        # Winners bracket (playoff)
-        league_data["winners_bracket"] = fetch_json(
-            f"{SLEEPER_BASE}/league/{lid}/winners_bracket", session
+    remaining = []
+    for lid in league_ids:
+        if writer.is_league_complete(lid):
+            for r in writer.league_meta(lid).get("rosters") or []:
+                roster_player_ids.update(r.get("players") or [])
+        else:
+            remaining.append(lid)
+    if len(remaining) < len(league_ids):
+        print(f"  Skipping {len(league_ids) - len(remaining)} leagues already downloaded.")
+    jobs = [
+        ((lid, key), url)
+        for lid in remaining
+        for key, url in league_endpoints(
+            lid, [week for week in MATCHUP_WEEKS if not writer.has_week(lid, week)]
         )
-        time.sleep(0.2)
+    ]
+    pending = {lid: 0 for lid in remaining}
+    for (lid, _), _ in jobs:
+        pending[lid] += 1
+    # A call that failed stays None, so the league isn't marked complete
+    league_data = {
+        lid: {"league": None, "users": None, "rosters": None, "winners_bracket": None}
+        for lid in remaining
+    }
 
-        snapshot["leagues"][lid] = league_data
+    progress = Progress("league calls", len(jobs))
+    for (lid, key), data in run_pool(jobs, fetch, workers, progress):
+        if key.startswith("matchups/"):
+            if data:
+                writer.write_week(lid, key.split("/", 1)[1], data)
+        else:
+            league_data[lid][key] = data
 
+        pending[lid] -= 1
+        if pending[lid] == 0:
+            league_raw = league_data.pop(lid)
+            if writer.write_league(lid, league_raw):
+                for r in league_raw["rosters"]:
+                    roster_player_ids.update(r.get("players") or [])
+                writer.write_index()
+            else:
+                print(f"  Warning: league {lid} is incomplete; run again with --resume to retry it.")
+    print(f"  Leagues done: {progress.summary()}")
     print(f"  Found {len(roster_player_ids)} unique rostered players.")
 
     # --- 4. Per-player stats (optional, many requests) ---
     if not args.skip_stats and roster_player_ids and current_season:
-        print("4. Fetching player stats (optional, ~0.5s per player)...")
-        for j, pid in enumerate(roster_player_ids):
-            if (j + 1) % 50 == 0:
-                print(f"  ... {j + 1}/{len(roster_player_ids)}")
-            url = f"{SLEEPER_STATS_BASE}/player/{pid}?season_type=regular&season={current_season}&grouping=week"
-            data = fetch_json(url, session)
+        print("4. Fetching player stats (optional, many requests)...")
+        jobs = [
+            (pid, f"{SLEEPER_STATS_BASE}/player/{pid}?season_type=regular&season={current_season}&grouping=week")
+            for pid in sorted(roster_player_ids)
+            if not writer.has_player_stats(pid)
+        ]
+        if len(jobs) < len(roster_player_ids):
+            print(f"  Skipping {len(roster_player_ids) - len(jobs)} players already downloaded.")
+        progress = Progress("players", len(jobs))
+        for pid, data in run_pool(jobs, fetch, workers, progress):
             if data:
-                snapshot["player_stats"][pid] = data
-            time.sleep(0.3)  # Be nice to the API
-        print(f"  Fetched stats for {len(snapshot['player_stats'])} players.")
+                writer.write_player_stats(pid, data)
+            if progress.count % 50 == 0:
+                writer.write_index()
+        print(f"  Fetched stats for {len(writer.player_stats)} players: {progress.summary()}")
     elif args.skip_stats:
         print("4. Skipping player stats (--skip-stats).")
 
-    # --- Write output ---
-    with open(output_path, "w") as f:
-        json.dump(snapshot, f, indent=2)
-
+    # --- Finish index ---
+    writer.close()
     print(f"\nDone. Snapshot saved to {output_path}")
+
+    if args.json_output:
+        json_path = os.path.join(os.path.dirname(__file__), args.json_output)
+        export_json(SnapshotReader(output_path), json_path)
+        print(f"Exported single-file JSON to {json_path}")
     print("Run: python manage.py sync_sleeper --from-local")
 
 
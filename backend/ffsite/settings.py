@@ -1,3 +1,5 @@
+import sys
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 from decouple import config, Csv
@@ -7,6 +9,7 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = config('SECRET_KEY')
 DEBUG       = config('DEBUG', default=False, cast=bool)
+TESTING     = sys.argv[1:2] == ['test']
 
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', default='localhost,127.0.0.1', cast=Csv())
 
@@ -24,6 +27,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -61,6 +65,27 @@ DATABASES = {
     )
 }
 
+# File-based so management commands and every gunicorn worker share one cache
+CACHES = {
+    'default': {
+        'BACKEND':  'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': config('CACHE_LOCATION', default=str(Path(tempfile.gettempdir()) / 'ffsite-cache')),
+    }
+}
+
+# Safety net for cached public responses; syncs and admin actions invalidate explicitly
+PUBLIC_CACHE_TIMEOUT = config('PUBLIC_CACHE_TIMEOUT', default=60 * 60, cast=int)
+
+# Seconds a cached Sleeper /state/nfl stays fresh (see api/nfl_state.py)
+NFL_STATE_TTL = config('NFL_STATE_TTL', default=60, cast=int)
+
+# Seconds the server-built homepage payload is shared before Sleeper is asked again (see api/dashboard.py)
+DASHBOARD_TTL = config('DASHBOARD_TTL', default=60, cast=int)
+
+# Seconds the in-progress week's matchups and player stats are shared before Sleeper
+# is asked again; completed weeks are kept indefinitely (see api/matchups.py)
+LIVE_WEEK_TTL = config('LIVE_WEEK_TTL', default=60, cast=int)
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -93,6 +118,23 @@ REST_FRAMEWORK = {
     )
 }
 
+# One JSON line per request from api.middleware.RequestTimingMiddleware;
+# quiet under `manage.py test` unless a test asks for the lines (assertLogs)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.timing': {
+            'handlers': ['console'],
+            'level':    config('REQUEST_LOG_LEVEL', default='WARNING' if TESTING else 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME':  timedelta(hours=2),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=14),
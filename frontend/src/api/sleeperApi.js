@@ -1,4 +1,7 @@
 const BASE = 'https://api.sleeper.app/v1';
+const API = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
+// The backend's /dashboard/ payload is built for this BIG Playoff start week
+const DASHBOARD_PLAYOFF_START_WEEK = 15;
 
 async function get(url) {
   const res = await fetch(url);
@@ -8,10 +11,29 @@ async function get(url) {
 
 /**
  * Fetches all data needed for the app in one shot.
+ * Prefers the backend's /dashboard/, which builds the same payload once for
+ * every visitor and answers 304 when it hasn't changed since our last poll
+ * (cache: 'no-cache' makes the browser revalidate its ETag). Falls back to
+ * asking Sleeper directly if the backend is unreachable.
+ */
+export async function fetchAllLeagueData(leagueIds, bigPlayoffStartWeek = 15) {
+  if (bigPlayoffStartWeek === DASHBOARD_PLAYOFF_START_WEEK) {
+    try {
+      const params = new URLSearchParams({ league_ids: leagueIds.join(',') });
+      const res = await fetch(`${API}/dashboard/?${params}`, { cache: 'no-cache' });
+      if (res.ok) return res.json();
+    } catch (err) {
+      // Backend down — fall through to Sleeper
+    }
+  }
+  return fetchFromSleeper(leagueIds, bigPlayoffStartWeek);
+}
+
+/**
  * After getting NFL state (to determine the current week), all league
  * requests — info, users, rosters, and matchups — fire in parallel.
  */
-export async function fetchAllLeagueData(leagueIds, bigPlayoffStartWeek = 15) {
+async function fetchFromSleeper(leagueIds, bigPlayoffStartWeek) {
   const nflState = await get(`${BASE}/state/nfl`);
   const currentWeek = nflState.week || nflState.display_week || 0;
   const isOffseason = nflState.season_type === 'off';
@@ -64,11 +86,65 @@ export async function fetchAllLeagueData(leagueIds, bigPlayoffStartWeek = 15) {
   return { nflState, currentWeek, isOffseason, recentWeek, leagues };
 }
 
-/** Fetches the full NFL player database (~6 MB). Cached by the browser. */
+/**
+ * Fetches name/position/team for every rostered player (tens of KB) from the
+ * backend. /players/ redirects to an immutable, content-versioned URL, so the
+ * browser only downloads the list again after a sync changes it. Falls back
+ * to Sleeper's full NFL player database (~6 MB) if the backend is unreachable.
+ */
 export async function fetchPlayers() {
+  try {
+    const res = await fetch(`${API}/players/`);
+    if (res.ok) return res.json();
+  } catch (err) {
+    // Backend down — fall through to Sleeper
+  }
   return get(`${BASE}/players/nfl`);
 }
 
+/**
+ * Fetches the backend's precomputed records (high/low score, blowout,
+ * closest game) as { allTime, seasons: { [year]: ... } }. sync_sleeper keeps
+ * them current, so this replaces pulling every week's matchups per league.
+ */
+export async function fetchRecords() {
+  const res = await fetch(`${API}/records/`);
+  if (!res.ok) throw new Error(`Backend API ${res.status}: /records/`);
+  return res.json();
+}
+
+/**
+ * Fetches the backend's precomputed BIG Playoff bracket for `season`:
+ * { currentWeek, isComplete, champion, weeks: [{ week, status, cutLine, entries }] }.
+ * Resolves to null if the backend has no bracket for that season.
+ */
+export async function fetchPlayoffBracket(season) {
+  const res = await fetch(`${API}/playoff-bracket/?season=${season}`);
+  if (res.status === 404) return null;
+  if (!res.ok) throw new Error(`Backend API ${res.status}: /playoff-bracket/`);
+  return res.json();
+}
+
+/**
+ * Fetches one league-week's matchups with stat lines for the players in them
+ * as { matchups, stats }. The backend shares one cached copy of each week
+ * (finished weeks indefinitely), so a drill-down is a single small response.
+ * Falls back to Sleeper's matchups + full week stats if the backend fails.
+ */
+export async function fetchMatchupDetail(leagueId, season, week) {
+  try {
+    const res = await fetch(`${API}/matchups/${leagueId}/${week}/?season=${season}`);
+    if (res.ok) return res.json();
+  } catch (err) {
+    // Backend down — fall through to Sleeper
+  }
+  const [matchups, stats] = await Promise.all([
+    fetchMatchupsForWeek(leagueId, week),
+    fetchWeekStats(season, week).catch(() => ({})),
+  ]);
+  return { matchups, stats };
+}
+
 /** Fetches matchup data for a single league + week. */
 export async function fetchMatchupsForWeek(leagueId, week) {
   return get(`${BASE}/league/${leagueId}/matchups/${week}`);
@@ -6,7 +6,13 @@ import React, {
   useCallback,
   useMemo,
 } from 'react';
-import { fetchAllLeagueData, fetchPlayers, fetchAllWeeksHistory } from '../api/sleeperApi';
+import {
+  fetchAllLeagueData,
+  fetchPlayers,
+  fetchAllWeeksHistory,
+  fetchRecords,
+  fetchPlayoffBracket,
+} from '../api/sleeperApi';
 import { BIG_PLAYOFF_START_WEEK } from '../config';
 import { useSeason } from './SeasonContext';
 import {
@@ -46,7 +52,9 @@ export function DataProvider({ children }) {
 
   const [rawData, setRawData]         = useState(null);
   const [players, setPlayers]         = useState(null);
+  const [bracket, setBracket]         = useState(null);
   const [historyData, setHistoryData] = useState(null);
+  const [serverRecords, setServerRecords] = useState(null);
   const [historyLoading, setHistoryLoading] = useState(true);
   const [loading, setLoading]         = useState(true);
   const [error, setError]             = useState(null);
@@ -54,8 +62,13 @@ export function DataProvider({ children }) {
 
   const loadData = useCallback(async () => {
     try {
-      const data = await fetchAllLeagueData(leagueIds, BIG_PLAYOFF_START_WEEK);
+      const [data, serverBracket] = await Promise.all([
+        fetchAllLeagueData(leagueIds, BIG_PLAYOFF_START_WEEK),
+        // null when the backend has no bracket for this year; we simulate instead
+        fetchPlayoffBracket(selectedYear).catch(() => null),
+      ]);
       setRawData(data);
+      setBracket(serverBracket);
       setLastUpdated(new Date());
       setError(null);
     } catch (err) {
@@ -63,12 +76,14 @@ export function DataProvider({ children }) {
     } finally {
       setLoading(false);
     }
-  }, [leagueIds]);
+  }, [leagueIds, selectedYear]);
 
   // Reload when year changes
   useEffect(() => {
     setRawData(null);
+    setBracket(null);
     setHistoryData(null);
+    setServerRecords(null);
 
     if (leagueIds.length === 0) {
       // Pre-season year selected — no Sleeper data to fetch
@@ -80,8 +95,14 @@ export function DataProvider({ children }) {
     setLoading(true);
     loadData();
     setHistoryLoading(true);
-    fetchAllWeeksHistory(leagueIds)
-      .then(setHistoryData)
+    fetchRecords()
+      .then((data) => {
+        const season = data.seasons[String(selectedYear)];
+        if (!season) throw new Error(`No records for ${selectedYear}`);
+        setServerRecords(season);
+      })
+      // Backend down or season not synced yet — rebuild from every week's matchups
+      .catch(() => fetchAllWeeksHistory(leagueIds).then(setHistoryData))
       .catch(console.error)
       .finally(() => setHistoryLoading(false));
   }, [selectedYear]); // eslint-disable-line react-hooks/exhaustive-deps
@@ -99,7 +120,7 @@ export function DataProvider({ children }) {
     return () => clearInterval(id);
   }, [loadData]);
 
-  // All derived data recomputes when rawData, players, or historyData changes
+  // All derived data recomputes when rawData, players, or the records source changes
   const derived = useMemo(() => {
     if (!rawData) return {};
     return {
@@ -118,8 +139,11 @@ export function DataProvider({ children }) {
       weeklyWinners:    buildWeeklyWinners(rawData.leagues),
       powerRankings:    buildPowerRankings(rawData.leagues),
       commonPlayers:    buildCommonPlayers(rawData.leagues, players),
-      bigPlayoffEntries: buildBigPlayoff(rawData.leagues, BIG_PLAYOFF_START_WEEK),
-      records:           historyData ? buildRecords(historyData, rawData.leagues) : null,
+      // Precomputed server bracket; otherwise simulate it from the playoff-week matchups
+      bigPlayoffEntries: bracket
+        ? bracket.weeks.flatMap((w) => w.entries)
+        : buildBigPlayoff(rawData.leagues, BIG_PLAYOFF_START_WEEK),
+      records:           serverRecords || (historyData ? buildRecords(historyData, rawData.leagues) : null),
       historyLoading,
       // Cross-reference logged-in user's sleeper_id against roster owner_ids
       myIdentity: user?.sleeper_id
@@ -133,7 +157,7 @@ export function DataProvider({ children }) {
             .filter(Boolean)
         : [],
     };
-  }, [rawData, players, historyData, historyLoading, user]);
+  }, [rawData, players, bracket, historyData, serverRecords, historyLoading, user]);
 
   return (
     <DataContext.Provider
@@ -4,7 +4,7 @@ import { useData } from '../context/DataContext';
 import { useAuth } from '../context/AuthContext';
 import { useSeason } from '../context/SeasonContext';
 import PlayerSticker from '../components/PlayerSticker';
-import { fetchMatchupsForWeek, fetchWeekStats } from '../api/sleeperApi';
+import { fetchMatchupDetail } from '../api/sleeperApi';
 import { pageVariants, pageTransition, listVariants, itemVariants } from '../utils/animations';
 import './DashboardPage.css';
 import './LeagueDetailPage.css';
@@ -255,11 +255,11 @@ function DashboardPage() {
     if (subTab !== 'matchups' || !selectedLeague || !matchupWeek) return;
 
     const mKey = `${selectedLeague.sleeperId}-${matchupWeek}`;
-    const sKey = `stats-${selectedLeague.season}-${matchupWeek}`;
 
-    if (cacheRef.current[mKey] && cacheRef.current[sKey]) {
-      setMatchups(cacheRef.current[mKey]);
-      setWeekStats(cacheRef.current[sKey]);
+    const cached = cacheRef.current[mKey];
+    if (cached) {
+      setMatchups(cached.matchups);
+      setWeekStats(cached.stats);
       return;
     }
 
@@ -268,19 +268,10 @@ function DashboardPage() {
     setMatchups([]);
     setWeekStats(null);
 
-    const mFetch = cacheRef.current[mKey]
-      ? Promise.resolve(cacheRef.current[mKey])
-      : fetchMatchupsForWeek(selectedLeague.sleeperId, matchupWeek);
-
-    const sFetch = cacheRef.current[sKey]
-      ? Promise.resolve(cacheRef.current[sKey])
-      : fetchWeekStats(selectedLeague.season, matchupWeek).catch(() => ({}));
-
-    Promise.all([mFetch, sFetch])
-      .then(([matchupData, statsData]) => {
+    fetchMatchupDetail(selectedLeague.sleeperId, selectedLeague.season, matchupWeek)
+      .then(({ matchups: matchupData, stats: statsData }) => {
         if (cancelled) return;
-        cacheRef.current[mKey] = matchupData || [];
-        cacheRef.current[sKey] = statsData || {};
+        cacheRef.current[mKey] = { matchups: matchupData || [], stats: statsData || {} };
         setMatchups(matchupData || []);
         setWeekStats(statsData || {});
       })
@@ -3,7 +3,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import { useData } from '../context/DataContext';
 import { useSeason } from '../context/SeasonContext';
 import PlayerSticker from '../components/PlayerSticker';
-import { fetchMatchupsForWeek, fetchWeekStats } from '../api/sleeperApi';
+import { fetchMatchupDetail } from '../api/sleeperApi';
 import { pageVariants, pageTransition, listVariants, itemVariants } from '../utils/animations';
 import './PlayoffPage.css';
 
@@ -124,34 +124,22 @@ function TeamLineup({ entry, leagues, players, cacheRef, active }) {
     if (!active || !entry.leagueId || !entry.rosterId || !entry.playoff_week) return;
 
     const mKey = `${entry.leagueId}-${entry.playoff_week}`;
-    const sKey = `stats-${league?.season}-${entry.playoff_week}`;
 
     const cached = cacheRef.current[mKey];
-    const cachedStats = cacheRef.current[sKey];
-
-    if (cached && cachedStats) {
-      const me = cached.find((m) => m.roster_id === entry.rosterId);
+    if (cached) {
+      const me = cached.matchups.find((m) => m.roster_id === entry.rosterId);
       setMatchupEntry(me || null);
-      setWeekStats(cachedStats);
+      setWeekStats(cached.stats);
       return;
     }
 
     let cancelled = false;
     setFetching(true);
 
-    const mFetch = cached
-      ? Promise.resolve(cached)
-      : fetchMatchupsForWeek(entry.leagueId, entry.playoff_week);
-
-    const sFetch = cachedStats
-      ? Promise.resolve(cachedStats)
-      : fetchWeekStats(league?.season, entry.playoff_week).catch(() => ({}));
-
-    Promise.all([mFetch, sFetch])
-      .then(([matchupData, statsData]) => {
+    fetchMatchupDetail(entry.leagueId, league?.season, entry.playoff_week)
+      .then(({ matchups: matchupData, stats: statsData }) => {
         if (cancelled) return;
-        cacheRef.current[mKey] = matchupData || [];
-        cacheRef.current[sKey] = statsData || {};
+        cacheRef.current[mKey] = { matchups: matchupData || [], stats: statsData || {} };
         const me = (matchupData || []).find((m) => m.roster_id === entry.rosterId);
         setMatchupEntry(me || null);
         setWeekStats(statsData || {});